@@ -5,18 +5,15 @@ Author: Artner Michael
 from abc import ABC
 from typing import Tuple, List, Callable, Optional
 
-from qiskit import QuantumCircuit, transpile, Aer, execute
-from qiskit.providers.aer import StatevectorSimulator
+import numpy as np
 
-from qrogue.game.logic.actors import StateVector, CircuitMatrix
+from qrogue.game.logic.actors import StateVector, CircuitMatrix, SimulationResult
 from qrogue.game.logic.actors.controllables import Controllable
 from qrogue.game.logic.actors.controllables.qubit import QubitSet, DummyQubitSet
 from qrogue.game.logic.collectibles import Coin, Collectible, Consumable, Instruction, Key, MultiCollectible, \
     Qubit, Energy
-from qrogue.util import CheatConfig, Config, Logger, GameplayConfig, QuantumSimulationConfig, Options
-
-
-# from jkq import ddsim
+from qrogue.game.logic.simulation import get_backend, IncrementalUnitary, SimulationCache, canonical_signature
+from qrogue.util import CheatConfig, Config, Logger, GameplayConfig, Options
 
 
 class _Attributes:
@@ -265,31 +262,14 @@ class BackpackIterator:
 
 
 class Robot(Controllable, ABC):
-    @staticmethod
-    def __counts_to_bit_list(counts):
-        counts = str(counts)
-        counts = counts[1:len(counts) - 1]
-        arr = counts.split(':')
-        if int(arr[1][1:]) != 1:
-            Logger.instance().throw(ValueError(f"Function only works for counts with 1 shot but counts was: {counts}"))
-        bits = arr[0]
-        bits = bits[1:len(bits) - 1]
-        list_ = []
-        for b in bits:
-            list_.append(int(b))
-        list_.reverse()  # so that list_[i] corresponds to the measured value of qi
-        return list_
-
     def __init__(self, name: str, attributes: _Attributes, backpack: Backpack, game_over_callback: Callable[[], None]):
         super().__init__(name)
         self.__attributes = attributes
         self.__backpack = backpack
         self.__game_over = game_over_callback
         # initialize qubit stuff (rows)
-        self.__simulator = StatevectorSimulator()  # ddsim.JKQProvider().get_backend('statevector_simulator')
-        self.__backend = Aer.get_backend('unitary_simulator')
-        self.__stv: Optional[StateVector] = None
-        self.__circuit_matrix: Optional[CircuitMatrix] = None
+        self.__backend = get_backend()  # configured via QuantumSimulationConfig.BACKEND
+        self.__result: Optional[SimulationResult] = None
         self.__qubit_indices: List[int] = []
         for i in range(0, attributes.num_of_qubits):
             self.__qubit_indices.append(i)
@@ -298,21 +278,27 @@ class Robot(Controllable, ABC):
         self.__instruction_count: int = 0   # how many instructions are currently placed on the circuit
 
         # apply gates/instructions, create the circuit
-        self.__circuit = None
         self.__instructions: List[Optional[Instruction]] = [None] * attributes.circuit_space
+        self.__circuit_unitary = IncrementalUnitary(self.__backend, attributes.num_of_qubits,
+                                                    attributes.circuit_space)
+        self.__circuit_version = 0  # increases with every change of the circuit
         self.update_statevector(use_energy=False)  # to initialize the statevector
 
     @property
     def backpack(self) -> Backpack:
         return self.__backpack
 
+    @property
+    def simulation_result(self) -> SimulationResult:
+        return self.__result
+
     @property
     def state_vector(self) -> StateVector:
-        return self.__stv
+        return self.__result.state_vector
 
     @property
     def circuit_matrix(self) -> CircuitMatrix:
-        return self.__circuit_matrix
+        return self.__result.circuit_matrix
 
     @property
     def cur_energy(self) -> int:
@@ -344,13 +330,6 @@ class Robot(Controllable, ABC):
             return True
         return False
 
-    def __apply_instructions(self):
-        circuit = QuantumCircuit(self.__attributes.num_of_qubits, self.__attributes.num_of_qubits)
-        for inst in self.__instructions:
-            if inst:
-                inst.append_to(circuit)
-        self.__circuit = circuit
-
     def key_count(self) -> int:     # cannot be a property since it is an abstractmethod in Controllable
         return self.backpack.key_count
 
@@ -359,28 +338,66 @@ class Robot(Controllable, ABC):
 
     def update_statevector(self, use_energy: bool = True):
         """
-        Compiles and simulates the current circuit and saves and returns the resulting StateVector
-        :return: an updated StateVector corresponding to the current circuit
+        Simulates the current circuit and saves the resulting StateVector and CircuitMatrix
         """
         if self.game_over_check():
             return
 
-        self.__apply_instructions()
-        compiled_circuit = transpile(self.__circuit, self.__simulator)
-        job = self.__simulator.run(compiled_circuit, shots=1)
-        result = job.result()
-        self.__stv = StateVector(result.get_statevector(self.__circuit), num_of_used_gates=self.__instruction_count)
-
-        job = execute(self.__circuit, self.__backend)
-        result = job.result()
-        self.__circuit_matrix = CircuitMatrix(result.get_unitary(self.__circuit,
-                                                                 decimals=QuantumSimulationConfig.DECIMALS).data)
+        # circuits are often rebuilt (e.g. after a reset), so we first check if we already know the result
+        self.__result = SimulationCache.instance().get_or_compute(
+            (get_backend().name, canonical_signature(self.__instructions, self.num_of_qubits)),
+            lambda: SimulationResult(Robot.__snapshot(self.__instructions), self.num_of_qubits,
+                                     self.__unitary_provider(self.__circuit_unitary.unitary))
+        )
         if use_energy:
             self.decrease_energy(amount=1)
 
+    def preview(self, instruction: Optional[Instruction], position: int) -> SimulationResult:
+        """
+        Simulates the circuit as if the given Instruction was placed at the given position (or as if the position was
+        empty if instruction is None) without changing the circuit or consuming energy.
+
+        :param instruction: the Instruction to hypothetically place, needs to have all its qubits specified
+        :param position: the position in the circuit to place the Instruction at
+        :return: the SimulationResult of the hypothetical circuit
+        """
+        if not 0 <= position < self.circuit_space:
+            return self.__result
+        instructions = self.__instructions.copy()
+        instructions[position] = instruction
+        return SimulationCache.instance().get_or_compute(
+            (get_backend().name, canonical_signature(instructions, self.num_of_qubits)),
+            lambda: SimulationResult(Robot.__snapshot(instructions), self.num_of_qubits,
+                                     self.__unitary_provider(lambda: self.__circuit_unitary.preview(position,
+                                                                                                    instruction)))
+        )
+
+    @staticmethod
+    def __snapshot(instructions: List[Optional[Instruction]]) -> List[Instruction]:
+        # placed Instructions change their qargs as soon as they are removed, so results need their own copies
+        return [instruction.copy_with_qargs() for instruction in instructions if instruction]
+
+    def __unitary_provider(self, compute_unitary: Callable[[], np.ndarray]) -> Callable[[], Optional[np.ndarray]]:
+        """
+        The CircuitMatrix of a SimulationResult is only computed on demand. As long as the circuit didn't change until
+        then, we can use the incremental prefix and suffix products instead of simulating the whole circuit.
+        """
+        version = self.__circuit_version
+
+        def provide() -> Optional[np.ndarray]:
+            if version == self.__circuit_version:
+                return compute_unitary()
+            return None
+        return provide
+
+    def __set_column(self, position: int, instruction: Optional[Instruction]):
+        self.__circuit_unitary.set_column(position, instruction)
+        self.__circuit_version += 1
+
     def __remove_instruction(self, instruction: Instruction, skip_qargs: bool = False):
         if instruction and instruction.is_used():
             self.__instructions[instruction.position] = None
+            self.__set_column(instruction.position, None)
             self.__instruction_count -= 1
             instruction.reset(skip_qargs=skip_qargs)
 
@@ -400,6 +417,7 @@ class Robot(Controllable, ABC):
             self.__instruction_count += 1
             self.__instructions[position] = instruction
             instruction.use(position)
+            self.__set_column(position, instruction)
         else:
             # illegal position removes the instruction from the circuit if possible
             self.__remove_instruction(instruction)
@@ -419,6 +437,14 @@ class Robot(Controllable, ABC):
                 return True
         return False
 
+    def __rebuild_circuit_unitary(self):
+        # the column unitaries depend on the number of qubits, so they all have to be recomputed
+        self.__circuit_unitary = IncrementalUnitary(self.__backend, self.num_of_qubits, self.circuit_space)
+        self.__circuit_version += 1
+        for position, instruction in enumerate(self.__instructions):
+            if instruction:
+                self.__set_column(position, instruction)
+
     def get_instruction(self, instruction_index: int) -> Optional[Instruction]:
         if 0 <= instruction_index < self.backpack.used_capacity:
             return self.backpack.get(instruction_index)
@@ -469,6 +495,7 @@ class Robot(Controllable, ABC):
             self.backpack.place_in_pouch(collectible)
         elif isinstance(collectible, Qubit):
             self.__attributes.add_qubits(collectible.additional_qubits)
+            self.__rebuild_circuit_unitary()
         elif isinstance(collectible, MultiCollectible):
             for c in collectible.iterator():
                 self.give_collectible(c)
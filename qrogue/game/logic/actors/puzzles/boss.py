@@ -1,7 +1,8 @@
 
 from abc import ABC
+from typing import Union
 
-from qrogue.game.logic.actors import StateVector
+from qrogue.game.logic.actors import StateVector, SimulationResult
 from qrogue.game.logic.collectibles import Collectible, Coin
 
 from .enemy import Enemy
@@ -14,7 +15,7 @@ class Boss(Enemy, ABC):
     A special Enemy with specified target and reward.
     """
 
-    def __init__(self, target: StateVector, reward: Collectible):
+    def __init__(self, target: Union[StateVector, SimulationResult], reward: Collectible):
         """
         Creates a boss enemy with a specified target StateVector and a specified reward.
         :param target:
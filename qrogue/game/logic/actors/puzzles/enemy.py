@@ -1,5 +1,7 @@
 
-from qrogue.game.logic.actors import StateVector
+from typing import Union
+
+from qrogue.game.logic.actors import StateVector, SimulationResult
 from qrogue.game.logic.collectibles import Collectible
 from qrogue.util import RandomManager, PuzzleConfig
 
@@ -11,7 +13,7 @@ class Enemy(Target):
     An Enemy is a Target with a certain chance to flee.
     """
 
-    def __init__(self, eid: int, target: StateVector, reward: Collectible):
+    def __init__(self, eid: int, target: Union[StateVector, SimulationResult], reward: Collectible):
         """
         Creates an Enemy-Target with a given target state vector and reward.
         :param eid: id in [0, 9] to calculate certain properties
@@ -1,13 +1,13 @@
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Union
 
-from qrogue.game.logic.actors import StateVector
+from qrogue.game.logic.actors import StateVector, SimulationResult
 from qrogue.game.logic.collectibles import Collectible
 
 from .target import Target
 
 
 class Riddle(Target):
-    def __init__(self, target: StateVector, reward: Collectible, attempts: int = 1):
+    def __init__(self, target: Union[StateVector, SimulationResult], reward: Collectible, attempts: int = 1):
         super().__init__(target, reward)
         self.__attempts = attempts
 
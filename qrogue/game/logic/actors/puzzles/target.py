@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Union
 
-from qrogue.game.logic.actors import StateVector
+from qrogue.game.logic.actors import StateVector, SimulationResult
 from qrogue.game.logic.collectibles import Collectible
 from qrogue.util import CheatConfig
 
@@ -11,10 +11,11 @@ class Target(ABC):
     Base class for fight-/puzzle-targets.
     """
 
-    def __init__(self, target: StateVector, reward: Collectible):
+    def __init__(self, target: Union[StateVector, SimulationResult], reward: Collectible):
         """
         Creates a Target with a given target state vector and a reward.
-        :param target: the StateVector to reach
+        :param target: the StateVector to reach or the SimulationResult providing it (e.g. if it should only be
+        computed once it is needed)
         :param reward: the Collectible to get as a reward
         """
         self.__target = target
@@ -27,6 +28,8 @@ class Target(ABC):
 
         :return: the Target's StateVector
         """
+        if isinstance(self.__target, SimulationResult):
+            self.__target = self.__target.state_vector
         return self.__target
 
     @property
@@ -48,7 +51,7 @@ class Target(ABC):
         :param state_vector: the StateVector to check for equality
         :return: True and a Collectible if the Target is reached, False and None otherwise
         """
-        if self.__target.is_equal_to(state_vector) or CheatConfig.in_god_mode():
+        if self.state_vector.is_equal_to(state_vector) or CheatConfig.in_god_mode():
             self._on_reached()
             self.__is_active = False
             temp = self.__reward
@@ -67,7 +70,7 @@ class Target(ABC):
 
     def __str__(self):
         string = "["
-        for q in self.__target.to_value():
+        for q in self.state_vector.to_value():
             string += f"{q} "
         string += "]"
         return string
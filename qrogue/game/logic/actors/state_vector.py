@@ -1,12 +1,11 @@
-from collections import Iterator
-from typing import List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
-from qiskit import transpile, QuantumCircuit
-from qiskit.providers.aer import StatevectorSimulator
 
 from qrogue.game.logic.collectibles import Instruction
-from qrogue.util import Logger, QuantumSimulationConfig, GameplayConfig, Options
+from qrogue.game.logic.simulation import get_backend, SimulationCache, canonical_signature, is_permutation_circuit, \
+    simulate_permutation, permutation_to_unitary, marginal_probabilities, sample_outcomes, outcome_to_bits
+from qrogue.util import Logger, MyRandom, QuantumSimulationConfig, GameplayConfig, Options
 from qrogue.util.config import ColorCode, ColorConfig
 from qrogue.util.util_functions import is_power_of_2, center_string, to_binary_string, align_string
 
@@ -37,11 +36,24 @@ def _wrap_in_ket_notation(number: complex, qubit: int, num_of_qubits: int,
         return value
 
 
+def _to_read_only_array(values) -> np.ndarray:
+    array = np.array(values, dtype=np.complex128)   # always copies so nobody else can modify our data
+    array.flags.writeable = False
+    return array
+
+
 class StateVector:
+    """
+    Immutable vector of amplitudes backed by a contiguous complex128 array, so it can safely be shared (e.g. between
+    Targets, the SimulationCache and the UI). Statevectors of many qubits can also be stored sparsely as the indices and
+    amplitudes of their non-zero entries, in which case the dense array is only created if it is actually accessed.
+    """
+    __slots__ = ("__amplitudes", "__indices", "__values", "__num_of_qubits", "__num_of_used_gates")
+
     @staticmethod
     def check_amplitudes(amplitudes: List[complex]):
         if is_power_of_2(len(amplitudes)):
-            amp_sum = sum([c.real**2 + c.imag**2 for c in amplitudes])
+            amp_sum = np.vdot(amplitudes, amplitudes).real
             return 1 - QuantumSimulationConfig.TOLERANCE <= amp_sum <= 1 + QuantumSimulationConfig.TOLERANCE
         return False
 
@@ -77,38 +89,104 @@ class StateVector:
 
     @staticmethod
     def create_zero_state_vector(num_of_qubits: int) -> "StateVector":
-        amplitudes = [1] + [0] * (2**num_of_qubits - 1)
+        if num_of_qubits >= QuantumSimulationConfig.SPARSE_MIN_QUBITS:
+            return StateVector.from_sparse([0], [1], num_of_qubits)
+        amplitudes = np.zeros(2 ** num_of_qubits, dtype=np.complex128)
+        amplitudes[0] = 1
         return StateVector(amplitudes)
 
+    @staticmethod
+    def from_sparse(indices: Union[List[int], np.ndarray], values: Union[List[complex], np.ndarray],
+                    num_of_qubits: int, num_of_used_gates: Optional[int] = None) -> "StateVector":
+        """
+
+        :param indices: the (distinct) basis state indices of the non-zero amplitudes
+        :param values: the corresponding amplitudes
+        :param num_of_qubits: number of qubits of the statevector
+        :param num_of_used_gates: how many gates were used to create this StateVector
+        :return: a sparsely stored StateVector with 0 at every index not given
+        """
+        indices = np.array(indices, dtype=np.int64).reshape(-1)
+        values = np.array(values, dtype=np.complex128).reshape(-1)
+        assert len(indices) == len(values)
+        order = np.argsort(indices)
+        indices, values = indices[order], values[order]
+        indices.flags.writeable = False
+        values.flags.writeable = False
+
+        stv = StateVector.__new__(StateVector)
+        stv.__amplitudes = None
+        stv.__indices = indices
+        stv.__values = values
+        stv.__num_of_qubits = num_of_qubits
+        stv.__num_of_used_gates = num_of_used_gates
+        return stv
+
+    @staticmethod
+    def __subtract_sparse(left: Tuple[np.ndarray, np.ndarray], right: Tuple[np.ndarray, np.ndarray]) \
+            -> Tuple[np.ndarray, np.ndarray]:
+        left_indices, left_values = left
+        right_indices, right_values = right
+        indices = np.union1d(left_indices, right_indices)
+        values = np.zeros(len(indices), dtype=np.complex128)
+        values[np.searchsorted(indices, left_indices)] += left_values
+        values[np.searchsorted(indices, right_indices)] -= right_values
+        return indices, values
+
     @staticmethod
     def from_gates(gates: List[Instruction], num_of_qubits: int) -> "StateVector":
-        circuit = QuantumCircuit(num_of_qubits, num_of_qubits)
-        for instruction in gates:
-            instruction.append_to(circuit)
-        simulator = StatevectorSimulator()
-        compiled_circuit = transpile(circuit, simulator)
-        # We only do 1 shot since we don't need any measurement but the StateVector
-        job = simulator.run(compiled_circuit, shots=1)
-        return StateVector(job.result().get_statevector(), num_of_used_gates=len(gates))
-
-    def __init__(self, amplitudes: List[complex], num_of_used_gates: Optional[int] = None):
-        self.__amplitudes = amplitudes
+        return SimulationResult.from_gates(gates, num_of_qubits).state_vector
+
+    def __init__(self, amplitudes: Union[List[complex], np.ndarray], num_of_used_gates: Optional[int] = None):
+        self.__amplitudes = _to_read_only_array(amplitudes)
+        if not is_power_of_2(len(self.__amplitudes)):
+            Logger.instance().throw(ValueError(
+                f"A StateVector needs 2^n amplitudes but {len(self.__amplitudes)} were given!"))
+        self.__indices = None
+        self.__values = None
+        self.__num_of_qubits = len(self.__amplitudes).bit_length() - 1
         self.__num_of_used_gates = num_of_used_gates
 
     @property
     def size(self) -> int:
-        return len(self.__amplitudes)
+        return 2 ** self.__num_of_qubits
 
     @property
     def num_of_qubits(self) -> int:
-        return int(np.log2(self.size))
+        return self.__num_of_qubits
+
+    @property
+    def is_sparse(self) -> bool:
+        return self.__indices is not None
+
+    @property
+    def amplitudes(self) -> np.ndarray:
+        """
+
+        :return: read-only array of the amplitudes
+        """
+        if self.__amplitudes is None:
+            amplitudes = np.zeros(self.size, dtype=np.complex128)
+            amplitudes[self.__indices] = self.__values
+            amplitudes.flags.writeable = False
+            self.__amplitudes = amplitudes
+        return self.__amplitudes
+
+    @property
+    def non_zero_entries(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+
+        :return: sorted indices and amplitudes of the non-zero entries
+        """
+        if self.__indices is None:
+            indices = np.flatnonzero(self.__amplitudes)
+            return indices, self.__amplitudes[indices]
+        return self.__indices, self.__values
 
     @property
     def is_zero(self) -> bool:
-        for val in self.__amplitudes:
-            if abs(val) > QuantumSimulationConfig.TOLERANCE:
-                return False
-        return True
+        _, values = self.non_zero_entries
+        return not np.any(np.abs(values) > QuantumSimulationConfig.TOLERANCE)
 
     @property
     def num_of_used_gates(self) -> int:
@@ -116,10 +194,66 @@ class StateVector:
 
     def at(self, index: int) -> complex:
         if 0 <= index < self.size:
+            if self.__amplitudes is None:
+                position = np.searchsorted(self.__indices, index)
+                if position < len(self.__indices) and self.__indices[position] == index:
+                    return self.__values[position]
+                return 0j
             return self.__amplitudes[index]
 
     def to_value(self) -> List[float]:
-        return [np.round(val.real ** 2 + val.imag ** 2, decimals=QuantumSimulationConfig.DECIMALS) for val in self.__amplitudes]
+        amplitudes = self.amplitudes
+        probabilities = amplitudes.real ** 2 + amplitudes.imag ** 2
+        return np.round(probabilities, decimals=QuantumSimulationConfig.DECIMALS).tolist()
+
+    def probabilities(self, qubits: Optional[List[int]] = None) -> np.ndarray:
+        """
+
+        :param qubits: the measured qubits, None to measure all of them
+        :return: the probability of every outcome when measuring the given qubits, bit i of an outcome is the value of
+        qubits[i]
+        """
+        indices, values = self.non_zero_entries
+        return marginal_probabilities(indices, values, self.num_of_qubits, qubits)
+
+    def sample(self, rm: MyRandom, shots: int = 1, qubits: Optional[List[int]] = None) -> np.ndarray:
+        """
+        Simulates measuring the state shots times without collapsing it.
+
+        :param rm: seeded randomness so the outcomes are reproducible
+        :param shots: how many measurements to simulate
+        :param qubits: the measured qubits, None to measure all of them
+        :return: the measured outcomes as integers, bit i of an outcome is the value of qubits[i] (or of qubit i if all
+        qubits are measured)
+        """
+        indices, values = self.non_zero_entries
+        if len(indices) == 0:
+            Logger.instance().throw(ValueError("Cannot measure a StateVector without any non-zero amplitude!"))
+        rng = np.random.default_rng(rm.get_seed(msg="StateVector.sample()"))
+        return sample_outcomes(indices, values, shots, rng, qubits)
+
+    def sample_counts(self, rm: MyRandom, shots: int, qubits: Optional[List[int]] = None) -> Dict[int, int]:
+        """
+
+        :return: how often every outcome was measured, see sample() for the parameters
+        """
+        outcomes, counts = np.unique(self.sample(rm, shots, qubits), return_counts=True)
+        return {int(outcome): int(count) for outcome, count in zip(outcomes, counts)}
+
+    def measure(self, rm: MyRandom, qubits: Optional[List[int]] = None) -> List[int]:
+        """
+
+        :param rm: seeded randomness so the outcome is reproducible
+        :param qubits: the measured qubits, None to measure all of them
+        :return: the values of a single measurement where list[i] is the value of qubits[i] (or of qubit i)
+        """
+        num_of_bits = self.num_of_qubits if qubits is None else len(qubits)
+        return outcome_to_bits(self.sample(rm, 1, qubits)[0], num_of_bits)
+
+    def __truncated_entries(self, size: int) -> Tuple[np.ndarray, np.ndarray]:
+        indices, values = self.non_zero_entries
+        end = np.searchsorted(indices, size)
+        return indices[:end], values[:end]
 
     def is_equal_to(self, other, tolerance: float = QuantumSimulationConfig.TOLERANCE) -> bool:
         if type(other) is not type(self):
@@ -128,33 +262,28 @@ class StateVector:
         #  (so the robot can have more qubits than the enemy)
         if self.size > other.size:
             return False
-        """
-        self_value = self.__amplitudes  #self.to_value()
-        other_value = other.__amplitudes    #other.to_value()
-        for i in range(len(self_value)):
-            p_min = self_value[i] - tolerance/2         # todo maybe tolerance doesn't work for imaginary numbers?
-            p = other_value[i]
-            p_max = self_value[i] + tolerance/2
-            if not (p_min <= p <= p_max):
-                return False
-        """
-        diff = [self.__amplitudes[i] - other.__amplitudes[i] for i in range(self.size)]
-        for val in diff:
-            if abs(val) > tolerance:
-                return False
-        return True
+        if self.is_sparse or other.is_sparse:
+            _, diff = StateVector.__subtract_sparse(self.non_zero_entries, other.__truncated_entries(self.size))
+        else:
+            diff = self.__amplitudes - other.__amplitudes[:self.size]
+        return not np.any(np.abs(diff) > tolerance)
 
     def get_diff(self, other: "StateVector") -> "StateVector":
         if self.size == other.size:
-            diff = [self.__amplitudes[i] - other.__amplitudes[i] for i in range(self.size)]
-            return StateVector(diff)
+            if self.is_sparse or other.is_sparse:
+                indices, values = StateVector.__subtract_sparse(self.non_zero_entries, other.non_zero_entries)
+                return StateVector.from_sparse(indices, values, self.num_of_qubits)
+            return StateVector(self.__amplitudes - other.__amplitudes)
         elif self.size < other.size:
             Logger.instance().info("Requested difference between StateVectors of different sizes! "
                                    f"self = {self}, other = {other}; padding self with the needed number of 0s",
                                    from_pycui=False)
-            diff: List[complex] = [0] * other.size
-            for i in range(self.size):
-                diff[i] = self.__amplitudes[i] - other.__amplitudes[i]
+            if self.is_sparse or other.is_sparse:
+                indices, values = StateVector.__subtract_sparse(self.non_zero_entries,
+                                                                other.__truncated_entries(self.size))
+                return StateVector.from_sparse(indices, values, other.num_of_qubits)
+            diff = np.zeros(other.size, dtype=np.complex128)
+            np.subtract(self.__amplitudes, other.__amplitudes[:self.size], out=diff[:self.size])
             return StateVector(diff)
         else:
             raise ValueError("Cannot calculate the difference between StateVectors of different size! "
@@ -175,44 +304,89 @@ class StateVector:
 
     def __eq__(self, other) -> bool: # TODO currently not even in use!
         if type(other) is type(self):
-            return self.__amplitudes == other.__amplitudes
+            return np.array_equal(self.amplitudes, other.amplitudes)
         elif isinstance(other, list):
-            if len(other) <= 0 or len(other) >= len(self.__amplitudes):
+            amplitudes = self.amplitudes
+            if len(other) <= 0 or len(other) >= len(amplitudes):
                 return False
             if isinstance(other[0], bool):
-                for i in range(len(self.__amplitudes)):
-                    if self.__amplitudes[i] == 1 and not other[i] or self.__amplitudes[i] == 0 and other[i]:
+                for i in range(len(amplitudes)):
+                    if amplitudes[i] == 1 and not other[i] or amplitudes[i] == 0 and other[i]:
                         return False
                 return True
             elif isinstance(other[0], float):
-                for i in range(len(self.__amplitudes)):
-                    if self.__amplitudes[i] != other[i]:
+                for i in range(len(amplitudes)):
+                    if amplitudes[i] != other[i]:
                         return False
                 return True
         return False
 
     def __str__(self) -> str:
-        text = "StateVector("
-        for val in self.__amplitudes:
-            text += f"{np.round(val, QuantumSimulationConfig.DECIMALS)}, "
-        text = text[:-2] + ")"
-        return text
+        values = np.round(self.amplitudes, QuantumSimulationConfig.DECIMALS)
+        return "StateVector(" + ", ".join([str(val) for val in values]) + ")"
 
     def __iter__(self) -> Iterator:
-        return iter(self.__amplitudes)
+        return iter(self.amplitudes)
 
 
 class CircuitMatrix:
-    def __init__(self, matrix: List[List[complex]]):
-        self.__matrix = matrix
+    """
+    Immutable matrix of a circuit backed by a contiguous complex128 array. Matrices of circuits that only permute basis
+    states can also be stored as the permutation itself, in which case the dense array is only created on demand.
+    """
+    __slots__ = ("__matrix", "__permutation")
+
+    @staticmethod
+    def from_permutation(permutation: np.ndarray) -> "CircuitMatrix":
+        """
+
+        :param permutation: array p where p[i] is the index of the basis state that basis state i is mapped to
+        :return: a CircuitMatrix that only materializes its dense matrix if it is actually accessed
+        """
+        circuit_matrix = CircuitMatrix.__new__(CircuitMatrix)
+        circuit_matrix.__matrix = None
+        circuit_matrix.__permutation = np.array(permutation, dtype=np.int64)
+        circuit_matrix.__permutation.flags.writeable = False
+        return circuit_matrix
+
+    def __init__(self, matrix: Union[List[List[complex]], np.ndarray]):
+        self.__matrix = _to_read_only_array(matrix)
+        self.__permutation = None
 
     @property
     def size(self) -> int:
+        if self.__matrix is None:
+            return len(self.__permutation)
         return len(self.__matrix)
 
+    @property
+    def is_permutation(self) -> bool:
+        return self.__permutation is not None
+
+    @property
+    def permutation(self) -> Optional[np.ndarray]:
+        """
+
+        :return: read-only array p where p[i] is the row of the only 1 in column i or None if this matrix was not
+        created from a permutation
+        """
+        return self.__permutation
+
     @property
     def num_of_qubits(self) -> int:
-        return int(np.log2(self.size))
+        return self.size.bit_length() - 1
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """
+
+        :return: read-only array of the matrix
+        """
+        if self.__matrix is None:
+            matrix = permutation_to_unitary(self.__permutation)
+            matrix.flags.writeable = False
+            self.__matrix = matrix
+        return self.__matrix
 
     def to_string(self, space_per_value: int = QuantumSimulationConfig.MAX_SPACE_PER_NUMBER) -> str:
         spacing = " "
@@ -226,7 +400,7 @@ class CircuitMatrix:
             text += "\n"
         else:
             text = "\n"
-        for i, row in enumerate(self.__matrix):
+        for i, row in enumerate(self.matrix):
             if GameplayConfig.get_option_value(Options.show_ket_notation, convert=True):
                 text += _generate_ket(i, self.num_of_qubits)
                 text += spacing
@@ -238,9 +412,99 @@ class CircuitMatrix:
 
     def __str__(self) -> str:
         text = "CircuitMatrix("
-        for row in self.__matrix:
+        for row in self.matrix:
             for val in row:
                 text += f"{np.round(val, QuantumSimulationConfig.DECIMALS)}, "
             text += "\n"
         text = text[:-2] + ")"
         return text
+
+
+class SimulationResult:
+    """
+    Result of simulating a circuit. StateVector and CircuitMatrix are only computed when they are actually requested
+    and cached afterwards. Since the CircuitMatrix grows with 4^n it is only materialized if somebody (e.g. the
+    CircuitMatrixWidget) needs it and the StateVector then simply becomes its first column (we always start in |0...0>).
+    """
+
+    @staticmethod
+    def from_gates(gates: List[Instruction], num_of_qubits: int) -> "SimulationResult":
+        """
+        Looks up the result of the given circuit in the shared SimulationCache and only creates a new one on a miss.
+
+        :param gates: the Instructions of the circuit in order
+        :param num_of_qubits: number of qubits of the circuit
+        :return: the SimulationResult of the given circuit
+        """
+        return SimulationCache.instance().get_or_compute(
+            (get_backend().name, canonical_signature(gates, num_of_qubits)),
+            lambda: SimulationResult([gate.copy_with_qargs() for gate in gates], num_of_qubits)
+        )
+
+    def __init__(self, instructions: List[Instruction], num_of_qubits: int,
+                 unitary_provider: Optional[Callable[[], Optional[np.ndarray]]] = None):
+        """
+
+        :param instructions: the Instructions of the circuit in order, must not be changed afterwards
+        :param num_of_qubits: number of qubits of the circuit
+        :param unitary_provider: computes the circuit's unitary or returns None if it cannot (anymore), in which case
+        the given Instructions are simulated instead
+        """
+        self.__instructions = instructions
+        self.__num_of_qubits = num_of_qubits
+        self.__unitary_provider = unitary_provider
+        self.__unitary: Optional[np.ndarray] = None
+        self.__state_vector: Optional[StateVector] = None
+        self.__circuit_matrix: Optional[CircuitMatrix] = None
+
+    @property
+    def num_of_qubits(self) -> int:
+        return self.__num_of_qubits
+
+    @property
+    def num_of_used_gates(self) -> int:
+        return len(self.__instructions)
+
+    @property
+    def has_circuit_matrix(self) -> bool:
+        """
+
+        :return: whether the CircuitMatrix was already materialized or not
+        """
+        return self.__circuit_matrix is not None
+
+    @property
+    def state_vector(self) -> StateVector:
+        if self.__state_vector is None:
+            if self.__unitary is None:
+                backend = get_backend()
+                entries = backend.sparse_statevector(self.__instructions, self.__num_of_qubits)
+                if entries is None:
+                    amplitudes = backend.statevector(self.__instructions, self.__num_of_qubits)
+                else:
+                    indices, values = entries
+                    self.__state_vector = StateVector.from_sparse(indices, values, self.__num_of_qubits,
+                                                                  num_of_used_gates=self.num_of_used_gates)
+                    return self.__state_vector
+            else:
+                amplitudes = self.__unitary[:, 0]
+            self.__state_vector = StateVector(amplitudes, num_of_used_gates=self.num_of_used_gates)
+        return self.__state_vector
+
+    @property
+    def circuit_matrix(self) -> CircuitMatrix:
+        if self.__circuit_matrix is None:
+            if is_permutation_circuit(self.__instructions):
+                # no need for a dense unitary, the StateVector is then also computed from basis state indices
+                self.__unitary_provider = None
+                permutation = simulate_permutation(self.__instructions, self.__num_of_qubits)
+                self.__circuit_matrix = CircuitMatrix.from_permutation(permutation)
+                return self.__circuit_matrix
+            if self.__unitary_provider is not None:
+                self.__unitary = self.__unitary_provider()
+                self.__unitary_provider = None  # might reference bigger structures we don't need anymore
+            if self.__unitary is None:
+                self.__unitary = get_backend().unitary(self.__instructions, self.__num_of_qubits)
+            self.__circuit_matrix = CircuitMatrix(self.__unitary)
+        return self.__circuit_matrix
+
@@ -1,5 +1,6 @@
 # exporting
 from .collectible import Collectible, CollectibleType, MultiCollectible, ShopItem
+from .gate_descriptor import GateDescriptor
 from .instruction import Instruction, CXGate, HGate, SwapGate, XGate
 from .pickup import Pickup, Coin, Key, Energy
 from .qubit import Qubit
@@ -0,0 +1,111 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class GateDescriptor:
+    """
+    Immutable description of a gate (name, number of qubits and matrix) shared by all Instructions of the same type.
+    Descriptors are interned, so creating or copying an Instruction doesn't create anything but the Instruction itself.
+    The corresponding Qiskit gate is only created (once per descriptor) when a Qiskit based backend needs it, hence
+    Qiskit is not imported unless it is actually used.
+
+    Matrices follow Qiskit's little-endian convention, i.e. for multi qubit gates the first qarg corresponds to the least
+    significant bit of the matrix index (e.g. CX's control is qargs[0]).
+    """
+    __REGISTRY: Dict[str, "GateDescriptor"] = {}
+
+    @staticmethod
+    def register(name: str, matrix: np.ndarray, qiskit_name: str) -> "GateDescriptor":
+        """
+        Creates the descriptor of a gate if there is none with the given name yet.
+
+        :param name: unique name of the gate
+        :param matrix: the gate's unitary
+        :param qiskit_name: name of the corresponding class in qiskit.circuit.library.standard_gates
+        :return: the registered descriptor of the given name
+        """
+        if name not in GateDescriptor.__REGISTRY:
+            GateDescriptor.__REGISTRY[name] = GateDescriptor(name, matrix, qiskit_name)
+        return GateDescriptor.__REGISTRY[name]
+
+    @staticmethod
+    def get(name: str) -> Optional["GateDescriptor"]:
+        """
+
+        :param name: name of the gate
+        :return: the registered descriptor of the given name or None if there is none
+        """
+        return GateDescriptor.__REGISTRY.get(name)
+
+    def __init__(self, name: str, matrix: np.ndarray, qiskit_name: str):
+        """
+        Use register() instead so descriptors stay interned.
+        """
+        self.__name = name
+        self.__num_of_qubits = int(np.log2(len(matrix)))
+        self.__matrix = np.array(matrix, dtype=complex)
+        self.__matrix.setflags(write=False)
+        # the same matrix reshaped to one axis of size 2 per in- and output qubit to contract it with a state tensor
+        self.__tensor = self.__matrix.reshape((2,) * (2 * self.__num_of_qubits))
+        self.__qiskit_name = qiskit_name
+        self.__qiskit_gate = None
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def num_of_qubits(self) -> int:
+        return self.__num_of_qubits
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """
+
+        :return: the read-only unitary of the gate without considering any qargs
+        """
+        return self.__matrix
+
+    @property
+    def tensor(self) -> np.ndarray:
+        """
+
+        :return: the read-only unitary reshaped to one axis per in- and output qubit
+        """
+        return self.__tensor
+
+    def qiskit_gate(self):
+        """
+
+        :return: the corresponding gate of qiskit.circuit.library, created on the first call
+        """
+        if self.__qiskit_gate is None:
+            import qiskit.circuit.library.standard_gates as gates
+            self.__qiskit_gate = getattr(gates, self.__qiskit_name)()
+        return self.__qiskit_gate
+
+    def __str__(self) -> str:
+        return f"GateDescriptor({self.__name}, {self.__num_of_qubits} qubits)"
+
+
+_SQRT2_INV = 1 / np.sqrt(2)
+
+I_GATE = GateDescriptor.register("I", np.array([[1, 0],
+                                                [0, 1]]), "IGate")
+X_GATE = GateDescriptor.register("X", np.array([[0, 1],
+                                                [1, 0]]), "XGate")
+Y_GATE = GateDescriptor.register("Y", np.array([[0, -1j],
+                                                [1j, 0]]), "YGate")
+Z_GATE = GateDescriptor.register("Z", np.array([[1, 0],
+                                                [0, -1]]), "ZGate")
+H_GATE = GateDescriptor.register("H", np.array([[_SQRT2_INV, _SQRT2_INV],
+                                                [_SQRT2_INV, -_SQRT2_INV]]), "HGate")
+SWAP_GATE = GateDescriptor.register("Swap", np.array([[1, 0, 0, 0],
+                                                      [0, 0, 1, 0],
+                                                      [0, 1, 0, 0],
+                                                      [0, 0, 0, 1]]), "SwapGate")
+CX_GATE = GateDescriptor.register("CX", np.array([[1, 0, 0, 0],
+                                                  [0, 0, 0, 1],
+                                                  [0, 0, 1, 0],
+                                                  [0, 1, 0, 0]]), "CXGate")
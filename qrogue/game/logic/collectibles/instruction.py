@@ -1,29 +1,35 @@
 
 from abc import ABC, abstractmethod
-from typing import Iterator, Optional
-
-import qiskit.circuit.library.standard_gates as gates
-from qiskit import QuantumCircuit
+from typing import Iterator, Optional, TYPE_CHECKING
 
 from qrogue.game.logic.collectibles import Collectible, CollectibleType
+from qrogue.game.logic.collectibles.gate_descriptor import GateDescriptor, I_GATE, X_GATE, Y_GATE, Z_GATE, H_GATE, \
+    SWAP_GATE, CX_GATE
 from qrogue.util import ShopConfig, Logger
 
+if TYPE_CHECKING:
+    from qiskit import QuantumCircuit
+
 
 class Instruction(Collectible, ABC):
     """
-    Wrapper class for gates from qiskit.circuit.library with their needed arguments (qubits/cbits to apply it on)
+    A gate (described by its shared GateDescriptor) with its needed arguments (qubits/cbits to apply it on)
     """
     MAX_ABBREVIATION_LEN = 5
     __DEFAULT_PRICE = 15 * ShopConfig.base_unit()
 
-    def __init__(self, instruction, needed_qubits: int):
+    def __init__(self, descriptor: GateDescriptor):
         super().__init__(CollectibleType.Gate)
-        self.__instruction = instruction
-        self.__needed_qubits = needed_qubits
+        self.__descriptor = descriptor
+        self.__needed_qubits = descriptor.num_of_qubits
         self._qargs = []
         self._cargs = []
         self.__position: Optional[int] = None
 
+    @property
+    def descriptor(self) -> GateDescriptor:
+        return self.__descriptor
+
     @property
     def num_of_qubits(self) -> int:
         return self.__needed_qubits
@@ -70,8 +76,8 @@ class Instruction(Collectible, ABC):
         if not skip_position:
             self.__position = None
 
-    def append_to(self, circuit: QuantumCircuit):
-        circuit.append(self.__instruction, self._qargs, self._cargs)
+    def append_to(self, circuit: "QuantumCircuit"):
+        circuit.append(self.__descriptor.qiskit_gate(), self._qargs, self._cargs)
 
     def qargs_iter(self) -> Iterator[int]:
         return iter(self._qargs)
@@ -95,6 +101,16 @@ class Instruction(Collectible, ABC):
     def copy(self) -> "Instruction":
         pass
 
+    def copy_with_qargs(self) -> "Instruction":
+        """
+
+        :return: a copy of this Instruction that uses the same qubits but is not placed anywhere
+        """
+        instruction = self.copy()
+        for qubit in self._qargs:
+            instruction.use_qubit(qubit)
+        return instruction
+
     def default_price(self) -> int:
         return Instruction.__DEFAULT_PRICE
 
@@ -132,13 +148,12 @@ class Instruction(Collectible, ABC):
 
 
 class SingleQubitGate(Instruction, ABC):
-    def __init__(self, instruction):
-        super().__init__(instruction, needed_qubits=1)
+    pass
 
 
 class IGate(SingleQubitGate):
     def __init__(self):
-        super().__init__(gates.IGate())
+        super().__init__(I_GATE)
 
     def short_name(self) -> str:
         return "I"
@@ -152,7 +167,7 @@ class IGate(SingleQubitGate):
 
 class XGate(SingleQubitGate):
     def __init__(self):
-        super(XGate, self).__init__(gates.XGate())
+        super(XGate, self).__init__(X_GATE)
 
     def short_name(self) -> str:
         return "X"
@@ -170,7 +185,7 @@ class XGate(SingleQubitGate):
 
 class YGate(SingleQubitGate):
     def __init__(self):
-        super(YGate, self).__init__(gates.YGate())
+        super(YGate, self).__init__(Y_GATE)
 
     def short_name(self) -> str:
         return "Y"
@@ -187,7 +202,7 @@ class YGate(SingleQubitGate):
 
 class ZGate(SingleQubitGate):
     def __init__(self):
-        super(ZGate, self).__init__(gates.ZGate())
+        super(ZGate, self).__init__(Z_GATE)
 
     def short_name(self) -> str:
         return "Z"
@@ -204,7 +219,7 @@ class ZGate(SingleQubitGate):
 
 class HGate(SingleQubitGate):
     def __init__(self):
-        super().__init__(gates.HGate())
+        super().__init__(H_GATE)
 
     def description(self) -> str:
         return "The Hadamard Gate is often used to bring Qubits to Superposition."
@@ -240,13 +255,12 @@ class MultiQubitGate(Instruction, ABC):
 
 
 class DoubleQubitGate(MultiQubitGate, ABC):
-    def __init__(self, instruction):
-        super(DoubleQubitGate, self).__init__(instruction, needed_qubits=2)
+    pass
 
 
 class SwapGate(DoubleQubitGate):
     def __init__(self):
-        super().__init__(gates.SwapGate())
+        super().__init__(SWAP_GATE)
 
     def description(self) -> str:
         return "As the name suggests, Swap Gates swap the amplitude between two Qubits."
@@ -263,7 +277,7 @@ class SwapGate(DoubleQubitGate):
 
 class CXGate(DoubleQubitGate):
     def __init__(self):
-        super().__init__(gates.CXGate())
+        super().__init__(CX_GATE)
 
     def short_name(self) -> str:
         return "CX"
@@ -0,0 +1,18 @@
+# exporting
+from .permutation import is_permutation_circuit, simulate_basis_state, simulate_permutation, basis_state_amplitudes, \
+    permutation_to_unitary
+from .gates import gate_matrix, gate_tensor
+from .sparse import SparseAmplitudes, apply_instruction_sparse, simulate_sparse_statevector
+from .measurement import marginal_outcomes, marginal_probabilities, sample_outcomes, outcome_to_bits
+from .engine import SimulationBackend, NumpyBackend, get_backend, apply_instruction, simulate_statevector, \
+    simulate_unitary
+from .incremental import IncrementalUnitary
+from .cache import SimulationCache, circuit_signature
+from .canonical import canonical_form, canonical_signature, circuit_hash
+from .reachability import ReachableStateIndex, quantize_amplitudes
+from .solver import CircuitSolver, SolverResult
+from .corpus import PuzzleCorpus
+
+# importing
+# +util
+# +collectibles
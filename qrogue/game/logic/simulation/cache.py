@@ -0,0 +1,116 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional, Tuple
+
+from qrogue.game.logic.collectibles import Instruction
+from qrogue.util import QuantumSimulationConfig
+
+
+def circuit_signature(instructions: Iterable[Optional[Instruction]], num_of_qubits: int) -> Tuple:
+    """
+    Creates a canonical, hashable description of a circuit. Empty columns (None) are skipped since they don't
+    influence the result, so the same circuit placed at different positions has the same signature.
+
+    :param instructions: the Instructions of the circuit in order
+    :param num_of_qubits: number of qubits of the circuit
+    :return: a tuple of the qubit count and (gate type, qargs) per used column
+    """
+    return num_of_qubits, tuple((type(inst), tuple(inst.qargs_iter())) for inst in instructions if inst)
+
+
+class SimulationCache:
+    """
+    Bounded least-recently-used cache for simulation results shared by all users of the simulation (e.g. Robots and
+    target creation), keyed by the name of the simulating backend and canonical_signature() so equivalent circuits share
+    their result but results of different backends (which might differ in e.g. global phase) are never mixed.
+
+    Expeditions are generated in a background thread while the main thread keeps simulating, so every access to the
+    entries is guarded by a lock. Results are computed outside of it, hence two threads might compute the same result
+    at once, but since equal keys always lead to equal results this only costs time.
+    """
+    __instance = None
+    __instance_lock = threading.Lock()
+
+    @staticmethod
+    def instance() -> "SimulationCache":
+        with SimulationCache.__instance_lock:
+            if SimulationCache.__instance is None:
+                SimulationCache.__instance = SimulationCache(QuantumSimulationConfig.CACHE_SIZE)
+        return SimulationCache.__instance
+
+    def __init__(self, capacity: int):
+        """
+
+        :param capacity: how many results can be stored at most before the least recently used one is dropped
+        """
+        assert capacity > 0
+        self.__capacity = capacity
+        self.__entries: OrderedDict = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    @property
+    def size(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.__hits + self.__misses
+        if lookups == 0:
+            return 0.0
+        return self.__hits / lookups
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        :param key: the signature of the circuit we want the result for
+        :return: the stored result or None if the circuit is not cached
+        """
+        with self.__lock:
+            if key in self.__entries:
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+                return self.__entries[key]
+            self.__misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any):
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+            if len(self.__entries) > self.__capacity:
+                self.__entries.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        :param key: the signature of the circuit we want the result for
+        :param compute: creates the result if it is not cached yet
+        :return: the cached or freshly computed (and now cached) result
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self, reset_counters: bool = False):
+        with self.__lock:
+            self.__entries.clear()
+            if reset_counters:
+                self.__hits = 0
+                self.__misses = 0
+
+    def __str__(self) -> str:
+        return f"SimulationCache({self.size}/{self.capacity}, hits={self.hits}, misses={self.misses})"
@@ -0,0 +1,99 @@
+import hashlib
+from typing import Iterable, List, Optional, Tuple
+
+from qrogue.game.logic.collectibles import Instruction
+from qrogue.game.logic.collectibles.instruction import CXGate, HGate, IGate, SwapGate, XGate, YGate, ZGate
+
+# applying one of these gates twice on the same qubits is the identity
+SELF_INVERSE_GATES = (XGate, YGate, ZGate, HGate, SwapGate, CXGate)
+# the order of the qubits of these gates doesn't matter
+SYMMETRIC_GATES = (SwapGate,)
+
+
+def _qargs(instruction: Instruction) -> Tuple[int, ...]:
+    qargs = tuple(instruction.qargs_iter())
+    if isinstance(instruction, SYMMETRIC_GATES):
+        return tuple(sorted(qargs))
+    return qargs
+
+
+def _canonical_gates(instructions: Iterable[Optional[Instruction]], num_of_qubits: int) \
+        -> List[Tuple[Instruction, Tuple[int, ...]]]:
+    kept: List[Optional[Tuple[Instruction, Tuple[int, ...]]]] = []
+    wires: List[List[int]] = [[] for _ in range(num_of_qubits)]     # indices of the kept gates acting on a qubit
+    for instruction in instructions:
+        if instruction is None or isinstance(instruction, IGate):
+            continue
+        qargs = _qargs(instruction)
+        last = {wires[qubit][-1] if len(wires[qubit]) > 0 else None for qubit in qargs}
+        if len(last) == 1 and isinstance(instruction, SELF_INVERSE_GATES):
+            # the same gate directly before on all of our qubits cancels with us
+            index = last.pop()
+            if index is not None and type(kept[index][0]) is type(instruction) and kept[index][1] == qargs:
+                kept[index] = None
+                for qubit in qargs:
+                    wires[qubit].pop()
+                continue
+        for qubit in qargs:
+            wires[qubit].append(len(kept))
+        kept.append((instruction, qargs))
+
+    # the earliest layer of a gate only depends on which gates act on the same qubits before it
+    depths = [0] * num_of_qubits
+    layered = []
+    for gate in kept:
+        if gate is None:
+            continue
+        instruction, qargs = gate
+        layer = max(depths[qubit] for qubit in qargs)
+        for qubit in qargs:
+            depths[qubit] = layer + 1
+        layered.append((layer, qargs, instruction))
+    # gates within the same layer act on disjoint qubits, so their qargs are distinct
+    layered.sort(key=lambda entry: (entry[0], entry[1]))
+    return [(instruction, qargs) for _, qargs, instruction in layered]
+
+
+def canonical_form(instructions: Iterable[Optional[Instruction]], num_of_qubits: int) -> List[Instruction]:
+    """
+    Brings a circuit into a normal form that is the same for all circuits that only differ by
+        - the order of gates acting on disjoint qubits (they commute),
+        - pairs of the same self-inverse gate directly following each other on the same qubits (they cancel) and
+        - identity gates.
+    Cancelling is done along the qubits, so e.g. X(q0)·H(q1)·X(q0) also cancels. Afterwards every gate is moved to the
+    earliest layer its qubits allow and the gates within a layer are sorted by their qubits.
+
+    :param instructions: the Instructions of the circuit in order, empty columns (None) are skipped
+    :param num_of_qubits: number of qubits of the circuit
+    :return: copies of the remaining Instructions in canonical order
+    """
+    return [instruction.copy_with_qargs() for instruction, _ in _canonical_gates(instructions, num_of_qubits)]
+
+
+def canonical_signature(instructions: Iterable[Optional[Instruction]], num_of_qubits: int) -> Tuple:
+    """
+    Like circuit_signature() but equal for all circuits with the same canonical_form(). The number of gates stays part
+    of the signature because SimulationResults report it (e.g. for Challenges), so circuits only share a signature if
+    they also use the same number of gates.
+
+    :param instructions: the Instructions of the circuit in order, empty columns (None) are skipped
+    :param num_of_qubits: number of qubits of the circuit
+    :return: a tuple of the qubit count, the number of gates and (gate type, qargs) per gate of the canonical form
+    """
+    instructions = [instruction for instruction in instructions if instruction]
+    canonical = tuple((type(inst), qargs) for inst, qargs in _canonical_gates(instructions, num_of_qubits))
+    return num_of_qubits, len(instructions), canonical
+
+
+def circuit_hash(instructions: Iterable[Optional[Instruction]], num_of_qubits: int) -> str:
+    """
+    A hash of the canonical_form() that, unlike Python's hash(), is the same in every run, so it can e.g. be stored to
+    collect statistics about equivalent solutions.
+
+    :param instructions: the Instructions of the circuit in order, empty columns (None) are skipped
+    :param num_of_qubits: number of qubits of the circuit
+    :return: hexadecimal digest of the circuit's canonical form
+    """
+    gates = ";".join(f"{type(inst).__name__}{list(qargs)}"
+                     for inst, qargs in _canonical_gates(instructions, num_of_qubits))
+    return hashlib.sha1(f"{num_of_qubits}|{gates}".encode("utf-8")).hexdigest()
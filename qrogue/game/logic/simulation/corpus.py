@@ -0,0 +1,228 @@
+import json
+import os
+import threading
+from bisect import bisect_right
+from itertools import combinations_with_replacement
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+import numpy as np
+
+from qrogue.game.logic.collectibles import Instruction
+from qrogue.game.logic.simulation.reachability import ReachableStateIndex, quantize_amplitudes
+from qrogue.util import MyRandom, PathConfig, QuantumSimulationConfig
+
+
+class PuzzleCorpus:
+    """
+    Precomputed targets for every loadout (the available Instructions and number of qubits) up to a certain number of
+    Instructions, so targets of a given difficulty can be picked without any simulation.
+
+    The corpus is created offline by build() and stored under the game data path in three kinds of files:
+        - states_<n>q.npy: all distinct states reachable with n qubits
+        - targets_<n>q.npy: for every loadout the rows of the states it can reach, sorted by their minimum number of
+            gates
+        - index.json: where the targets of every loadout start for every number of gates
+    Both .npy files are memory-mapped, so sampling a target only reads the two rows it needs instead of the whole
+    corpus. The circuit space of a Robot doesn't have to be part of the key since it only limits the number of gates.
+    """
+    __VERSION = 1
+    __INDEX_FILE = "index.json"
+    __instance: Optional["PuzzleCorpus"] = None
+    __is_loaded = False
+    __instance_lock = threading.Lock()
+
+    @staticmethod
+    def __states_file(num_of_qubits: int) -> str:
+        return f"states_{num_of_qubits}q.npy"
+
+    @staticmethod
+    def __targets_file(num_of_qubits: int) -> str:
+        return f"targets_{num_of_qubits}q.npy"
+
+    @staticmethod
+    def loadout_key(instructions: Iterable[Instruction]) -> str:
+        """
+        :return: a description of the Instructions that doesn't depend on their order
+        """
+        return ",".join(sorted(type(instruction).__name__ for instruction in instructions))
+
+    @staticmethod
+    def instance() -> Optional["PuzzleCorpus"]:
+        """
+
+        :return: the corpus stored under the game data path or None if there is none
+        """
+        # expeditions are generated in a background thread, which must not see the corpus as loaded before it is
+        with PuzzleCorpus.__instance_lock:
+            if not PuzzleCorpus.__is_loaded:
+                if os.path.exists(PathConfig.corpus_path(PuzzleCorpus.__INDEX_FILE)):
+                    PuzzleCorpus.__instance = PuzzleCorpus(PathConfig.corpus_path())
+                PuzzleCorpus.__is_loaded = True
+        return PuzzleCorpus.__instance
+
+    @staticmethod
+    def build(folder: str, gate_types: List[Type[Instruction]],
+              max_qubits: int = QuantumSimulationConfig.CORPUS_MAX_QUBITS,
+              max_gates: int = QuantumSimulationConfig.CORPUS_MAX_GATES):
+        """
+        Enumerates the reachable states of every combination of up to max_gates of the given gate types for 1 up to
+        max_qubits qubits and stores them in the given folder. This is meant to be run offline since it takes a while.
+
+        :param folder: where to store the corpus
+        :param gate_types: the types of Instructions a Robot can have
+        :param max_qubits: maximum number of qubits of a loadout
+        :param max_gates: maximum number of Instructions of a loadout
+        """
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        index = {
+            "version": PuzzleCorpus.__VERSION,
+            "decimals": QuantumSimulationConfig.DECIMALS,
+            "max_gates": max_gates,
+            "loadouts": {},
+        }
+        for num_of_qubits in range(1, max_qubits + 1):
+            state_rows: Dict[bytes, int] = {}
+            states: List[np.ndarray] = []
+            targets: List[int] = []
+            loadouts = {}
+            for num_of_gates in range(1, max_gates + 1):
+                for combination in combinations_with_replacement(gate_types, num_of_gates):
+                    instructions = [gate_type() for gate_type in combination]
+                    reachable = ReachableStateIndex(instructions, num_of_qubits, num_of_gates)
+                    # offsets[k] is where the states needing k gates start, the last one is where the loadout ends
+                    offsets = []
+                    for min_gates in range(num_of_gates + 1):
+                        offsets.append(len(targets))
+                        for amplitudes in reachable.states(min_gates, min_gates):
+                            key = quantize_amplitudes(amplitudes)
+                            if key not in state_rows:
+                                state_rows[key] = len(states)
+                                states.append(amplitudes)
+                            targets.append(state_rows[key])
+                    offsets.append(len(targets))
+                    loadouts[PuzzleCorpus.loadout_key(instructions)] = offsets
+
+            np.save(os.path.join(folder, PuzzleCorpus.__states_file(num_of_qubits)),
+                    np.array(states, dtype=np.complex64))
+            np.save(os.path.join(folder, PuzzleCorpus.__targets_file(num_of_qubits)),
+                    np.array(targets, dtype=np.uint32))
+            index["loadouts"][str(num_of_qubits)] = loadouts
+
+        with open(os.path.join(folder, PuzzleCorpus.__INDEX_FILE), "w") as file:
+            json.dump(index, file)
+
+    def __init__(self, folder: str):
+        """
+
+        :param folder: where build() stored the corpus
+        """
+        with open(os.path.join(folder, PuzzleCorpus.__INDEX_FILE)) as file:
+            index = json.load(file)
+        self.__folder = folder
+        self.__max_gates: int = index["max_gates"]
+        # number of qubits -> loadout key -> offsets
+        self.__loadouts: Dict[int, Dict[str, List[int]]] = {int(num_of_qubits): loadouts for num_of_qubits, loadouts
+                                                            in index["loadouts"].items()}
+        # number of qubits -> (states, targets), only mapped when they are needed the first time
+        self.__files: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self.__files_lock = threading.Lock()
+
+    @property
+    def max_gates(self) -> int:
+        return self.__max_gates
+
+    def __files_of(self, num_of_qubits: int) -> Tuple[np.ndarray, np.ndarray]:
+        with self.__files_lock:
+            if num_of_qubits not in self.__files:
+                states = np.load(os.path.join(self.__folder, PuzzleCorpus.__states_file(num_of_qubits)),
+                                 mmap_mode="r")
+                targets = np.load(os.path.join(self.__folder, PuzzleCorpus.__targets_file(num_of_qubits)),
+                                  mmap_mode="r")
+                self.__files[num_of_qubits] = states, targets
+            return self.__files[num_of_qubits]
+
+    def __range(self, instructions: List[Instruction], num_of_qubits: int, circuit_space: int, min_gates: int,
+                max_gates: Optional[int]) -> Optional[Tuple[List[int], int, int]]:
+        if num_of_qubits not in self.__loadouts:
+            return None
+        offsets = self.__loadouts[num_of_qubits].get(PuzzleCorpus.loadout_key(instructions))
+        if offsets is None:
+            return None
+        # offsets has an entry for every number of gates from 0 to len(instructions) plus the end
+        last = len(offsets) - 2
+        if max_gates is not None:
+            last = min(last, max_gates)
+        last = min(last, circuit_space)
+        min_gates = max(min_gates, 0)
+        if min_gates > last:
+            return offsets, 0, 0
+        return offsets, offsets[min_gates], offsets[last + 1]
+
+    def has_loadout(self, instructions: List[Instruction], num_of_qubits: int) -> bool:
+        """
+
+        :return: whether the corpus contains the given loadout
+        """
+        return num_of_qubits in self.__loadouts and \
+            PuzzleCorpus.loadout_key(instructions) in self.__loadouts[num_of_qubits]
+
+    def count(self, instructions: List[Instruction], num_of_qubits: int, circuit_space: int, min_gates: int = 1,
+              max_gates: Optional[int] = None) -> Optional[int]:
+        """
+
+        :return: how many distinct targets within the given bounds the loadout can reach or None if the loadout is not
+        part of the corpus
+        """
+        bounds = self.__range(instructions, num_of_qubits, circuit_space, min_gates, max_gates)
+        if bounds is None:
+            return None
+        _, start, end = bounds
+        return end - start
+
+    def sample(self, rm: MyRandom, instructions: List[Instruction], num_of_qubits: int, circuit_space: int,
+               min_gates: int = 1, max_gates: Optional[int] = None) -> Optional[Tuple[np.ndarray, int]]:
+        """
+        Picks a random target of the given difficulty in constant time.
+
+        :param rm: seeded randomness for choosing the target
+        :param instructions: the Instructions available to the loadout, each of them can be used once
+        :param num_of_qubits: number of qubits of the loadout
+        :param circuit_space: how many Instructions can be placed at once
+        :param min_gates: minimum number of gates needed to reach the target, 1 excludes |0...0>
+        :param max_gates: maximum number of gates needed to reach the target, None for no limit
+        :return: the amplitudes of the target and the minimum number of gates needed to reach it or None if the loadout
+        is not part of the corpus or cannot reach any target within the given bounds
+        """
+        count = self.count(instructions, num_of_qubits, circuit_space, min_gates, max_gates)
+        if count is None or count == 0:
+            return None
+        index = rm.get_int(0, count, msg="PuzzleCorpus_sample")
+        return self.target(instructions, num_of_qubits, circuit_space, index, min_gates, max_gates)
+
+    def target(self, instructions: List[Instruction], num_of_qubits: int, circuit_space: int, index: int,
+               min_gates: int = 1, max_gates: Optional[int] = None) -> Optional[Tuple[np.ndarray, int]]:
+        """
+        Returns the target at the given index of all targets of the given difficulty, so callers can enumerate them
+        (e.g. to pick them without replacement).
+
+        :param instructions: the Instructions available to the loadout, each of them can be used once
+        :param num_of_qubits: number of qubits of the loadout
+        :param circuit_space: how many Instructions can be placed at once
+        :param index: index of the target in [0, count()[
+        :param min_gates: minimum number of gates needed to reach the target, 1 excludes |0...0>
+        :param max_gates: maximum number of gates needed to reach the target, None for no limit
+        :return: the amplitudes of the target and the minimum number of gates needed to reach it or None if the loadout
+        is not part of the corpus or the index is out of bounds
+        """
+        bounds = self.__range(instructions, num_of_qubits, circuit_space, min_gates, max_gates)
+        if bounds is None:
+            return None
+        offsets, start, end = bounds
+        position = start + index
+        if index < 0 or position >= end:
+            return None
+        states, targets = self.__files_of(num_of_qubits)
+        amplitudes = np.array(states[targets[position]], dtype=complex)
+        # the states are sorted by their minimum number of gates, so the offsets tell us the number of the sampled one
+        return amplitudes, bisect_right(offsets, position) - 1
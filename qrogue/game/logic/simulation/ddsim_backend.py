@@ -0,0 +1,41 @@
+from typing import List
+
+import numpy as np
+
+try:
+    from mqt import ddsim
+    _PROVIDER = ddsim.DDSIMProvider()
+except ImportError:
+    # older releases of the same package
+    from jkq import ddsim
+    _PROVIDER = ddsim.JKQProvider()
+
+from qrogue.game.logic.collectibles import Instruction
+from qrogue.game.logic.simulation.engine import SimulationBackend
+from qrogue.game.logic.simulation.qiskit_backend import QiskitBackend
+from qrogue.util import QuantumSimulationConfig
+
+
+class DDSIMBackend(SimulationBackend):
+    """
+    Simulates circuits with the decision diagram based simulators of DDSIM. Decision diagrams stay small as long as a
+    circuit's state has a lot of structure, so this is mainly interesting for bigger qubit counts.
+    """
+
+    def __init__(self):
+        self.__statevector_backend = _PROVIDER.get_backend('statevector_simulator')
+        self.__unitary_backend = _PROVIDER.get_backend('unitary_simulator')
+
+    @property
+    def name(self) -> str:
+        return QuantumSimulationConfig.DDSIM_BACKEND
+
+    def statevector(self, instructions: List[Instruction], num_of_qubits: int) -> np.ndarray:
+        circuit = QiskitBackend._build_circuit(instructions, num_of_qubits)
+        job = self.__statevector_backend.run(circuit, shots=1)
+        return np.asarray(job.result().get_statevector(circuit))
+
+    def unitary(self, instructions: List[Instruction], num_of_qubits: int) -> np.ndarray:
+        circuit = QiskitBackend._build_circuit(instructions, num_of_qubits)
+        job = self.__unitary_backend.run(circuit)
+        return np.asarray(job.result().get_unitary(circuit))
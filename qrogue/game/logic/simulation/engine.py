@@ -0,0 +1,165 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from qrogue.game.logic.collectibles import Instruction
+from qrogue.game.logic.simulation.gates import gate_tensor
+from qrogue.game.logic.simulation.permutation import is_permutation_circuit, simulate_basis_state, \
+    simulate_permutation, basis_state_amplitudes, permutation_to_unitary
+from qrogue.game.logic.simulation.sparse import SparseAmplitudes, simulate_sparse_statevector
+from qrogue.util import Logger, QuantumSimulationConfig
+
+
+def apply_instruction(tensor: np.ndarray, instruction: Instruction, num_of_qubits: int) -> np.ndarray:
+    """
+    Applies the given Instruction to a state tensor, i.e. a statevector or the columns of a matrix reshaped to one axis
+    per qubit (most significant qubit first) with optional trailing axes that are not touched.
+
+    :param tensor: the tensor of shape (2,) * num_of_qubits + (...) to apply the Instruction to
+    :param instruction: the Instruction to apply on its qargs
+    :param num_of_qubits: number of qubits the tensor describes
+    :return: a new tensor of the same shape with the Instruction applied
+    """
+    qargs = list(instruction.qargs_iter())
+    num_of_qargs = len(qargs)
+    # the gate's input axes are ordered from the most to the least significant qarg (= reversed qargs)
+    axes = [num_of_qubits - 1 - q for q in reversed(qargs)]
+    result = np.tensordot(gate_tensor(instruction), tensor,
+                          axes=(list(range(num_of_qargs, 2 * num_of_qargs)), axes))
+    # tensordot puts the gate's output axes in front, so we move them back to where their qubits belong
+    return np.moveaxis(result, list(range(num_of_qargs)), axes)
+
+
+def simulate_statevector(instructions: List[Instruction], num_of_qubits: int) -> np.ndarray:
+    """
+    :param instructions: the Instructions to apply in order
+    :param num_of_qubits: number of qubits of the circuit
+    :return: the amplitudes resulting from applying the given Instructions to |0...0>
+    """
+    size = 2 ** num_of_qubits
+    state = np.zeros(size, dtype=complex)
+    state[0] = 1
+    tensor = state.reshape((2,) * num_of_qubits)
+    for instruction in instructions:
+        tensor = apply_instruction(tensor, instruction, num_of_qubits)
+    return tensor.reshape(size)
+
+
+def simulate_unitary(instructions: List[Instruction], num_of_qubits: int) -> np.ndarray:
+    """
+    :param instructions: the Instructions to apply in order
+    :param num_of_qubits: number of qubits of the circuit
+    :return: the unitary matrix of the circuit described by the given Instructions
+    """
+    size = 2 ** num_of_qubits
+    tensor = np.eye(size, dtype=complex).reshape((2,) * num_of_qubits + (size,))
+    for instruction in instructions:
+        tensor = apply_instruction(tensor, instruction, num_of_qubits)
+    return tensor.reshape(size, size)
+
+
+class SimulationBackend(ABC):
+    """
+    Computes the results of circuits described by a list of Instructions.
+    """
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """
+        :return: the name of the backend as used in QuantumSimulationConfig.BACKEND
+        """
+        pass
+
+    @abstractmethod
+    def statevector(self, instructions: List[Instruction], num_of_qubits: int) -> np.ndarray:
+        """
+        :param instructions: the Instructions to apply in order
+        :param num_of_qubits: number of qubits of the circuit
+        :return: the amplitudes of the circuit's output for input |0...0>
+        """
+        pass
+
+    @abstractmethod
+    def unitary(self, instructions: List[Instruction], num_of_qubits: int) -> np.ndarray:
+        """
+        :param instructions: the Instructions to apply in order
+        :param num_of_qubits: number of qubits of the circuit
+        :return: the unitary matrix of the circuit
+        """
+        pass
+
+    def sparse_statevector(self, instructions: List[Instruction], num_of_qubits: int) -> Optional[SparseAmplitudes]:
+        """
+        Backends that can simulate statevectors sparsely override this to avoid allocating all 2^n amplitudes.
+
+        :param instructions: the Instructions to apply in order
+        :param num_of_qubits: number of qubits of the circuit
+        :return: sorted indices and amplitudes of the non-zero entries of the circuit's output for input |0...0> or
+        None if a dense statevector should be used instead
+        """
+        return None
+
+
+class NumpyBackend(SimulationBackend):
+    """
+    Directly applies precomputed gate matrices with NumPy. Since our circuits only have a handful of qubits and gates
+    this is orders of magnitude faster than going through a full simulator. Circuits consisting only of permutation
+    gates (e.g. X, CX and Swap) are simulated on basis state indices without any complex arithmetic, and statevectors
+    of bigger circuits are simulated sparsely as long as most of their amplitudes stay 0.
+    """
+
+    @property
+    def name(self) -> str:
+        return QuantumSimulationConfig.NUMPY_BACKEND
+
+    def statevector(self, instructions: List[Instruction], num_of_qubits: int) -> np.ndarray:
+        if is_permutation_circuit(instructions):
+            return basis_state_amplitudes(simulate_basis_state(instructions, num_of_qubits), num_of_qubits)
+        return simulate_statevector(instructions, num_of_qubits)
+
+    def unitary(self, instructions: List[Instruction], num_of_qubits: int) -> np.ndarray:
+        if is_permutation_circuit(instructions):
+            return permutation_to_unitary(simulate_permutation(instructions, num_of_qubits))
+        return simulate_unitary(instructions, num_of_qubits)
+
+    def sparse_statevector(self, instructions: List[Instruction], num_of_qubits: int) -> Optional[SparseAmplitudes]:
+        if num_of_qubits < QuantumSimulationConfig.SPARSE_MIN_QUBITS:
+            return None
+        return simulate_sparse_statevector(instructions, num_of_qubits)
+
+
+# backends are created once and then shared by everyone, so expensive simulators only have to be set up once per process
+_BACKENDS: Dict[str, SimulationBackend] = {
+    QuantumSimulationConfig.NUMPY_BACKEND: NumpyBackend(),
+}
+
+
+def get_backend() -> SimulationBackend:
+    """
+    :return: the shared instance of the SimulationBackend configured in QuantumSimulationConfig.BACKEND or of the
+    NumpyBackend if the configured one is unknown or its package is not installed
+    """
+    name = QuantumSimulationConfig.BACKEND
+    if name not in _BACKENDS:
+        # the other backends are only opt-in, so we don't want to import their packages unless they were configured
+        try:
+            if name == QuantumSimulationConfig.QISKIT_BACKEND:
+                from qrogue.game.logic.simulation.qiskit_backend import QiskitBackend
+                _BACKENDS[name] = QiskitBackend()
+            elif name == QuantumSimulationConfig.DDSIM_BACKEND:
+                from qrogue.game.logic.simulation.ddsim_backend import DDSIMBackend
+                _BACKENDS[name] = DDSIMBackend()
+            else:
+                Logger.instance().error(f"Unknown simulation backend \"{name}\"! Using "
+                                        f"\"{QuantumSimulationConfig.NUMPY_BACKEND}\" instead.", show=False,
+                                        from_pycui=False)
+        except ImportError as error:
+            Logger.instance().error(f"Simulation backend \"{name}\" is not available ({error})! Using "
+                                    f"\"{QuantumSimulationConfig.NUMPY_BACKEND}\" instead.", show=False,
+                                    from_pycui=False)
+        if name not in _BACKENDS:
+            # remember the fallback so we only complain once
+            _BACKENDS[name] = _BACKENDS[QuantumSimulationConfig.NUMPY_BACKEND]
+    return _BACKENDS[name]
@@ -0,0 +1,19 @@
+import numpy as np
+
+from qrogue.game.logic.collectibles import Instruction
+
+
+def gate_matrix(instruction: Instruction) -> np.ndarray:
+    """
+    :param instruction: the Instruction we want the matrix of
+    :return: the (shared, read-only) matrix of the given Instruction without considering its qargs
+    """
+    return instruction.descriptor.matrix
+
+
+def gate_tensor(instruction: Instruction) -> np.ndarray:
+    """
+    :param instruction: the Instruction we want the tensor of
+    :return: the (shared, read-only) matrix of the given Instruction reshaped to one axis per in- and output qubit
+    """
+    return instruction.descriptor.tensor
@@ -0,0 +1,131 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from qrogue.game.logic.collectibles import Instruction
+from qrogue.game.logic.simulation.engine import SimulationBackend
+
+
+class IncrementalUnitary:
+    """
+    Keeps the unitary of every column of a circuit together with cached prefix and suffix products so that editing a
+    single column only recomputes the products that column invalidates instead of the whole circuit.
+
+    Prefix i is the product of the columns 0 to i, suffix i the product of the columns i to the last one. Empty columns
+    (and empty products) are stored as None and treated as identity. Column unitaries are only computed once a product
+    actually needs them.
+    """
+
+    @staticmethod
+    def __mul(left: Optional[np.ndarray], right: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        if left is None:
+            return right
+        if right is None:
+            return left
+        return left @ right
+
+    def __init__(self, backend: SimulationBackend, num_of_qubits: int, circuit_space: int):
+        """
+
+        :param backend: the backend used for computing the unitaries of the individual columns
+        :param num_of_qubits: number of qubits of the circuit
+        :param circuit_space: number of columns of the circuit
+        """
+        self.__backend = backend
+        self.__num_of_qubits = num_of_qubits
+        self.__instructions: List[Optional[Instruction]] = [None] * circuit_space
+        self.__columns: List[Optional[np.ndarray]] = [None] * circuit_space
+        self.__prefixes: List[Optional[np.ndarray]] = [None] * circuit_space
+        self.__suffixes: List[Optional[np.ndarray]] = [None] * circuit_space
+        # prefixes [0, prefix_len[ and suffixes [suffix_start, circuit_space[ are valid (an empty circuit is valid)
+        self.__prefix_len = circuit_space
+        self.__suffix_start = 0
+        self.__unitary: Optional[np.ndarray] = None
+        # first and last column changed since __unitary was computed, None if it is still valid
+        self.__changed: Optional[Tuple[int, int]] = (0, circuit_space - 1)
+
+    @property
+    def num_of_qubits(self) -> int:
+        return self.__num_of_qubits
+
+    @property
+    def circuit_space(self) -> int:
+        return len(self.__instructions)
+
+    def set_column(self, position: int, instruction: Optional[Instruction]):
+        """
+        Updates the given column and invalidates all products containing it.
+
+        :param position: index of the column to update
+        :param instruction: the Instruction now placed at the given position or None if it is empty now, must not be
+        changed while it is placed
+        """
+        self.__instructions[position] = instruction
+        self.__columns[position] = None
+        self.__prefix_len = min(self.__prefix_len, position)
+        self.__suffix_start = max(self.__suffix_start, position + 1)
+        if self.__changed is None:
+            self.__changed = position, position
+        else:
+            self.__changed = min(self.__changed[0], position), max(self.__changed[1], position)
+
+    def __column(self, index: int) -> Optional[np.ndarray]:
+        if self.__columns[index] is None and self.__instructions[index] is not None:
+            self.__columns[index] = self.__backend.unitary([self.__instructions[index]], self.__num_of_qubits)
+        return self.__columns[index]
+
+    def __prefix(self, index: int) -> Optional[np.ndarray]:
+        if index < 0:
+            return None
+        while self.__prefix_len <= index:
+            i = self.__prefix_len
+            previous = self.__prefixes[i - 1] if i > 0 else None
+            self.__prefixes[i] = IncrementalUnitary.__mul(self.__column(i), previous)
+            self.__prefix_len += 1
+        return self.__prefixes[index]
+
+    def __suffix(self, index: int) -> Optional[np.ndarray]:
+        if index >= self.circuit_space:
+            return None
+        while self.__suffix_start > index:
+            i = self.__suffix_start - 1
+            following = self.__suffixes[i + 1] if i + 1 < self.circuit_space else None
+            self.__suffixes[i] = IncrementalUnitary.__mul(following, self.__column(i))
+            self.__suffix_start -= 1
+        return self.__suffixes[index]
+
+    def preview(self, position: int, instruction: Optional[Instruction]) -> np.ndarray:
+        """
+        Computes the unitary the circuit would have if the given column was replaced without actually changing it.
+
+        :param position: index of the column to replace
+        :param instruction: the Instruction to place at the given position or None to preview an empty column
+        :return: the unitary of the circuit with the replaced column
+        """
+        if instruction is None:
+            column = None
+        else:
+            column = self.__backend.unitary([instruction], self.__num_of_qubits)
+        unitary = IncrementalUnitary.__mul(self.__suffix(position + 1),
+                                           IncrementalUnitary.__mul(column, self.__prefix(position - 1)))
+        if unitary is None:
+            unitary = np.eye(2 ** self.__num_of_qubits, dtype=complex)
+        return unitary
+
+    def unitary(self) -> np.ndarray:
+        """
+        :return: the unitary of the whole circuit
+        """
+        if self.__changed is not None:
+            # only the columns that changed since the last call are multiplied again, everything before and after them
+            # is taken from the cached products (which are extended if needed and then stay valid for the next edits)
+            first, last = self.__changed
+            unitary = self.__prefix(first - 1)
+            for i in range(first, last + 1):
+                unitary = IncrementalUnitary.__mul(self.__column(i), unitary)
+            unitary = IncrementalUnitary.__mul(self.__suffix(last + 1), unitary)
+            if unitary is None:
+                unitary = np.eye(2 ** self.__num_of_qubits, dtype=complex)
+            self.__unitary = unitary
+            self.__changed = None
+        return self.__unitary
@@ -0,0 +1,72 @@
+from typing import List, Optional
+
+import numpy as np
+
+
+def marginal_outcomes(indices: np.ndarray, qubits: List[int]) -> np.ndarray:
+    """
+    Maps basis state indices to the outcomes of only measuring the given qubits. Bit i of an outcome is the value of
+    qubits[i] (so outcomes are little-endian like the basis state indices).
+
+    :param indices: indices of basis states
+    :param qubits: the measured qubits
+    :return: the outcome of measuring the given qubits for every index
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    outcomes = np.zeros(len(indices), dtype=np.int64)
+    for bit, qubit in enumerate(qubits):
+        outcomes |= ((indices >> qubit) & 1) << bit
+    return outcomes
+
+
+def marginal_probabilities(indices: np.ndarray, amplitudes: np.ndarray, num_of_qubits: int,
+                           qubits: Optional[List[int]] = None) -> np.ndarray:
+    """
+
+    :param indices: indices of the (non-zero) amplitudes
+    :param amplitudes: the amplitudes at the given indices
+    :param num_of_qubits: number of qubits of the state
+    :param qubits: the measured qubits, None to measure all of them
+    :return: the probability of every outcome when measuring the given qubits
+    """
+    probabilities = amplitudes.real ** 2 + amplitudes.imag ** 2
+    if qubits is None:
+        outcomes, size = indices, 2 ** num_of_qubits
+    else:
+        outcomes, size = marginal_outcomes(indices, qubits), 2 ** len(qubits)
+    return np.bincount(outcomes, weights=probabilities, minlength=size)
+
+
+def sample_outcomes(indices: np.ndarray, amplitudes: np.ndarray, shots: int, rng: np.random.Generator,
+                    qubits: Optional[List[int]] = None) -> np.ndarray:
+    """
+    Draws all shots at once by searching uniform random numbers in the cumulative probabilities, so sampling only costs
+    O(shots * log(len(indices))) and works on sparse states without creating the dense probability vector.
+
+    :param indices: indices of the (non-zero) amplitudes
+    :param amplitudes: the amplitudes at the given indices
+    :param shots: how many outcomes to draw
+    :param rng: seeded source of randomness
+    :param qubits: the measured qubits, None to measure all of them
+    :return: the drawn outcomes as basis state indices (or marginal outcomes if qubits are given)
+    """
+    probabilities = amplitudes.real ** 2 + amplitudes.imag ** 2
+    cumulative = np.cumsum(probabilities)
+    # normalize so rounded amplitudes can still be sampled
+    positions = np.searchsorted(cumulative, rng.random(shots) * cumulative[-1], side="right")
+    # float inaccuracies could lead to a position behind the last entry
+    positions = np.minimum(positions, len(indices) - 1)
+    outcomes = np.asarray(indices, dtype=np.int64)[positions]
+    if qubits is None:
+        return outcomes
+    return marginal_outcomes(outcomes, qubits)
+
+
+def outcome_to_bits(outcome: int, num_of_bits: int) -> List[int]:
+    """
+
+    :param outcome: a measurement outcome
+    :param num_of_bits: number of measured qubits
+    :return: list of the measured values where list[i] corresponds to the i-th measured qubit
+    """
+    return [(int(outcome) >> bit) & 1 for bit in range(num_of_bits)]
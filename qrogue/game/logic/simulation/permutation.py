@@ -0,0 +1,93 @@
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+
+from qrogue.game.logic.collectibles import Instruction
+from qrogue.game.logic.collectibles.instruction import IGate, XGate, SwapGate, CXGate
+
+
+# Instructions that only map basis states onto basis states (without any phase), so circuits consisting only of them
+# can be simulated by permuting integer indices instead of multiplying complex matrices.
+PERMUTATION_GATES = (IGate, XGate, SwapGate, CXGate)
+
+# Indices are stored as integers with the same little-endian convention as our matrices, i.e. qubit q is bit q.
+IndexArray = Union[int, np.ndarray]
+
+
+def is_permutation_circuit(instructions: Iterable[Optional[Instruction]]) -> bool:
+    """
+    :param instructions: the Instructions of the circuit, empty columns (None) are ignored
+    :return: whether every Instruction only permutes basis states or not
+    """
+    return all(isinstance(instruction, PERMUTATION_GATES) for instruction in instructions if instruction)
+
+
+def permute_indices(indices: IndexArray, instruction: Instruction) -> IndexArray:
+    """
+    Applies a permutation gate to the given basis state indices. Works on plain ints as well as on integer arrays.
+
+    :param indices: the basis state index or indices the Instruction is applied to
+    :param instruction: an Instruction of one of the PERMUTATION_GATES
+    :return: the basis state index or indices after applying the Instruction
+    """
+    qargs = list(instruction.qargs_iter())
+    if isinstance(instruction, XGate):
+        return indices ^ (1 << qargs[0])
+    if isinstance(instruction, CXGate):
+        control, target = qargs
+        return indices ^ (((indices >> control) & 1) << target)
+    if isinstance(instruction, SwapGate):
+        q0, q1 = qargs
+        # flip both bits if they differ, otherwise swapping them doesn't change anything
+        differ = ((indices >> q0) ^ (indices >> q1)) & 1
+        return indices ^ ((differ << q0) | (differ << q1))
+    return indices     # IGate
+
+
+def simulate_basis_state(instructions: List[Instruction], num_of_qubits: int, basis_state: int = 0) -> int:
+    """
+    Only needs integer operations per Instruction, so the cost doesn't depend on the number of qubits at all.
+
+    :param instructions: the permutation gates to apply in order
+    :param num_of_qubits: number of qubits of the circuit
+    :param basis_state: index of the basis state the circuit is applied to
+    :return: index of the basis state the circuit maps the given one to
+    """
+    assert 0 <= basis_state < 2 ** num_of_qubits
+    for instruction in instructions:
+        basis_state = permute_indices(basis_state, instruction)
+    return basis_state
+
+
+def simulate_permutation(instructions: List[Instruction], num_of_qubits: int) -> np.ndarray:
+    """
+    :param instructions: the permutation gates to apply in order
+    :param num_of_qubits: number of qubits of the circuit
+    :return: array p where p[i] is the index of the basis state the circuit maps basis state i to
+    """
+    indices = np.arange(2 ** num_of_qubits, dtype=np.int64)
+    for instruction in instructions:
+        indices = permute_indices(indices, instruction)
+    return indices
+
+
+def basis_state_amplitudes(basis_state: int, num_of_qubits: int) -> np.ndarray:
+    """
+    :param basis_state: index of the basis state
+    :param num_of_qubits: number of qubits of the statevector
+    :return: the amplitudes of the given basis state
+    """
+    amplitudes = np.zeros(2 ** num_of_qubits, dtype=complex)
+    amplitudes[basis_state] = 1
+    return amplitudes
+
+
+def permutation_to_unitary(permutation: np.ndarray) -> np.ndarray:
+    """
+    :param permutation: array p where p[i] is the index of the basis state that basis state i is mapped to
+    :return: the dense unitary of the given permutation, i.e. column i has its only 1 in row p[i]
+    """
+    size = len(permutation)
+    unitary = np.zeros((size, size), dtype=complex)
+    unitary[permutation, np.arange(size)] = 1
+    return unitary
@@ -0,0 +1,59 @@
+from typing import List
+
+import numpy as np
+from qiskit import QuantumCircuit, transpile, Aer
+from qiskit.providers.aer import StatevectorSimulator
+
+from qrogue.game.logic.collectibles import Instruction
+from qrogue.game.logic.simulation.cache import SimulationCache, circuit_signature
+from qrogue.game.logic.simulation.engine import SimulationBackend
+from qrogue.util import QuantumSimulationConfig
+
+
+class QiskitBackend(SimulationBackend):
+    """
+    Simulates circuits with Qiskit's Aer simulators. Only used as reference for the NumpyBackend since transpiling and
+    running a job is way slower than the actual computation for our circuit sizes.
+
+    The simulators are created once per instance (get_backend() shares a single one) and transpiled circuits are cached
+    by their circuit_signature(), so structurally equal circuits are only transpiled once. Our gates have no parameters,
+    hence the signature fully determines the transpiled circuit and nothing has to be bound before running it.
+    """
+
+    @staticmethod
+    def _build_circuit(instructions: List[Instruction], num_of_qubits: int) -> QuantumCircuit:
+        circuit = QuantumCircuit(num_of_qubits, num_of_qubits)
+        for instruction in instructions:
+            instruction.append_to(circuit)
+        return circuit
+
+    def __init__(self):
+        self.__simulator = StatevectorSimulator()
+        self.__unitary_backend = Aer.get_backend('unitary_simulator')
+        self.__transpiled_statevector = SimulationCache(QuantumSimulationConfig.TRANSPILE_CACHE_SIZE)
+        self.__transpiled_unitary = SimulationCache(QuantumSimulationConfig.TRANSPILE_CACHE_SIZE)
+
+    @staticmethod
+    def __transpile(cache: SimulationCache, backend, instructions: List[Instruction], num_of_qubits: int) \
+            -> QuantumCircuit:
+        return cache.get_or_compute(
+            circuit_signature(instructions, num_of_qubits),
+            lambda: transpile(QiskitBackend._build_circuit(instructions, num_of_qubits), backend)
+        )
+
+    @property
+    def name(self) -> str:
+        return QuantumSimulationConfig.QISKIT_BACKEND
+
+    def statevector(self, instructions: List[Instruction], num_of_qubits: int) -> np.ndarray:
+        circuit = QiskitBackend.__transpile(self.__transpiled_statevector, self.__simulator, instructions,
+                                            num_of_qubits)
+        # We only do 1 shot since we don't need any measurement but the StateVector
+        job = self.__simulator.run(circuit, shots=1)
+        return np.asarray(job.result().get_statevector(circuit))
+
+    def unitary(self, instructions: List[Instruction], num_of_qubits: int) -> np.ndarray:
+        circuit = QiskitBackend.__transpile(self.__transpiled_unitary, self.__unitary_backend, instructions,
+                                            num_of_qubits)
+        job = self.__unitary_backend.run(circuit)
+        return np.asarray(job.result().get_unitary(circuit))
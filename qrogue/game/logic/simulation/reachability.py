@@ -0,0 +1,187 @@
+import threading
+from itertools import permutations
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+import numpy as np
+
+from qrogue.game.logic.collectibles import Instruction
+from qrogue.game.logic.simulation.cache import SimulationCache
+from qrogue.game.logic.simulation.engine import simulate_unitary
+from qrogue.util import MyRandom, QuantumSimulationConfig
+
+
+def quantize_amplitudes(amplitudes: np.ndarray, decimals: int = QuantumSimulationConfig.DECIMALS) -> bytes:
+    """
+    Creates a hashable key for the given amplitudes so that amplitudes only differing by numerical noise get the same
+    key.
+
+    :param amplitudes: the amplitudes of a statevector (or of several statevectors in the rows of a 2D array)
+    :param decimals: number of decimals to round to before comparing
+    :return: the key of the given amplitudes
+    """
+    rounded = np.round(amplitudes, decimals) + 0.0     # adding 0.0 turns -0.0 into 0.0
+    return rounded.astype(np.complex128).tobytes()
+
+
+class ReachableStateIndex:
+    """
+    Enumerates every statevector a loadout (the available Instructions, number of qubits and circuit space of a Robot)
+    can reach from |0...0> together with the minimum number of gates needed for it and a circuit to reach it.
+    Statevectors are deduplicated by their rounded amplitudes, so e.g. target factories can pick distinct targets by
+    simply looking them up instead of simulating random circuits.
+    """
+    __INDICES: Optional[SimulationCache] = None
+    __INDICES_LOCK = threading.Lock()
+
+    @staticmethod
+    def loadout_signature(instructions: Iterable[Instruction], num_of_qubits: int, circuit_space: int) -> Tuple:
+        """
+        :return: a hashable description of the loadout that doesn't depend on the order of the Instructions
+        """
+        gate_types = sorted(type(instruction).__name__ for instruction in instructions)
+        return num_of_qubits, circuit_space, tuple(gate_types)
+
+    @staticmethod
+    def for_loadout(instructions: List[Instruction], num_of_qubits: int, circuit_space: int) \
+            -> "ReachableStateIndex":
+        """
+        Returns the cached index of the given loadout and only enumerates it if it is not cached yet.
+
+        :param instructions: the Instructions available to the loadout, each of them can be used once
+        :param num_of_qubits: number of qubits of the loadout
+        :param circuit_space: how many Instructions can be placed at once
+        :return: the index of all states reachable with the given loadout
+        """
+        # indices are also looked up by expeditions that are generated in a background thread
+        with ReachableStateIndex.__INDICES_LOCK:
+            if ReachableStateIndex.__INDICES is None:
+                ReachableStateIndex.__INDICES = SimulationCache(QuantumSimulationConfig.REACHABLE_INDEX_CACHE_SIZE)
+        return ReachableStateIndex.__INDICES.get_or_compute(
+            ReachableStateIndex.loadout_signature(instructions, num_of_qubits, circuit_space),
+            lambda: ReachableStateIndex(instructions, num_of_qubits, circuit_space)
+        )
+
+    def __init__(self, instructions: List[Instruction], num_of_qubits: int, circuit_space: int):
+        """
+
+        :param instructions: the Instructions available to the loadout, each of them can be used once
+        :param num_of_qubits: number of qubits of the loadout
+        :param circuit_space: how many Instructions can be placed at once
+        """
+        self.__num_of_qubits = num_of_qubits
+        # state key -> (minimum number of gates, amplitudes, circuit reaching it)
+        self.__entries: Dict[bytes, Tuple[int, np.ndarray, List[Instruction]]] = {}
+        self.__enumerate(instructions, min(circuit_space, len(instructions)))
+
+    def __placements(self, instructions: List[Instruction]) \
+            -> Tuple[List[int], List[Tuple[int, Instruction, np.ndarray]]]:
+        # group the Instructions by type since it doesn't matter which instance of a type we use
+        types: List[Type[Instruction]] = []
+        counts: List[int] = []
+        prototypes: List[Instruction] = []
+        for instruction in instructions:
+            if type(instruction) in types:
+                counts[types.index(type(instruction))] += 1
+            else:
+                types.append(type(instruction))
+                counts.append(1)
+                prototypes.append(instruction)
+
+        placements = []
+        for type_index, prototype in enumerate(prototypes):
+            for qargs in permutations(range(self.__num_of_qubits), prototype.num_of_qubits):
+                placed = prototype.copy()
+                for qubit in qargs:
+                    placed.use_qubit(qubit)
+                # we multiply row vectors from the right, hence the transposed unitary
+                placements.append((type_index, placed, simulate_unitary([placed], self.__num_of_qubits).T))
+        return counts, placements
+
+    def __enumerate(self, instructions: List[Instruction], max_gates: int):
+        counts, placements = self.__placements(instructions)
+
+        zero_state = np.zeros(2 ** self.__num_of_qubits, dtype=complex)
+        zero_state[0] = 1
+        self.__entries[quantize_amplitudes(zero_state)] = 0, zero_state, []
+
+        # breadth first search over (state, remaining Instructions) so the first time we find a state is with the
+        # minimum number of gates
+        frontier = {(quantize_amplitudes(zero_state), tuple(counts)): (zero_state, [])}
+        visited = set(frontier.keys())
+        for num_of_gates in range(1, max_gates + 1):
+            next_frontier = {}
+            for type_index, placed, unitary in placements:
+                nodes = [(remaining, amplitudes, circuit) for (_, remaining), (amplitudes, circuit) in frontier.items()
+                         if remaining[type_index] > 0]
+                if len(nodes) == 0:
+                    continue
+                # apply the placed Instruction to every state of the frontier at once
+                results = np.array([amplitudes for _, amplitudes, _ in nodes]) @ unitary
+                for (remaining, _, circuit), amplitudes in zip(nodes, results):
+                    key = quantize_amplitudes(amplitudes)
+                    new_remaining = remaining[:type_index] + (remaining[type_index] - 1,) + remaining[type_index + 1:]
+                    if (key, new_remaining) in visited:
+                        continue
+                    visited.add((key, new_remaining))
+                    next_frontier[(key, new_remaining)] = amplitudes, circuit + [placed]
+                    if key not in self.__entries:
+                        self.__entries[key] = num_of_gates, amplitudes, circuit + [placed]
+            frontier = next_frontier
+
+    @property
+    def num_of_qubits(self) -> int:
+        return self.__num_of_qubits
+
+    @property
+    def size(self) -> int:
+        """
+
+        :return: number of distinct reachable states (including |0...0>)
+        """
+        return len(self.__entries)
+
+    def min_gates(self, amplitudes: np.ndarray) -> Optional[int]:
+        """
+
+        :param amplitudes: the amplitudes of the state to look up
+        :return: the minimum number of gates needed to reach the given state or None if it is not reachable
+        """
+        entry = self.__entries.get(quantize_amplitudes(np.asarray(amplitudes)))
+        if entry is None:
+            return None
+        return entry[0]
+
+    def circuit(self, amplitudes: np.ndarray) -> Optional[List[Instruction]]:
+        """
+
+        :param amplitudes: the amplitudes of the state to look up
+        :return: a minimal circuit reaching the given state or None if it is not reachable
+        """
+        entry = self.__entries.get(quantize_amplitudes(np.asarray(amplitudes)))
+        if entry is None:
+            return None
+        return [instruction.copy_with_qargs() for instruction in entry[2]]
+
+    def states(self, min_gates: int = 1, max_gates: Optional[int] = None) -> List[np.ndarray]:
+        """
+
+        :param min_gates: minimum number of gates needed to reach the returned states, 1 excludes |0...0>
+        :param max_gates: maximum number of gates needed to reach the returned states, None for no limit
+        :return: the amplitudes of all reachable states within the given bounds in the order they were found
+        """
+        return [amplitudes for num_of_gates, amplitudes, _ in self.__entries.values()
+                if min_gates <= num_of_gates and (max_gates is None or num_of_gates <= max_gates)]
+
+    def sample(self, rm: MyRandom, count: int, min_gates: int = 1, max_gates: Optional[int] = None) \
+            -> List[np.ndarray]:
+        """
+
+        :param rm: seeded randomness for choosing the states
+        :param count: how many distinct states we want
+        :param min_gates: minimum number of gates needed to reach the returned states, 1 excludes |0...0>
+        :param max_gates: maximum number of gates needed to reach the returned states, None for no limit
+        :return: up to count distinct reachable states, less if there are not enough states within the given bounds
+        """
+        candidates = self.states(min_gates, max_gates)
+        return [rm.get_element(candidates, remove=True, msg="ReachableStateIndex_sample")
+                for _ in range(min(count, len(candidates)))]
@@ -0,0 +1,247 @@
+import time
+from itertools import permutations
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from qrogue.game.logic.collectibles import Instruction
+from qrogue.game.logic.simulation.engine import simulate_unitary
+from qrogue.game.logic.simulation.reachability import quantize_amplitudes
+from qrogue.util import QuantumSimulationConfig
+
+
+class SolverResult:
+    """
+    Result of CircuitSolver.solve(). If the time budget ran out the result is only partial: it contains the best
+    circuit found so far (if any) and a lower bound for the number of gates a solution needs.
+    """
+
+    def __init__(self, circuit: Optional[List[Instruction]], is_complete: bool, lower_bound: int):
+        """
+
+        :param circuit: the shortest circuit found or None if none was found
+        :param is_complete: whether the search finished within its time budget or not
+        :param lower_bound: no circuit with less gates can reach the target
+        """
+        self.__circuit = circuit
+        self.__is_complete = is_complete
+        self.__lower_bound = lower_bound
+
+    @property
+    def circuit(self) -> Optional[List[Instruction]]:
+        return self.__circuit
+
+    @property
+    def num_of_gates(self) -> Optional[int]:
+        if self.__circuit is None:
+            return None
+        return len(self.__circuit)
+
+    @property
+    def is_complete(self) -> bool:
+        return self.__is_complete
+
+    @property
+    def lower_bound(self) -> int:
+        return self.__lower_bound
+
+    @property
+    def is_reachable(self) -> Optional[bool]:
+        """
+
+        :return: True if a circuit was found, False if the search proved that there is none, None if we don't know
+        because the time budget ran out
+        """
+        if self.__circuit is not None:
+            return True
+        if self.__is_complete:
+            return False
+        return None
+
+    @property
+    def is_minimal(self) -> bool:
+        """
+
+        :return: whether the found circuit is proven to use the minimum number of gates
+        """
+        return self.__circuit is not None and len(self.__circuit) <= self.__lower_bound
+
+
+class _Node:
+    __slots__ = ("depth", "used", "circuit")
+
+    def __init__(self, depth: int, used: Tuple[int, ...], circuit: Tuple[int, ...]):
+        self.depth = depth          # number of gates applied
+        self.used = used            # how many Instructions of every type were used
+        self.circuit = circuit      # indices of the applied placements in order of application
+
+
+class CircuitSolver:
+    """
+    Searches for a circuit with the minimum number of gates that transforms |0...0> into a given target.
+
+    The search is bidirectional (meet-in-the-middle): one side applies the placed Instructions to |0...0>, the other one
+    applies their inverses to the target, and a solution is found as soon as both sides reach the same state with
+    Instructions that are available together. States are compared by their rounded amplitudes. Since both sides only
+    have to search half of the depth this scales way better than trying every circuit.
+
+    Like in the game, a circuit also solves the target if its result is only within the tolerance of it (e.g. because
+    the target was defined with rounded amplitudes). The backward side cannot find such circuits, so the forward side
+    checks every state it reaches against the target and searches the remaining depths alone if the sides don't meet.
+    A state within the tolerance that needs less gates than an exactly reachable target is not looked for though.
+    """
+
+    def __init__(self, instructions: List[Instruction], num_of_qubits: int, circuit_space: int):
+        """
+
+        :param instructions: the Instructions available, each of them can be used once
+        :param num_of_qubits: number of qubits of the circuit
+        :param circuit_space: how many Instructions can be placed at once
+        """
+        self.__num_of_qubits = num_of_qubits
+        self.__max_gates = min(circuit_space, len(instructions))
+
+        types = []
+        counts: List[int] = []
+        prototypes: List[Instruction] = []
+        for instruction in instructions:
+            if type(instruction) in types:
+                counts[types.index(type(instruction))] += 1
+            else:
+                types.append(type(instruction))
+                counts.append(1)
+                prototypes.append(instruction)
+        self.__counts = tuple(counts)
+
+        # (type index, placed Instruction, transposed unitary, transposed inverse) for every possible placement
+        self.__placements: List[Tuple[int, Instruction, np.ndarray, np.ndarray]] = []
+        for type_index, prototype in enumerate(prototypes):
+            for qargs in permutations(range(num_of_qubits), prototype.num_of_qubits):
+                placed = prototype.copy()
+                for qubit in qargs:
+                    placed.use_qubit(qubit)
+                unitary = simulate_unitary([placed], num_of_qubits)
+                # we multiply row vectors from the right, hence the transposed matrices
+                self.__placements.append((type_index, placed, unitary.T, unitary.conj()))
+
+    def solve(self, target: np.ndarray, time_budget: float = QuantumSimulationConfig.SOLVER_TIME_BUDGET,
+              min_gates: int = 0, tolerance: float = QuantumSimulationConfig.TOLERANCE) -> SolverResult:
+        """
+
+        :param target: amplitudes of the state to reach
+        :param time_budget: maximum number of seconds to search before returning a partial result
+        :param min_gates: only circuits with at least this many gates are considered solutions (e.g. for Challenges)
+        :param tolerance: how much every amplitude of a circuit's result may differ from the target, same as for
+        StateVector.is_equal_to()
+        :return: the found circuit (if any) and whether it is proven to be minimal
+        """
+        deadline = time.perf_counter() + time_budget
+        zero_state = np.zeros(2 ** self.__num_of_qubits, dtype=complex)
+        zero_state[0] = 1
+        target = np.asarray(target, dtype=complex)
+        if min_gates <= 0 and CircuitSolver.__is_close(zero_state[np.newaxis], target, tolerance)[0]:
+            return SolverResult([], True, 0)
+        no_gates = tuple(0 for _ in self.__counts)
+
+        # key -> all nodes reaching the state with this key on the respective side (at most one per used gates)
+        sides: List[Dict[bytes, List[_Node]]] = [{}, {}]
+        frontiers: List[Dict[Tuple[bytes, Tuple[int, ...]], Tuple[np.ndarray, _Node]]] = []
+        for side, start in enumerate([zero_state, target]):
+            key = quantize_amplitudes(start)
+            node = _Node(0, no_gates, ())
+            sides[side][key] = [node]
+            frontiers.append({(key, no_gates): (start, node)})
+        # the start of the backward side, forward nodes close enough to the target meet it directly
+        goal = (target, sides[1][quantize_amplitudes(target)][0], tolerance)
+
+        best: Optional[Tuple[_Node, _Node]] = None
+        depths = [0, 0]
+        # every circuit with at most depths[0] + depths[1] gates was considered, so if the best solution is only one
+        # gate longer it is minimal
+        while best is None or depths[0] + depths[1] + 1 < CircuitSolver.__length(best):
+            if depths[0] + depths[1] >= self.__max_gates or len(frontiers[0]) == 0 or len(frontiers[1]) == 0:
+                # every circuit that fits into the circuit space was considered
+                break
+            if time.perf_counter() > deadline:
+                return self.__result(best, False, depths[0] + depths[1] + 1)
+
+            # always expand the smaller frontier to keep the search balanced
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            depths[side] += 1
+            frontiers[side], meeting, is_complete = self.__expand(side, frontiers[side], sides, depths[side],
+                                                                   min_gates, deadline, goal)
+            if meeting is not None and (best is None or CircuitSolver.__length(meeting) < CircuitSolver.__length(best)):
+                best = meeting
+            if not is_complete:
+                # the new layer is only partially known, so we only know about the circuits with less gates
+                return self.__result(best, False, depths[0] + depths[1])
+
+        # no circuit reaches the target exactly, but a longer one might still reach it within the tolerance
+        while best is None and depths[0] < self.__max_gates and len(frontiers[0]) > 0:
+            if time.perf_counter() > deadline:
+                return self.__result(None, False, depths[0] + 1)
+            depths[0] += 1
+            frontiers[0], best, is_complete = self.__expand(0, frontiers[0], sides, depths[0], min_gates, deadline,
+                                                            goal)
+            if not is_complete:
+                return self.__result(best, False, depths[0])
+        return self.__result(best, True, self.__max_gates + 1 if best is None else CircuitSolver.__length(best))
+
+    @staticmethod
+    def __is_close(states: np.ndarray, target: np.ndarray, tolerance: float) -> np.ndarray:
+        return np.all(np.abs(states - target) <= tolerance, axis=1)
+
+    @staticmethod
+    def __length(meeting: Tuple[_Node, _Node]) -> int:
+        return meeting[0].depth + meeting[1].depth
+
+    def __fits(self, used: Tuple[int, ...], other_used: Tuple[int, ...]) -> bool:
+        return all(a + b <= count for a, b, count in zip(used, other_used, self.__counts))
+
+    def __expand(self, side: int, frontier: Dict, sides: List[Dict[bytes, List[_Node]]], depth: int,
+                 min_gates: int, deadline: float, goal: Tuple[np.ndarray, _Node, float]) \
+            -> Tuple[Dict, Optional[Tuple[_Node, _Node]], bool]:
+        next_frontier = {}
+        meeting: Optional[Tuple[_Node, _Node]] = None
+        for placement_index, (type_index, _, unitary, inverse) in enumerate(self.__placements):
+            if time.perf_counter() > deadline:
+                return next_frontier, meeting, False
+            nodes = [(amplitudes, node) for amplitudes, node in frontier.values()
+                     if node.used[type_index] < self.__counts[type_index]]
+            if len(nodes) == 0:
+                continue
+            matrix = unitary if side == 0 else inverse
+            results = np.array([amplitudes for amplitudes, _ in nodes]) @ matrix
+            if side == 0 and depth >= min_gates:
+                target, target_node, tolerance = goal
+                is_close = CircuitSolver.__is_close(results, target, tolerance)
+            else:
+                is_close = np.zeros(len(nodes), dtype=bool)
+            for (_, node), amplitudes, close in zip(nodes, results, is_close):
+                used = node.used[:type_index] + (node.used[type_index] + 1,) + node.used[type_index + 1:]
+                key = quantize_amplitudes(amplitudes)
+                # the number of used gates equals the depth, so we can only find duplicates within the same layer
+                if (key, used) in next_frontier:
+                    continue
+                new_node = _Node(depth, used, node.circuit + (placement_index,))
+                next_frontier[(key, used)] = amplitudes, new_node
+                if key not in sides[side]:
+                    sides[side][key] = []
+                sides[side][key].append(new_node)
+
+                if close and (meeting is None or depth < CircuitSolver.__length(meeting)):
+                    meeting = new_node, target_node
+                for other in sides[1 - side].get(key, []):
+                    if self.__fits(used, other.used) and depth + other.depth >= min_gates and \
+                            (meeting is None or depth + other.depth < CircuitSolver.__length(meeting)):
+                        meeting = (new_node, other) if side == 0 else (other, new_node)
+        return next_frontier, meeting, True
+
+    def __result(self, best: Optional[Tuple[_Node, _Node]], is_complete: bool, lower_bound: int) -> SolverResult:
+        if best is None:
+            return SolverResult(None, is_complete, lower_bound)
+        forward, backward = best
+        # the backward side applied inverses starting at the target, so its gates are needed in reversed order
+        placement_indices = list(forward.circuit) + list(reversed(backward.circuit))
+        circuit = [self.__placements[index][1].copy_with_qargs() for index in placement_indices]
+        return SolverResult(circuit, is_complete, min(lower_bound, len(circuit)))
@@ -0,0 +1,73 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from qrogue.game.logic.collectibles import Instruction
+from qrogue.game.logic.simulation.gates import gate_matrix
+from qrogue.game.logic.simulation.permutation import PERMUTATION_GATES, permute_indices
+from qrogue.util import QuantumSimulationConfig
+
+# sorted basis state indices (int64) and their amplitudes (complex128), all basis states not listed have amplitude 0
+SparseAmplitudes = Tuple[np.ndarray, np.ndarray]
+
+
+def apply_instruction_sparse(indices: np.ndarray, amplitudes: np.ndarray, instruction: Instruction,
+                             epsilon: float = QuantumSimulationConfig.SPARSE_EPSILON) -> SparseAmplitudes:
+    """
+    Applies the given Instruction only to the non-zero entries of a statevector. Entries that only differ in the
+    Instruction's qubits form a group that is multiplied with the gate's matrix, so the work depends on the number of
+    non-zero entries and not on the number of qubits.
+
+    :param indices: sorted basis state indices of the non-zero amplitudes
+    :param amplitudes: the corresponding amplitudes
+    :param instruction: the Instruction to apply on its qargs
+    :param epsilon: resulting amplitudes with a smaller absolute value are dropped
+    :return: sorted indices and amplitudes after applying the Instruction
+    """
+    if isinstance(instruction, PERMUTATION_GATES):
+        indices = permute_indices(indices, instruction)
+        order = np.argsort(indices)
+        return indices[order], amplitudes[order]
+
+    qargs = list(instruction.qargs_iter())
+    matrix = gate_matrix(instruction)
+    mask = sum(1 << q for q in qargs)
+    # position of every basis state inside its group, i.e. the bits of its qargs (qargs[0] = least significant bit)
+    local = np.zeros(len(indices), dtype=np.int64)
+    for j, q in enumerate(qargs):
+        local |= ((indices >> q) & 1) << j
+    bases, group = np.unique(indices & ~mask, return_inverse=True)
+    group_vectors = np.zeros((len(bases), len(matrix)), dtype=np.complex128)
+    group_vectors[group.reshape(-1), local] = amplitudes
+    group_vectors = group_vectors @ matrix.T
+
+    # the bits every local position sets in a basis state index
+    offsets = np.zeros(len(matrix), dtype=np.int64)
+    for j, q in enumerate(qargs):
+        offsets |= ((np.arange(len(matrix)) >> j) & 1) << q
+    new_indices = (bases[:, np.newaxis] | offsets[np.newaxis, :]).reshape(-1)
+    new_amplitudes = group_vectors.reshape(-1)
+    non_zero = np.abs(new_amplitudes) > epsilon
+    new_indices, new_amplitudes = new_indices[non_zero], new_amplitudes[non_zero]
+    order = np.argsort(new_indices)
+    return new_indices[order], new_amplitudes[order]
+
+
+def simulate_sparse_statevector(instructions: List[Instruction], num_of_qubits: int,
+                                max_density: float = QuantumSimulationConfig.SPARSE_MAX_DENSITY) \
+        -> Optional[SparseAmplitudes]:
+    """
+    :param instructions: the Instructions to apply in order
+    :param num_of_qubits: number of qubits of the circuit
+    :param max_density: share of non-zero amplitudes at which we stop since a dense simulation is faster from then on
+    :return: sorted indices and amplitudes of the non-zero entries resulting from applying the given Instructions to
+    |0...0> or None if the statevector became too dense
+    """
+    max_entries = max_density * 2 ** num_of_qubits
+    indices = np.zeros(1, dtype=np.int64)
+    amplitudes = np.ones(1, dtype=np.complex128)
+    for instruction in instructions:
+        indices, amplitudes = apply_instruction_sparse(indices, amplitudes, instruction)
+        if len(indices) > max_entries:
+            return None
+    return indices, amplitudes
@@ -1,10 +1,11 @@
-from typing import List, Callable
+from typing import Dict, List, Callable, Optional, Set, Tuple
 
-from qrogue.game.logic.actors import StateVector
+from qrogue.game.logic.actors import StateVector, SimulationResult
 from qrogue.game.logic.actors.controllables import Robot
 from qrogue.game.logic.actors.puzzles import Enemy, Target, Riddle, Boss
 from qrogue.game.logic.collectibles import Collectible, CollectibleFactory, Instruction, CXGate, SwapGate, HGate, \
     XGate, Coin, Key
+from qrogue.game.logic.simulation import PuzzleCorpus, ReachableStateIndex, quantize_amplitudes
 from qrogue.game.world.navigation import Direction
 from qrogue.util import Logger, MyRandom, RandomManager
 
@@ -30,6 +31,10 @@ class TargetDifficulty:
             Logger.instance().throw(ValueError(
                 "rewards must be either a list of Collectibles or a CollectibleFactory"))
 
+    @property
+    def num_of_instructions(self) -> int:
+        return self.__num_of_instructions
+
     def produce_reward(self, rm: MyRandom):
         return self.__reward_factory.produce(rm)
 
@@ -42,6 +47,15 @@ class TargetDifficulty:
         :param rm: seeded randomness for choosing Instructions and the Qubit(s) to use them on
         :return: a StateVector reachable for the provided Robot
         """
+        return StateVector.from_gates(self._create_circuit(robot, rm), robot.num_of_qubits)
+
+    def _create_circuit(self, robot: Robot, rm: MyRandom) -> List[Instruction]:
+        """
+
+        :param robot: provides the number of qubits and usable Instructions
+        :param rm: seeded randomness for choosing Instructions and the Qubit(s) to use them on
+        :return: a random circuit the provided Robot could build
+        """
         num_of_qubits = robot.num_of_qubits
 
         # choose random circuits on random qubits and cbits
@@ -58,7 +72,7 @@ class TargetDifficulty:
             while instruction.use_qubit(rm.get_element(qubits, remove=True, msg="TargetDiff_selectQubit")):
                 pass
             instructions.append(instruction)
-        return StateVector.from_gates(instructions, num_of_qubits)
+        return instructions
 
 
 class ExplicitTargetDifficulty(TargetDifficulty):
@@ -92,7 +106,78 @@ class ExplicitTargetDifficulty(TargetDifficulty):
         return self.__pool.copy()
 
 
-class RiddleDifficulty(TargetDifficulty):
+class ReachableTargetDifficulty(TargetDifficulty):
+    """
+    A TargetDifficulty that picks StateVectors from all states reachable for the Robot instead of simulating random
+    circuits. If the Robot's loadout is part of the precomputed PuzzleCorpus the states are sampled from it, otherwise
+    they are looked up in a ReachableStateIndex. It doesn't pick the same StateVector twice until all fitting ones were
+    used and never picks StateVectors that need less than min_gates gates.
+    """
+
+    def __init__(self, num_of_instructions: int, rewards, min_gates: int = 1):
+        """
+
+        :param num_of_instructions: maximum number of Instructions needed to reach a target StateVector
+        :param rewards: either a list of Collectibles or a CollectibleFactory for creating a reward when reaching
+        a Target
+        :param min_gates: minimum number of Instructions needed to reach a target StateVector, 1 excludes |0...0>
+        """
+        super().__init__(num_of_instructions, rewards)
+        self.__min_gates = min_gates
+        self.__used_states: Set[bytes] = set()
+        # (loadout key, number of qubits, circuit space) -> (swapped indices, number of drawn targets) of the ongoing
+        # shuffle of the corpus' targets of that loadout
+        self.__corpus_shuffles: Dict[Tuple[str, int, int], Tuple[Dict[int, int], int]] = {}
+
+    def __sample_from_corpus(self, robot: Robot, rm: MyRandom) -> Optional[StateVector]:
+        corpus = PuzzleCorpus.instance()
+        if corpus is None:
+            return None
+        instructions = robot.get_available_instructions()
+        count = corpus.count(instructions, robot.num_of_qubits, robot.circuit_space, self.__min_gates,
+                             self.num_of_instructions)
+        if count is None or count == 0:
+            return None
+
+        # the corpus' targets are distinct, so drawing them in a random order picks every one of them exactly once
+        # before we have to start repeating them. The order is a Fisher-Yates shuffle of range(count) that is only
+        # carried out as far as we actually draw, remembering just the indices that were swapped so far.
+        bucket = PuzzleCorpus.loadout_key(instructions), robot.num_of_qubits, robot.circuit_space
+        swapped, drawn = self.__corpus_shuffles.get(bucket, ({}, count))
+        if drawn >= count:
+            swapped, drawn = {}, 0
+        pick = rm.get_int(drawn, count, msg="ReachableTargetDiff_corpusShuffle")
+        index = swapped.get(pick, pick)
+        swapped[pick] = swapped.pop(drawn, drawn)
+        self.__corpus_shuffles[bucket] = swapped, drawn + 1
+
+        amplitudes, min_gates = corpus.target(instructions, robot.num_of_qubits, robot.circuit_space, index,
+                                              self.__min_gates, self.num_of_instructions)
+        return StateVector(amplitudes, num_of_used_gates=min_gates)
+
+    def create_statevector(self, robot: Robot, rm: MyRandom) -> StateVector:
+        stv = self.__sample_from_corpus(robot, rm)
+        if stv is not None:
+            return stv
+
+        index = ReachableStateIndex.for_loadout(robot.get_available_instructions(), robot.num_of_qubits,
+                                                robot.circuit_space)
+        states = index.states(self.__min_gates, self.num_of_instructions)
+        if len(states) == 0:
+            # the Robot cannot reach any state needing enough gates so we have to fall back to a random circuit
+            return super(ReachableTargetDifficulty, self).create_statevector(robot, rm)
+
+        candidates = [stv for stv in states if quantize_amplitudes(stv) not in self.__used_states]
+        if len(candidates) == 0:
+            # every state was already used, so we have to start repeating them
+            self.__used_states.clear()
+            candidates = states
+        amplitudes = rm.get_element(candidates, msg="ReachableTargetDiff_selectStv")
+        self.__used_states.add(quantize_amplitudes(amplitudes))
+        return StateVector(amplitudes, num_of_used_gates=index.min_gates(amplitudes))
+
+
+class RiddleDifficulty(ReachableTargetDifficulty):
     def __init__(self, num_of_instructions: int, reward_pool: "list of Collectibles", min_attempts: int = 1,
                  max_attempts: int = 10):
         super().__init__(num_of_instructions, reward_pool)
@@ -185,16 +270,27 @@ class RiddleFactory:
 
 class BossFactory:
     @staticmethod
-    def default(robot: Robot) -> "BossFactory":
+    def default(robot: Robot, rm: Optional[MyRandom] = None) -> "BossFactory":
         pool = [CXGate(), SwapGate(), Coin(30)]
-        return BossFactory(robot, pool)
+        return BossFactory(robot, pool, rm)
 
-    def __init__(self, robot: Robot, reward_pool: List[Collectible]):
+    def __init__(self, robot: Robot, reward_pool: List[Collectible], rm: Optional[MyRandom] = None):
+        """
+
+        :param rm: randomness for creating the Bosses, None to create one from the RandomManager
+        """
         self.__robot = robot
         self.__reward_pool = reward_pool
-        self.__rm = RandomManager.create_new()
+        if rm is None:
+            rm = RandomManager.create_new()
+        self.__rm = rm
 
     def produce(self, include_gates: List[Instruction]) -> Boss:
+        """
+
+        :param include_gates: gates that have to be part of the Boss' circuit
+        :return: a freshly created Boss, its StateVector is only computed once it is needed
+        """
         used_gates = []
         qubit_count = [0] * self.__robot.num_of_qubits
         qubits = list(range(self.__robot.num_of_qubits))
@@ -211,7 +307,7 @@ class BossFactory:
                 used_gates.append(gate)
 
         reward = self.__rm.get_element(self.__reward_pool, msg="BossFactory_reward")
-        return Boss(StateVector.from_gates(used_gates, self.__robot.num_of_qubits), reward)
+        return Boss(SimulationResult.from_gates(used_gates, self.__robot.num_of_qubits), reward)
 
     def __prepare_gate(self, gate: Instruction, qubit_count, qubits) -> bool:
         gate_qubits = qubits.copy()
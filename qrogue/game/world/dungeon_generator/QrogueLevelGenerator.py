@@ -20,6 +20,7 @@ from qrogue.game.world.dungeon_generator.dungeon_parser.QrogueDungeonLexer impor
 from qrogue.game.world.dungeon_generator.dungeon_parser.QrogueDungeonParser import QrogueDungeonParser
 from qrogue.game.world.dungeon_generator.dungeon_parser.QrogueDungeonVisitor import QrogueDungeonVisitor
 from qrogue.game.world.dungeon_generator.generator import DungeonGenerator
+from qrogue.game.world.dungeon_generator.level_validation import PuzzleTarget
 
 
 class QrogueLevelGenerator(DungeonGenerator, QrogueDungeonVisitor):
@@ -124,10 +125,34 @@ class QrogueLevelGenerator(DungeonGenerator, QrogueDungeonVisitor):
         # creating their own redundant hallway
         self.__created_hallways: Dict[Coordinate, Dict[Direction, rooms.Hallway]] = {}
 
+        # every target defined in the level so validation can check whether they are solvable
+        self.__puzzle_targets: List[PuzzleTarget] = []
+
     @property
     def __cbp(self) -> CallbackPack:
         return CallbackPack.instance()
 
+    @property
+    def robot(self) -> Optional[TestBot]:
+        return self.__robot
+
+    @property
+    def puzzle_targets(self) -> List[PuzzleTarget]:
+        """
+
+        :return: all target StateVectors (of stv pools, Enemies, Riddlers and Challengers) of the generated level
+        """
+        return self.__puzzle_targets.copy()
+
+    def __add_puzzle_targets(self, description: str, stvs: List[StateVector], min_gates: int = 0,
+                             max_gates: Optional[int] = None):
+        for i, stv in enumerate(stvs):
+            if len(stvs) > 1:
+                target_description = f"{description} #{i + 1}"
+            else:
+                target_description = description
+            self.__puzzle_targets.append(PuzzleTarget(target_description, stv, min_gates, max_gates))
+
     def __show_description(self):
         if self.__meta_data.description:
             title, text = self.__meta_data.description.get(self.__check_achievement)
@@ -479,12 +504,14 @@ class QrogueLevelGenerator(DungeonGenerator, QrogueDungeonVisitor):
         else:  # explicit definition
             ordered = self.__get_draw_strategy(ctx.draw_strategy())
             stv_list = self.visit(ctx.stvs())
+            self.__add_puzzle_targets("default stv pool", stv_list)
             return ExplicitTargetDifficulty(stv_list, self.__default_collectible_factory, ordered)
 
     def visitStv_pools(self, ctx: QrogueDungeonParser.Stv_poolsContext) -> None:
         for stv_pool in ctx.stv_pool():
             diff_id, target_difficulty = self.visit(stv_pool)
             self.__target_difficulties[diff_id] = target_difficulty
+            self.__add_puzzle_targets(f"stv pool \"{diff_id}\"", target_difficulty.copy_pool())
         self.__default_target_difficulty = self.visit(ctx.default_stv_pool())
         self.__default_enemy_factory = EnemyFactory(self.__cbp.start_fight, self.__default_target_difficulty, 1)
 
@@ -602,6 +629,7 @@ class QrogueLevelGenerator(DungeonGenerator, QrogueDungeonVisitor):
     def visitRiddle_descriptor(self, ctx: QrogueDungeonParser.Riddle_descriptorContext) -> tiles.Riddler:
         attempts = self.visit(ctx.integer())
         stv, reward = self.visit(ctx.puzzle_parameter())
+        self.__add_puzzle_targets(f"Riddler in room {self.__cur_room_id}", [stv])
         riddle = Riddle(stv, reward, attempts)
         return tiles.Riddler(self.__cbp.open_riddle, riddle)
 
@@ -613,6 +641,7 @@ class QrogueLevelGenerator(DungeonGenerator, QrogueDungeonVisitor):
             max_gates = min_gates
 
         stv, reward = self.visit(ctx.puzzle_parameter())
+        self.__add_puzzle_targets(f"Challenger in room {self.__cur_room_id}", [stv], min_gates, max_gates)
         challenge = Challenge(stv, reward, min_gates, max_gates)
         return tiles.Challenger(self.__cbp.open_challenge, challenge)
 
@@ -722,6 +751,7 @@ class QrogueLevelGenerator(DungeonGenerator, QrogueDungeonVisitor):
 
         if ctx.stv():
             stv = self.visit(ctx.stv())
+            self.__add_puzzle_targets(f"Enemy {enemy_id} in room {room_id}", [stv])
             if reward_factory is None:
                 reward_factory = self.__default_collectible_factory    # set reward factory here to not set a custom one
             difficulty = ExplicitTargetDifficulty([stv], reward_factory)
@@ -1,6 +1,7 @@
 # exporting
 from .generator import DungeonGenerator
 from .random_generator import ExpeditionGenerator
+from .level_validation import PuzzleTarget, TargetReport, validate_targets
 from qrogue.game.world.dungeon_generator.QrogueLevelGenerator import QrogueLevelGenerator
 from qrogue.game.world.dungeon_generator.QrogueWorldGenerator import QrogueWorldGenerator
 
@@ -11,6 +12,7 @@ from qrogue.game.world.dungeon_generator.QrogueWorldGenerator import QrogueWorld
 # +logic.actors.controllables
 # +logic.actors.puzzles
 # +logic.collectibles
+# +logic.simulation
 # +map
 # +navigation
 # +tiles
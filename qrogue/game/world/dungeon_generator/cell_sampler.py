@@ -0,0 +1,79 @@
+from typing import List, Optional
+
+
+class CellSampler:
+    """
+    Fenwick tree over the priorities of the cells of a grid, so a cell can be picked proportionally to its priority
+    and a priority can be changed in O(log(width * height)) instead of scanning the whole grid. Cells are indexed
+    row-wise (see Coordinate.linearize()), hence the picked cell is the same one a row-wise scan accumulating the
+    priorities would pick.
+    """
+
+    def __init__(self, width: int, height: int, priority: int = 1):
+        """
+
+        :param width: width of the grid
+        :param height: height of the grid
+        :param priority: initial priority of every cell
+        """
+        self.__size = width * height
+        self.__priorities: List[int] = [priority] * self.__size
+        # tree[i] stores the sum of the priorities of the cells (i - lowbit(i), i] (1-based), built in O(n)
+        self.__tree: List[int] = [0] + self.__priorities
+        for i in range(1, self.__size + 1):
+            parent = i + (i & -i)
+            if parent <= self.__size:
+                self.__tree[parent] += self.__tree[i]
+        self.__top_step = 1
+        while self.__top_step * 2 <= self.__size:
+            self.__top_step *= 2
+
+    @property
+    def total(self) -> int:
+        """
+
+        :return: sum of the priorities of all cells
+        """
+        total = 0
+        i = self.__size
+        while i > 0:
+            total += self.__tree[i]
+            i -= i & -i
+        return total
+
+    def priority(self, index: int) -> int:
+        return self.__priorities[index]
+
+    def set(self, index: int, priority: int):
+        """
+        Changes the priority of a cell.
+
+        :param index: row-wise index of the cell
+        :param priority: its new priority, 0 if it must not be picked anymore
+        """
+        delta = priority - self.__priorities[index]
+        if delta == 0:
+            return
+        self.__priorities[index] = priority
+        i = index + 1
+        while i <= self.__size:
+            self.__tree[i] += delta
+            i += i & -i
+
+    def find(self, value: float) -> Optional[int]:
+        """
+
+        :param value: a number between 0 (inclusive) and total (exclusive)
+        :return: row-wise index of the first cell for which the sum of the priorities up to and including it is bigger
+        than value, or None if value is not smaller than the total
+        """
+        index = 0
+        step = self.__top_step
+        while step > 0:
+            if index + step <= self.__size and self.__tree[index + step] <= value:
+                index += step
+                value -= self.__tree[index]
+            step //= 2
+        if index < self.__size:
+            return index
+        return None
@@ -0,0 +1,95 @@
+from collections import deque
+from typing import Callable, List, Optional
+
+from qrogue.game.world.navigation import Coordinate, Direction
+from qrogue.util import MyRandom
+
+
+class HallwayComponents:
+    """
+    Union-find over the cells of a grid that tracks which rooms are connected via Hallways. Adding a Hallway and
+    checking whether two rooms are connected both take (amortized) almost constant time, so connectivity never needs to
+    be checked by walking the Hallways.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.__width = width
+        self.__parents: List[int] = list(range(width * height))
+        self.__sizes: List[int] = [1] * (width * height)
+
+    def __find(self, index: int) -> int:
+        parents = self.__parents
+        while parents[index] != index:
+            # path halving keeps the trees flat without recursion
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    def connect(self, room1: Coordinate, room2: Coordinate) -> bool:
+        """
+        Merges the components of two rooms because a Hallway between them was added.
+
+        :return: False if they were already connected, True otherwise
+        """
+        root1 = self.__find(room1.linearize(self.__width))
+        root2 = self.__find(room2.linearize(self.__width))
+        if root1 == root2:
+            return False
+        if self.__sizes[root1] < self.__sizes[root2]:
+            root1, root2 = root2, root1
+        self.__parents[root2] = root1
+        self.__sizes[root1] += self.__sizes[root2]
+        return True
+
+    def are_connected(self, room1: Coordinate, room2: Coordinate) -> bool:
+        return self.__find(room1.linearize(self.__width)) == self.__find(room2.linearize(self.__width))
+
+
+def find_connection(rm: MyRandom, start: Coordinate, width: int, height: int,
+                    is_target: Callable[[Coordinate], bool], is_passable: Callable[[Coordinate], bool],
+                    has_hallway: Callable[[Coordinate, Coordinate], bool]) -> Optional[List[Coordinate]]:
+    """
+    Searches the path from start to the nearest target cell that needs the least new Hallways. Following an existing
+    Hallway is free while every other step between neighboring cells costs one new Hallway, hence this is a 0-1
+    breadth-first search with an explicit double-ended queue instead of recursion. The order neighbors are expanded in
+    is rotated randomly so equally short paths don't always bend in the same direction.
+
+    :param rm: seeded randomness for choosing between equally short paths
+    :param start: the cell to start from
+    :param width: width of the grid
+    :param height: height of the grid
+    :param is_target: whether a cell is a valid end of the path
+    :param is_passable: whether the path may lead through a cell
+    :param has_hallway: whether there is already a Hallway between two neighboring cells
+    :return: the cells of the path from start to the reached target (both inclusive) or None if no target can be reached
+    """
+    directions = Direction.values()
+    costs = {start: 0}
+    predecessors = {start: None}
+    queue = deque([(0, start)])
+    while queue:
+        cost, pos = queue.popleft()
+        if cost > costs[pos]:
+            continue    # pos was reached more cheaply in the meantime
+        if is_target(pos):
+            path = []
+            while pos is not None:
+                path.append(pos)
+                pos = predecessors[pos]
+            path.reverse()
+            return path
+
+        offset = rm.get_int(0, len(directions), msg="Connectivity_directionOffset")
+        for i in range(len(directions)):
+            neighbor = pos + directions[(offset + i) % len(directions)]
+            if not (0 <= neighbor.x < width and 0 <= neighbor.y < height) or not is_passable(neighbor):
+                continue
+            step = 0 if has_hallway(pos, neighbor) else 1
+            if neighbor not in costs or cost + step < costs[neighbor]:
+                costs[neighbor] = cost + step
+                predecessors[neighbor] = pos
+                if step == 0:
+                    queue.appendleft((cost, neighbor))
+                else:
+                    queue.append((cost + 1, neighbor))
+    return None
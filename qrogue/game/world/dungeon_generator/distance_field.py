@@ -0,0 +1,95 @@
+from collections import deque
+from typing import List, Optional
+
+from qrogue.game.world.navigation import Coordinate
+
+
+class DistanceField:
+    """
+    Manhattan distance from every cell of a grid to its nearest and second nearest source (e.g. the rooms placed so
+    far), computed by a multi-source breadth-first search. Keeping the two nearest sources allows to query the distance
+    to the nearest source other than a given one (e.g. a room's distance to all other rooms) without iterating over
+    every source.
+
+    Adding a source only updates the cells it is one of the two nearest sources of, so the field grows incrementally
+    while rooms are placed instead of being recomputed.
+    """
+    __NO_SOURCE = -1
+
+    def __init__(self, width: int, height: int, default_distance: Optional[int] = None):
+        """
+
+        :param width: width of the grid
+        :param height: height of the grid
+        :param default_distance: distance reported if there is no (other) source, defaults to the biggest possible
+        distance within the grid
+        """
+        if default_distance is None:
+            default_distance = width + height - 2
+        self.__width = width
+        self.__height = height
+        size = width * height
+        self.__distance1: List[int] = [default_distance] * size
+        self.__source1: List[int] = [DistanceField.__NO_SOURCE] * size
+        self.__distance2: List[int] = [default_distance] * size
+        self.__source2: List[int] = [DistanceField.__NO_SOURCE] * size
+
+    def __update(self, index: int, distance: int, source: int) -> bool:
+        # returns whether the source is now one of the two nearest sources of the cell
+        if distance < self.__distance1[index]:
+            if self.__source1[index] != source:
+                self.__distance2[index] = self.__distance1[index]
+                self.__source2[index] = self.__source1[index]
+            self.__distance1[index] = distance
+            self.__source1[index] = source
+            return True
+        if distance < self.__distance2[index] and self.__source1[index] != source:
+            self.__distance2[index] = distance
+            self.__source2[index] = source
+            return True
+        return False
+
+    def add_source(self, pos: Coordinate) -> List[int]:
+        """
+        Updates the distances of all cells that now have pos as one of their two nearest sources. Cells that don't are
+        not expanded since on a grid none of the cells behind them can have pos as a nearer source either.
+
+        :param pos: position of the new source
+        :return: row-wise indices of all cells whose distances changed (see Coordinate.linearize())
+        """
+        source = pos.linearize(self.__width)
+        if not self.__update(source, 0, source):
+            return []
+        changed = [source]
+        queue = deque([(pos.x, pos.y, 0)])
+        while queue:
+            x, y, distance = queue.popleft()
+            distance += 1
+            for nx, ny in ((x, y - 1), (x + 1, y), (x, y + 1), (x - 1, y)):
+                index = nx + ny * self.__width
+                if 0 <= nx < self.__width and 0 <= ny < self.__height and self.__update(index, distance, source):
+                    changed.append(index)
+                    queue.append((nx, ny, distance))
+        return changed
+
+    def distance(self, pos: Coordinate, exclude: Optional[Coordinate] = None) -> int:
+        """
+
+        :param pos: the cell to get the distance of
+        :param exclude: a source to ignore, e.g. the room pos belongs to
+        :return: distance from pos to its nearest source (other than exclude)
+        """
+        return self.distance_at(pos.linearize(self.__width),
+                                None if exclude is None else exclude.linearize(self.__width))
+
+    def distance_at(self, index: int, exclude: Optional[int] = None) -> int:
+        """
+        Like distance() but for row-wise indices instead of Coordinates.
+
+        :param index: row-wise index of the cell to get the distance of
+        :param exclude: row-wise index of a source to ignore
+        :return: distance from the cell to its nearest source (other than exclude)
+        """
+        if exclude is not None and self.__source1[index] == exclude:
+            return self.__distance2[index]
+        return self.__distance1[index]
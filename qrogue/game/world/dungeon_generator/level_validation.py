@@ -0,0 +1,184 @@
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, Optional, Tuple, Type
+
+import numpy as np
+
+from qrogue.game.logic import StateVector
+from qrogue.game.logic.collectibles import Instruction
+from qrogue.game.logic.simulation import CircuitSolver
+from qrogue.util import QuantumSimulationConfig
+
+
+class PuzzleTarget:
+    """
+    A target StateVector defined in a level file (e.g. in an stv pool or by a Riddler) together with the gate limits a
+    solution has to fulfill.
+    """
+
+    def __init__(self, description: str, state_vector: StateVector, min_gates: int = 0,
+                 max_gates: Optional[int] = None):
+        """
+
+        :param description: where the target was defined, used for reporting
+        :param state_vector: the StateVector that needs to be reached
+        :param min_gates: minimum number of gates a solution has to use (only set for Challenges)
+        :param max_gates: maximum number of gates a solution may use (only set for Challenges), None for no limit
+        """
+        self.__description = description
+        self.__state_vector = state_vector
+        self.__min_gates = min_gates
+        self.__max_gates = max_gates
+
+    @property
+    def description(self) -> str:
+        return self.__description
+
+    @property
+    def state_vector(self) -> StateVector:
+        return self.__state_vector
+
+    @property
+    def min_gates(self) -> int:
+        return self.__min_gates
+
+    @property
+    def max_gates(self) -> Optional[int]:
+        return self.__max_gates
+
+    @property
+    def has_gate_limits(self) -> bool:
+        return self.__min_gates > 0 or self.__max_gates is not None
+
+
+class TargetReport:
+    """
+    Result of checking a single PuzzleTarget with the CircuitSolver.
+    """
+
+    def __init__(self, target: PuzzleTarget, num_of_gates: Optional[int], is_reachable: Optional[bool],
+                 is_minimal: bool, lower_bound: int, limits_met: Optional[bool], duration: float):
+        """
+
+        :param target: the checked target
+        :param num_of_gates: number of gates of the shortest found solution, None if no solution was found
+        :param is_reachable: whether the target can be reached, None if the solver ran out of time
+        :param is_minimal: whether num_of_gates is proven to be the minimum
+        :param lower_bound: no solution with less gates exists
+        :param limits_met: whether a solution within the target's gate limits exists, None if the target has no limits
+        or the solver ran out of time
+        :param duration: seconds spent on checking the target
+        """
+        self.__target = target
+        self.__num_of_gates = num_of_gates
+        self.__is_reachable = is_reachable
+        self.__is_minimal = is_minimal
+        self.__lower_bound = lower_bound
+        self.__limits_met = limits_met
+        self.__duration = duration
+
+    @property
+    def target(self) -> PuzzleTarget:
+        return self.__target
+
+    @property
+    def num_of_gates(self) -> Optional[int]:
+        return self.__num_of_gates
+
+    @property
+    def is_reachable(self) -> Optional[bool]:
+        return self.__is_reachable
+
+    @property
+    def limits_met(self) -> Optional[bool]:
+        return self.__limits_met
+
+    @property
+    def duration(self) -> float:
+        return self.__duration
+
+    @property
+    def is_valid(self) -> bool:
+        """
+
+        :return: False if the target is proven to be unsolvable, True otherwise (also if we don't know)
+        """
+        return self.__is_reachable is not False and self.__limits_met is not False
+
+    def __str__(self) -> str:
+        if self.__is_reachable is None:
+            text = f"unknown, no solution found in time (needs at least {self.__lower_bound} gates)"
+        elif self.__is_reachable:
+            text = f"reachable with {self.__num_of_gates} gates"
+            if not self.__is_minimal:
+                text += f" (minimum is at least {self.__lower_bound})"
+        else:
+            text = "UNREACHABLE with the Robot's starting gates and circuit space"
+
+        if self.__target.has_gate_limits:
+            max_gates = "inf" if self.__target.max_gates is None else self.__target.max_gates
+            limits = f"{self.__target.min_gates}-{max_gates} gates"
+            if self.__limits_met is None:
+                text += f", unknown whether {limits} are possible"
+            elif self.__limits_met:
+                text += f", {limits} are possible"
+            else:
+                text += f", {limits} are IMPOSSIBLE"
+        return f"{self.__target.description}: {text} [{self.__duration * 1000:.1f} ms]"
+
+
+def _check_target(gate_types: List[Type[Instruction]], num_of_qubits: int, circuit_space: int,
+                  amplitudes: np.ndarray, min_gates: int, max_gates: Optional[int], time_budget: float) \
+        -> Tuple[Optional[int], Optional[bool], bool, int, Optional[bool], float]:
+    # runs in a worker process, so only plain (picklable) data goes in and out
+    start_time = time.perf_counter()
+    has_limits = min_gates > 0 or max_gates is not None
+    if len(amplitudes) != 2 ** num_of_qubits:
+        # the target was defined for a different number of qubits
+        return None, False, False, 0, False if has_limits else None, time.perf_counter() - start_time
+
+    solver = CircuitSolver([gate_type() for gate_type in gate_types], num_of_qubits, circuit_space)
+    result = solver.solve(amplitudes, time_budget)
+
+    limits_met = None
+    if has_limits:
+        limited = result
+        if result.is_reachable and result.num_of_gates < min_gates:
+            # the minimal solution is too short, so we need to know whether a longer one exists
+            limited = solver.solve(amplitudes, time_budget, min_gates)
+        if limited.is_reachable:
+            limits_met = max_gates is None or limited.num_of_gates <= max_gates
+        elif limited.is_reachable is False or (max_gates is not None and limited.lower_bound > max_gates):
+            limits_met = False
+    return result.num_of_gates, result.is_reachable, result.is_minimal, result.lower_bound, limits_met, \
+        time.perf_counter() - start_time
+
+
+def validate_targets(targets: List[PuzzleTarget], instructions: List[Instruction], num_of_qubits: int,
+                     circuit_space: int, executor: Optional[Executor] = None,
+                     time_budget: float = QuantumSimulationConfig.SOLVER_TIME_BUDGET) -> List[TargetReport]:
+    """
+    Checks with the CircuitSolver whether the given targets can be reached and within their gate limits. The targets
+    are solved in parallel by a process pool since they are independent of each other.
+
+    :param targets: the targets to check
+    :param instructions: the Instructions available to the Robot
+    :param num_of_qubits: number of qubits of the Robot
+    :param circuit_space: how many Instructions the Robot can place at once
+    :param executor: the pool to solve the targets in, e.g. to share it between several levels. If None a new
+    ProcessPoolExecutor is used.
+    :param time_budget: maximum number of seconds to search for a single target
+    :return: one report per target in the same order
+    """
+    if len(targets) == 0:
+        return []
+    gate_types = [type(instruction) for instruction in instructions]
+    arguments = [(gate_types, num_of_qubits, circuit_space, target.state_vector.amplitudes, target.min_gates,
+                  target.max_gates, time_budget) for target in targets]
+
+    if executor is None:
+        with ProcessPoolExecutor() as pool:
+            results = list(pool.map(_check_target, *zip(*arguments)))
+    else:
+        results = list(executor.map(_check_target, *zip(*arguments)))
+    return [TargetReport(target, *result) for target, result in zip(targets, results)]
@@ -1,15 +1,19 @@
 from enum import IntEnum
-from typing import Callable, Dict
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
 
 from qrogue.game.logic.actors import Robot
 from qrogue.game.logic.collectibles import GateFactory, ShopFactory, EnergyRefill, Coin, Key, instruction
-from qrogue.game.target_factory import TargetDifficulty, BossFactory, EnemyFactory, RiddleFactory
-from qrogue.game.world.map import CallbackPack, LevelMap, Hallway, WildRoom, SpawnRoom, ShopRoom, RiddleRoom, BossRoom, \
-    TreasureRoom, ExpeditionMap
+from qrogue.game.target_factory import ReachableTargetDifficulty, BossFactory, EnemyFactory, RiddleFactory
+from qrogue.game.world.map import CallbackPack, LevelMap, Hallway, Room, WildRoom, SpawnRoom, ShopRoom, RiddleRoom, \
+    BossRoom, TreasureRoom, ExpeditionMap
 from qrogue.game.world.navigation import Coordinate, Direction
 from qrogue.game.world.tiles import Boss, Collectible, Door, DoorOpenState
-from qrogue.util import Logger, RandomManager
+from qrogue.util import Logger, MyRandom, RandomManager
 
+from qrogue.game.world.dungeon_generator.cell_sampler import CellSampler
+from qrogue.game.world.dungeon_generator.connectivity import HallwayComponents, find_connection
+from qrogue.game.world.dungeon_generator.distance_field import DistanceField
 from qrogue.game.world.dungeon_generator.generator import DungeonGenerator
 
 
@@ -94,6 +98,11 @@ class _Code(IntEnum):
 class RandomLayoutGenerator:
     __MIN_AREA = 10
     __MIN_NORMAL_ROOMS = 4
+    # the WildRooms placed per round of filling up the layout, bigger grids get more rounds
+    __WILD_ROOM_ROUNDS = [3, 2, 1, 1]
+    __DEFAULT_AREA = DungeonGenerator.WIDTH * DungeonGenerator.HEIGHT
+    # offsets of Direction.values() (North, East, South, West) for the candidates of placing WildRooms
+    __DIRECTIONS = [(direction.x, direction.y) for direction in Direction.values()]
 
     def __init__(self, seed: int, width: int, height: int):
         self.__seed = seed
@@ -106,7 +115,19 @@ class RandomLayoutGenerator:
         # generate empty map
         self.__map = [[_Code.Free] * self.__width for y in range(self.__height)]
         self.__normal_rooms = set()
+        # distances to the nearest normal rooms for scoring their isolation, updated by __set()
+        self.__room_distances = DistanceField(self.__width, self.__height)
+        self.__is_normal_room = [False] * (self.__width * self.__height)
+        # priorities of placing a WildRoom next to a normal room with one slot per cell and Direction (index * 4 +
+        # direction), updated by __set() for the rooms at or next to cells whose content or distances changed
+        self.__wild_candidates = CellSampler(len(RandomLayoutGenerator.__DIRECTIONS), self.__width * self.__height, 0)
         self.__hallways = {}
+        # which rooms are connected via hallways, updated by __add_hallway()
+        self.__components = HallwayComponents(self.__width, self.__height)
+        self.__spawn_pos = None
+        self.__special_rooms = []
+        # priorities of the free cells for picking random coordinates, updated by __set()
+        self.__cell_sampler = CellSampler(self.__width, self.__height, _Code.Free * _Code.PriorityMul)
         self.__prio_sum = self.__width * self.__height
         self.__prio_mean = 1.0
 
@@ -118,19 +139,51 @@ class RandomLayoutGenerator:
         return self.__map[pos.y][pos.x]
 
     def __set(self, pos: Coordinate, code: _Code):
-        if code in [_Code.Spawn, _Code.Wild]:
+        index = pos.linearize(self.__width)
+        changed = [index]
+        if code in [_Code.Spawn, _Code.Wild] and pos not in self.__normal_rooms:
             self.__normal_rooms.add(pos)
+            self.__is_normal_room[index] = True
+            changed += self.__room_distances.add_source(pos)
         self.__map[pos.y][pos.x] = code
+        # only free cells can be picked
+        priority = code * _Code.PriorityMul if code < _Code.Blocked else 0
+        self.__cell_sampler.set(index, priority)
+
+        # only the candidates of rooms at or next to the changed cells can have a different priority now
+        for cell in changed:
+            x, y = cell % self.__width, cell // self.__width
+            if self.__is_normal_room[cell]:
+                for direction in range(len(RandomLayoutGenerator.__DIRECTIONS)):
+                    self.__update_wild_candidate(x, y, direction)
+            for direction, (dx, dy) in enumerate(RandomLayoutGenerator.__DIRECTIONS):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < self.__width and 0 <= ny < self.__height and self.__is_normal_room[nx + ny * self.__width]:
+                    # the opposite direction, since the order is North, East, South, West
+                    self.__update_wild_candidate(nx, ny, (direction + 2) % 4)
+
+    def __update_wild_candidate(self, x: int, y: int, direction: int):
+        """
+        Recomputes the priority of placing a WildRoom next to the normal room at (x, y) in the given direction based on
+        the "isolation" (distance to other WR or SR) of the room and inverse of the isolation of the neighbor (except
+        the room itself of course). It is 0 if the neighbor is not free.
+        """
+        index = x + y * self.__width
+        dx, dy = RandomLayoutGenerator.__DIRECTIONS[direction]
+        nx, ny = x + dx, y + dy
+        priority = 0
+        if 0 <= nx < self.__width and 0 <= ny < self.__height and self.__map[ny][nx] < _Code.Blocked:
+            max_distance = self.__width + self.__height - 2
+            # distance to other WRs and SR except itself
+            min_distance = self.__room_distances.distance_at(index, exclude=index)
+            # distance to other WRs and SR (except the WR we know is a neighbor)
+            neighbor_distance = self.__room_distances.distance_at(nx + ny * self.__width, exclude=index)
+            # high isolation of room and low isolation of neighbor means high priority
+            priority = min_distance * (max_distance - neighbor_distance)
+        self.__wild_candidates.set(index * len(RandomLayoutGenerator.__DIRECTIONS) + direction, priority)
 
     def __new_prio(self):
-        prio_sum = 0
-        for y in range(self.__height):
-            for x in range(self.__width):
-                pos = Coordinate(x, y)
-                code = self.__get(pos)
-                if code < _Code.Blocked:
-                    prio_sum += 1
-        self.__prio_sum = prio_sum
+        self.__prio_sum = self.__cell_sampler.total
 
     def __is_valid_pos(self, pos: Coordinate) -> bool:
         return 0 <= pos.x < self.__width and 0 <= pos.y < self.__height
@@ -195,62 +248,34 @@ class RandomLayoutGenerator:
 
     def __random_coordinate(self) -> Coordinate:
         val = self.__rm.get(msg="RandomDG_coordinate")
-        cur_val = 0.0
-        for y in range(self.__height):
-            for x in range(self.__width):
-                pos = Coordinate(x, y)
-                code = self.__get(pos)
-                # if there is already something at this position, we continue with the next
-                if code >= _Code.Blocked:
-                    continue
-                code = code * _Code.PriorityMul
-                cur_val += code / self.__prio_sum
-                if val < cur_val:
-                    return pos
+        # same as scanning the free cells row-wise until the accumulated priority / prio_sum exceeds val
+        index = self.__cell_sampler.find(val * self.__prio_sum)
+        if index is not None:
+            return Coordinate(index % self.__width, index // self.__width)
         Logger.instance().throw(NotImplementedError(f"Failed to get a random coordinate (generator.py) for seed = "
                                                     f"{self.seed}. Please do report this error as this should not be "
                                                     "possible to occur! :("))
 
     def __random_free_wildroom_neighbors(self, num: int = 1) -> [Coordinate]:
-        rooms = self.__normal_rooms
-        room_prios = {}
-        max_distance = self.__width + self.__height - 2
-        prio_sum = 0
-        # calculate the priorities of WR neighbors based on the "isolation" (distance to other WR or SR) of the WR and
-        # inverse of the isolation of the neighbor (except its original WR of course)
-        for room in rooms:
-            min_distance = max_distance
-            for other in rooms:
-                if room is not other:   # check distance to other WRs and SR except itself
-                    min_distance = min(min_distance, Coordinate.distance(room, other))
-            neighbors = self.__get_neighbors(room, free_spots=True)
-            for neighbor in neighbors:
-                neighbor_distance = max_distance
-                for other in rooms:
-                    if room is not other:   # check distance to other WRs and SR (except the WR we know is a neighbor)
-                        neighbor_distance = min(neighbor_distance, Coordinate.distance(neighbor[2], other))
-                # high isolation of room and low isolation of neighbor means high priority
-                prio = min_distance * (max_distance - neighbor_distance)
-                prio_sum += prio
-                room_prios[neighbor] = (prio, room)
-
+        # the candidates' priorities are kept up to date by __set(), so we only have to pick from them
+        prio_sum = self.__wild_candidates.total
         if prio_sum == 0:
             Logger.instance().error(f"Illegal prio_sum for seed = {self.seed} in generator.py\nThis should not be "
                                     "possible to occur but aside from the randomness during layout generation this "
                                     "doesn't break anything. Please consider reporting!", from_pycui=False)
-            prio_sum = -1.0
 
         picked_rooms = []
         for i in range(num):
             val = self.__rm.get(msg="RandomDG_WRNeighbors")
-            cur_val = 0.0
-            for room in room_prios:
-                prio, rp = room_prios[room]
-                cur_val += prio / prio_sum    # both values have the same sign so their fraction is positive
-                if val < cur_val:
-                    picked_rooms.append((room, rp))
-                    room_prios.pop(room)
-                    break
+            # picked candidates are not available anymore, but the sum stays the same so we might not pick anything
+            slot = self.__wild_candidates.find(val * prio_sum)
+            if slot is not None:
+                index, direction = divmod(slot, len(RandomLayoutGenerator.__DIRECTIONS))
+                direction = Direction.values()[direction]
+                room = Coordinate(index % self.__width, index // self.__width)
+                new_pos = room + direction
+                picked_rooms.append(((direction, self.__get(new_pos), new_pos), room))
+                self.__wild_candidates.set(slot, 0)
         return picked_rooms
 
     def __add_hallway(self, room1: Coordinate, room2: Coordinate, door: Door):
@@ -262,6 +287,7 @@ class RandomLayoutGenerator:
             self.__hallways[room2][room1] = door
         else:
             self.__hallways[room2] = {room1: door}
+        self.__components.connect(room1, room2)
 
     def __place_wild(self, room: Coordinate, door: Door):
         pos = room + door.direction
@@ -289,88 +315,39 @@ class RandomLayoutGenerator:
             except NotImplementedError:
                 Logger.instance().error("Unimplemented case happened!", from_pycui=False)
 
-    def __astar_connect_neighbors(self, visited: set, pos: Coordinate) -> (Coordinate, bool):
-        """
+    def __has_hallway(self, room1: Coordinate, room2: Coordinate) -> bool:
+        return room1 in self.__hallways and room2 in self.__hallways[room1]
 
-        :param visited:
-        :param pos: the position of a cell that has no Hallways that could lead to the target
-        :return:
-        """
-        relevant_neighbors = []
-        # only consider the neighbors we haven't visited yet
-        for room in self.__get_neighbors(pos):
-            _, _, new_pos = room
-            if new_pos not in visited:
-                relevant_neighbors.append(room)
-
-        if len(relevant_neighbors) > 0:
-            # there are neighbors we can connect to
-            room = self.__rm.get_element(relevant_neighbors, msg="RandomGen_astarNeighbor")
-            door = Door(room[0])
-            self.__add_hallway(pos, room[2], door)
-            return room[2], False
-        else:
-            if self.__get(pos) in _Code.special_rooms():
-                Logger.instance().debug(f"SpecialRoom marked as dead end for seed = {self.seed}", from_pycui=False)
-            return pos, True  # we found a dead end
-
-    def __astar(self, visited: set, pos: Coordinate, target: Coordinate) -> ([Coordinate], bool):
+    def __connect_to_spawn(self, special_room: Coordinate) -> bool:
         """
+        Adds the least Hallways and WildRooms needed to connect a SpecialRoom with the SpawnRoom. The path may only lead
+        through free cells and normal rooms, so SpecialRooms keep their single Hallway.
 
-        :param visited: Coordinates of all cells we already visited
-        :param pos: position/Coordinate of the cell we currently check
-        :param target: the cell we try to find
-        :return: list of dead ends on the path and False if the target cannot be reached, otherwise True
+        :param special_room: position of the SpecialRoom
+        :return: True if the SpecialRoom is connected to the SpawnRoom afterwards, False otherwise
         """
-        dead_ends = set()
-        neighbors = list(self.__hallways[pos].keys())
-
-        if target in neighbors:
-            return None, True  # we found the target
+        start_pos = list(self.__hallways[special_room].keys())[0]
+        if self.__components.are_connected(start_pos, self.__spawn_pos):
+            return True
 
-        while neighbors:
-            room = self.__rm.get_element(neighbors, remove=True, msg="RandomGen_astarRoom")
-            if room in visited:
+        path = find_connection(
+            self.__rm, start_pos, self.__width, self.__height,
+            is_target=lambda pos: self.__components.are_connected(pos, self.__spawn_pos),
+            is_passable=lambda pos: self.__get(pos) < _Code.Blocked or self.__get(pos) in _Code.normal_rooms(),
+            has_hallway=self.__has_hallway,
+        )
+        if path is None:
+            Logger.instance().debug(f"SpecialRoom cannot be connected for seed = {self.seed}", from_pycui=False)
+            return False
+        for pos, next_pos in zip(path, path[1:]):
+            if self.__has_hallway(pos, next_pos):
                 continue
-            visited.add(room)
-            ret, success = self.__astar(visited, pos=room, target=target)
-            if ret:
-                dead_ends.update(ret)
-            if success:
-                return dead_ends, True
-
-        cur_pos = pos
-        while True:
-            # we come back from a dead end, so we check if we can connect the current cell with a non-visited neighbor
-            coordinate, dead_end = self.__astar_connect_neighbors(visited, cur_pos)
-            if dead_end:
-                if len(self.__get_neighbors(coordinate, free_spots=True)) > 0:
-                    dead_ends.add(coordinate)
-                return dead_ends, False
+            door = Door(Direction.from_coordinates(pos, next_pos))
+            if self.__get(next_pos) < _Code.Blocked:
+                self.__place_wild(pos, door)
             else:
-                visited.add(coordinate)
-                ret, success = self.__astar(visited, pos=coordinate, target=target)
-                if ret:
-                    dead_ends.update(ret)
-                if success:
-                    return dead_ends, True
-
-    def __call_astar(self, visited: set, start_pos: Coordinate, spawn_pos: Coordinate) -> bool:
-        dead_ends, success = self.__astar(visited, start_pos, target=spawn_pos)
-        if success:
-            return True
-        dead_ends = list(dead_ends)
-        while dead_ends:
-            dead_end = self.__rm.get_element(dead_ends, remove=True, msg="RandomGen_astarDeadEnd")
-            relevant_pos = self.__get_neighbors(dead_end, free_spots=True)
-            # and try to place a new room to connect the dead end to the rest
-            while relevant_pos:
-                direction, _, new_pos = self.__rm.get_element(relevant_pos, remove=True, msg="RandomGen_astarRelevantPos")
-                self.__place_wild(dead_end, Door(direction))
-                visited.add(new_pos)
-                if self.__call_astar(visited, start_pos=new_pos, spawn_pos=spawn_pos):
-                    return True
-        return False
+                self.__add_hallway(pos, next_pos, door)
+        return True
 
     def get_hallway(self, pos: Coordinate) -> Dict[Coordinate, Door]:
         if pos in self.__hallways:
@@ -383,20 +360,22 @@ class RandomLayoutGenerator:
         return None
 
     def check_special_rooms(self) -> bool:
-        for y in range(self.__height):
-            for x in range(self.__width):
-                pos = Coordinate(x, y)
-                code = self.__get(pos)
-                if code in [_Code.Boss, _Code.Shop, _Code.Riddle, _Code.Gate]:
-                    connections = self.__hallways[pos]
-                    if len(connections) != 1:
-                        return False
+        """
+
+        :return: whether every SpecialRoom has exactly one Hallway and is connected to the SpawnRoom
+        """
+        for pos in self.__special_rooms:
+            if pos not in self.__hallways or len(self.__hallways[pos]) != 1:
+                return False
+            if not self.__components.are_connected(pos, self.__spawn_pos):
+                return False
         return True
 
     def generate(self, debug: bool = False) -> bool:
         # place the spawn room
         spawn_pos = self.__random_coordinate()
         self.__set(spawn_pos, _Code.Spawn)
+        self.__spawn_pos = spawn_pos
 
         # special case if SpawnRoom is in a corner
         corner = self.__is_corner(spawn_pos)
@@ -413,6 +392,7 @@ class RandomLayoutGenerator:
             self.__place_special_room(_Code.Boss),
             self.__place_special_room(_Code.Gate),
         ]
+        self.__special_rooms = special_rooms
 
         # create a locked hallway to spawn_pos-neighboring WildRooms if they lead to SpecialRooms
         #directions = self.__available_directions(spawn_pos, allow_wildrooms=True)
@@ -432,8 +412,9 @@ class RandomLayoutGenerator:
         if debug:
             print(self)
 
-        # fill up the rest with a couple of WildRooms
-        for num in [3, 2, 1, 1]:
+        # fill up the rest with a couple of WildRooms, keeping the density of the default grid size for bigger grids
+        num_of_rounds = max(1, round(self.__width * self.__height / RandomLayoutGenerator.__DEFAULT_AREA))
+        for num in RandomLayoutGenerator.__WILD_ROOM_ROUNDS * num_of_rounds:
             rooms = self.__random_free_wildroom_neighbors(num)
             for room in rooms:
                 direction, code, new_pos = room[0]
@@ -448,27 +429,11 @@ class RandomLayoutGenerator:
                 direction, _, new_pos = self.__rm.get_element(neighbors, msg="RandomGen_neighbor")
                 self.__add_hallway(spawn_pos, new_pos, Door(direction))
 
-        success = True
         # as last step, add missing Hallways and WildRooms to connect every SpecialRoom with the SpawnRoom
-        rooms = list(special_rooms)
-        while rooms:
-            room = rooms.pop(0)
-            visited = set(special_rooms)
-            start_pos = list(self.__hallways[room].keys())[0]
-            visited.add(start_pos)
-            if not self.__call_astar(visited, start_pos, spawn_pos):
-                success = False
-                break
-        if success:
-            return True
-        else:
-            for room in rooms:
-                start_pos = list(self.__hallways[room].keys())[0]
-                visited = set(special_rooms)
-                dead_ends, success = self.__astar(visited, start_pos, spawn_pos)
-                if not success:
-                    return False
-            return True
+        for room in special_rooms:
+            if not self.__connect_to_spawn(room):
+                return False
+        return True
 
     def __str__(self):
         cell_width = 5
@@ -513,18 +478,143 @@ class RandomLayoutGenerator:
         return str_rep
 
 
+class _ExpeditionRooms:
+    """
+    Creates the Rooms of an expedition the first time they are needed (i.e. when they come into sight or the Robot
+    teleports to them), so generating an expedition doesn't depend on how many Rooms it has and memory only grows with
+    the explored area. Until then only the layout (the Hallways of every Room) and a function creating the Room from
+    the values drawn for it during generation are kept.
+    """
+
+    def __init__(self, width: int, height: int):
+        # position -> (Hallways to the neighbors, function creating the Room from its Hallways)
+        self.__blueprints: Dict[Coordinate, Tuple[Dict[Coordinate, Door],
+                                                  Callable[[Dict[Direction, Optional[Hallway]]], Room]]] = {}
+        # shared with the Map, so it knows about Rooms that were created because a Hallway put them in sight
+        self.__rooms: List[List[Optional[Room]]] = [[None for _ in range(width)] for _ in range(height)]
+        # Hallways that were created by one of their Rooms and still wait for the other one
+        self.__hallways: Dict[Tuple[Coordinate, Coordinate], Hallway] = {}
+
+    def add(self, pos: Coordinate, hallways: Dict[Coordinate, Door],
+            create_room: Callable[[Dict[Direction, Optional[Hallway]]], Room]):
+        """
+
+        :param pos: position of the Room
+        :param hallways: the Doors to the neighboring Rooms
+        :param create_room: creates the Room given its Hallway per Direction (None where it has no Hallway)
+        """
+        self.__blueprints[pos] = hallways, create_room
+
+    @property
+    def room_matrix(self) -> List[List[Optional[Room]]]:
+        """
+
+        :return: the Rooms created so far at their position, None for Rooms that are not created yet
+        """
+        return self.__rooms
+
+    def __load_both(self, room1: Coordinate, room2: Coordinate) -> Callable[[], None]:
+        def load():
+            self.get(room1)
+            self.get(room2)
+        return load
+
+    def get(self, pos: Coordinate) -> Optional[Room]:
+        """
+
+        :param pos: position of the Room
+        :return: the Room at the given position (created if this is the first time it is needed) or None if there is
+        none
+        """
+        if self.__rooms[pos.y][pos.x] is not None:
+            return self.__rooms[pos.y][pos.x]
+        if pos not in self.__blueprints:
+            return None
+
+        hallways, create_room = self.__blueprints.pop(pos)
+        room_hallways = {
+            Direction.North: None, Direction.East: None, Direction.South: None, Direction.West: None,
+        }
+        for neighbor, door in hallways.items():
+            # get hallway from neighbor if it exists, otherwise create it
+            if (neighbor, pos) in self.__hallways:
+                hallway = self.__hallways.pop((neighbor, pos))
+            else:
+                hallway = Hallway(door)
+                hallway.set_room_loader(self.__load_both(pos, neighbor))
+                self.__hallways[(pos, neighbor)] = hallway
+            room_hallways[Direction.from_coordinates(pos, neighbor)] = hallway
+        room = create_room(room_hallways)
+        self.__rooms[pos.y][pos.x] = room
+        return room
+
+
+def _single_hallway(room_hallways: Dict[Direction, Optional[Hallway]]) -> Tuple[Hallway, Direction]:
+    # special rooms have exactly 1 neighbor
+    for direction, hallway in room_hallways.items():
+        if hallway is not None:
+            return hallway, direction
+
+
 class ExpeditionGenerator(DungeonGenerator):
     __MIN_ENEMY_FACTORY_CHANCE = 0.5
     __MAX_ENEMY_FACTORY_CHANCE = 0.8
 
     def __init__(self, seed: int, check_achievement: Callable[[str], bool], trigger_event: Callable[[str], None],
                  load_map_callback: Callable[[str], None], width: int = DungeonGenerator.WIDTH,
-                 height: int = DungeonGenerator.HEIGHT):
+                 height: int = DungeonGenerator.HEIGHT, content_seed: Optional[int] = None):
+        """
+
+        :param width: number of Rooms per row of the expedition
+        :param height: number of Rooms per column of the expedition
+        :param content_seed: seed for the content of the Rooms (enemies, rewards, puzzles, ...), None to draw one from
+        the RandomManager when generating. If it is given, prepare() doesn't touch the RandomManager at all and can
+        therefore also run outside the main thread.
+        """
         super(ExpeditionGenerator, self).__init__(seed, width, height)
+        self.__content_seed = content_seed
         self.__check_achievement = check_achievement
         self.__trigger_event = trigger_event
         self.__load_map = load_map_callback
         self.__layout = RandomLayoutGenerator(seed, width, height)
+        self.__prepared: Optional[Tuple[_ExpeditionRooms, Coordinate]] = None
+
+    @property
+    def layout(self) -> RandomLayoutGenerator:
+        return self.__layout
+
+    def __create_spawn_room(self, room_hallways: Dict[Direction, Optional[Hallway]]) -> Room:
+        return SpawnRoom(self.__load_map,
+                         north_hallway=room_hallways[Direction.North],
+                         east_hallway=room_hallways[Direction.East],
+                         south_hallway=room_hallways[Direction.South],
+                         west_hallway=room_hallways[Direction.West],
+                         )
+
+    @staticmethod
+    def __create_wild_room(enemy_factory: EnemyFactory, chance: float, seed: int,
+                           room_hallways: Dict[Direction, Optional[Hallway]]) -> Room:
+        return WildRoom(
+            enemy_factory,
+            chance=chance,
+            north_hallway=room_hallways[Direction.North],
+            east_hallway=room_hallways[Direction.East],
+            south_hallway=room_hallways[Direction.South],
+            west_hallway=room_hallways[Direction.West],
+            seed=seed,
+        )
+
+    @staticmethod
+    def __create_special_room(code: _Code, content, room_hallways: Dict[Direction, Optional[Hallway]]) -> Room:
+        hw, direction = _single_hallway(room_hallways)
+        if code == _Code.Shop:
+            return ShopRoom(hw, direction, content, CallbackPack.instance().visit_shop)
+        elif code == _Code.Riddle:
+            return RiddleRoom(hw, direction, content, CallbackPack.instance().open_riddle)
+        elif code == _Code.Gate:
+            return TreasureRoom(Collectible(content), hw, direction)
+        elif code == _Code.Boss:
+            return BossRoom(hw, direction, Boss(content, CallbackPack.instance().start_boss_fight))
 
     def generate(self, data: Robot) -> (LevelMap, bool):
         # Testing: seeds from 0 to 500_000 were successful
@@ -535,118 +625,118 @@ class ExpeditionGenerator(DungeonGenerator):
             for gate in gates:
                 robot.give_collectible(gate)
 
-        rm = RandomManager.create_new()     # needed for WildRooms
+        if not self.prepare(robot):
+            return None, False
+        return self.build(robot)
+
+    def prepare(self, robot: Robot) -> bool:
+        """
+        Generates the layout and the content of the expedition without creating its Map yet. The Robot is only used
+        for its loadout, so a snapshot of it can be used if this doesn't run in the main thread (see build()).
+
+        :param robot: provides the number of qubits, circuit space and available Instructions for the Targets
+        :return: whether the expedition could be generated or not
+        """
+        rm = RandomManager.create_new(self.__content_seed)     # needed for WildRooms
+        # everything else that would draw from the RandomManager (e.g. CollectibleFactories) draws from rm instead
+        with RandomManager.redirect(rm):
+            return self.__prepare(robot, rm)
+
+    def build(self, robot: Robot) -> (LevelMap, bool):
+        """
+        Creates the Map of the last expedition prepared by prepare().
+
+        :param robot: the Robot that explores the expedition
+        :return: the expedition and whether it was prepared successfully
+        """
+        if self.__prepared is None:
+            return None, False
+        rooms, spawn_room = self.__prepared
+        my_map = ExpeditionMap(self.seed, rooms.room_matrix, robot, spawn_room, self.__check_achievement,
+                               self.__trigger_event, load_room=rooms.get)
+        return my_map, True
+
+    def __prepare(self, robot: Robot, rm: MyRandom) -> bool:
+        self.__prepared = None
         gate_factory = GateFactory.default()
         shop_factory = ShopFactory.default()
         riddle_factory = RiddleFactory.default(robot)
-        boss_factory = BossFactory.default(robot)
+        boss_factory = BossFactory.default(robot, RandomManager.create_new(rm.get_seed(msg="RandomDG_bossSeed")))
 
         gate = gate_factory.produce(rm)
         riddle = riddle_factory.produce(rm)
         shop_items = shop_factory.produce(rm, num_of_items=3)
-        dungeon_boss = boss_factory.produce([gate])  # todo based on chance also add gates from riddle or shop_items?
+        # todo based on chance also add gates from riddle or shop_items?
+        dungeon_boss = boss_factory.produce([gate])
+        special_contents = {
+            _Code.Shop: shop_items,
+            _Code.Riddle: riddle,
+            _Code.Gate: gate,
+            _Code.Boss: dungeon_boss,
+        }
 
         enemy_factories = [
-            EnemyFactory(CallbackPack.instance().start_fight, TargetDifficulty(
+            EnemyFactory(CallbackPack.instance().start_fight, ReachableTargetDifficulty(
                 2, [Coin(2), EnergyRefill()]
             )),
-            EnemyFactory(CallbackPack.instance().start_fight, TargetDifficulty(
+            EnemyFactory(CallbackPack.instance().start_fight, ReachableTargetDifficulty(
                 2, [Coin(1), Coin(2), Coin(2), Coin(3), Key(), EnergyRefill(15)]
             )),
-            EnemyFactory(CallbackPack.instance().start_fight, TargetDifficulty(
+            EnemyFactory(CallbackPack.instance().start_fight, ReachableTargetDifficulty(
                 3, [Coin(1), Coin(5), Key(), EnergyRefill(20)]
             )),
-            EnemyFactory(CallbackPack.instance().start_fight, TargetDifficulty(
+            EnemyFactory(CallbackPack.instance().start_fight, ReachableTargetDifficulty(
                 3, [Coin(1), Coin(1), EnergyRefill(3)]
             )),
         ]
         enemy_factory_priorities = [0.25, 0.35, 0.3, 0.1]
 
-        rooms = [[None for _ in range(self.width)] for _ in range(self.height)]
+        if not self.__layout.generate():
+            return False
+
+        # the Rooms themselves are only created when they are needed, but everything random about them is already
+        # drawn here so they don't depend on the order they are explored in
+        rooms = _ExpeditionRooms(self.width, self.height)
         spawn_room = None
-        created_hallways = {}
-        if self.__layout.generate():
-            for y in range(self.height):
-                for x in range(self.width):
-                    pos = Coordinate(x, y)
-                    code = self.__layout.get_room(pos)
-                    if code and code > _Code.Blocked:
-                        room_hallways = {
-                            Direction.North: None, Direction.East: None, Direction.South: None, Direction.West: None,
-                        }
-                        hallways = self.__layout.get_hallway(pos)
-                        if hallways is None:
-                            if code == _Code.Wild:
-                                # it is completely fine if it happens that an isolated WildRoom was generated
-                                continue
-                            else:
-                                Logger.instance().throw(NotImplementedError(
-                                    f"Found a SpecialRoom ({code}) without connecting Hallways for seed = "
-                                    f"{self.seed}. Please do report this error as this should not be "
-                                    "possible to occur! :("))
-                        for neighbor in hallways:
-                            direction = Direction.from_coordinates(pos, neighbor)
-                            opposite = direction.opposite()
-                            # get hallway from neighbor if it exists, otherwise create it
-                            if neighbor in created_hallways and opposite in created_hallways[neighbor]:
-                                hallway = created_hallways[neighbor][opposite]
-                            else:
-                                hallway = Hallway(hallways[neighbor])   # todo create door here and only check if it should be locked or not?
-                                if neighbor in created_hallways:
-                                    created_hallways[neighbor][opposite] = hallway
-                                else:
-                                    created_hallways[neighbor] = {opposite: hallway}
-
-                            # store the hallway so the neighbors can find it if necessary
-                            if pos not in created_hallways:
-                                created_hallways[pos] = {}
-                            created_hallways[pos][direction] = hallway
-                            room_hallways[direction] = hallway
-
-                        room = None
-                        if code == _Code.Spawn:
-                            spawn_room = pos
-                            room = SpawnRoom(self.__load_map,
-                                north_hallway=room_hallways[Direction.North],
-                                east_hallway=room_hallways[Direction.East],
-                                south_hallway=room_hallways[Direction.South],
-                                west_hallway=room_hallways[Direction.West],
-                                )
-                        elif code == _Code.Wild:
-                            enemy_factory = rm.get_element_prioritized(enemy_factories, enemy_factory_priorities,
-                                                                       msg="RandomDG_elemPrioritized")
-                            room = WildRoom(
-                                enemy_factory,
-                                chance=rm.get(ExpeditionGenerator.__MIN_ENEMY_FACTORY_CHANCE,
-                                              ExpeditionGenerator.__MAX_ENEMY_FACTORY_CHANCE,
-                                              msg="RandomDG_WRPuzzleDistribution"),
-                                north_hallway=room_hallways[Direction.North],
-                                east_hallway=room_hallways[Direction.East],
-                                south_hallway=room_hallways[Direction.South],
-                                west_hallway=room_hallways[Direction.West],
-                            )
+        for y in range(self.height):
+            for x in range(self.width):
+                pos = Coordinate(x, y)
+                code = self.__layout.get_room(pos)
+                if code and code > _Code.Blocked:
+                    hallways = self.__layout.get_hallway(pos)
+                    if hallways is None:
+                        if code == _Code.Wild:
+                            # it is completely fine if it happens that an isolated WildRoom was generated
+                            continue
                         else:
-                            # special rooms have exactly 1 neighbor which is already stroed in direction
-                            hw = room_hallways[direction]
-                            if code == _Code.Shop:
-                                room = ShopRoom(hw, direction, shop_items, CallbackPack.instance().visit_shop)
-                            elif code == _Code.Riddle:
-                                room = RiddleRoom(hw, direction, riddle, CallbackPack.instance().open_riddle)
-                            elif code == _Code.Gate:
-                                room = TreasureRoom(Collectible(gate), hw, direction)
-                            elif code == _Code.Boss:
-                                room = BossRoom(hw, direction, Boss(dungeon_boss,
-                                                                          CallbackPack.instance().start_boss_fight))
-                        if room:
-                            rooms[y][x] = room
-            if spawn_room:
-                my_map = ExpeditionMap(self.seed, rooms, robot, spawn_room, self.__check_achievement,
-                                       self.__trigger_event)
-                return my_map, True
-            else:
-                return None, False
+                            Logger.instance().throw(NotImplementedError(
+                                f"Found a SpecialRoom ({code}) without connecting Hallways for seed = "
+                                f"{self.seed}. Please do report this error as this should not be "
+                                "possible to occur! :("))
+
+                    if code == _Code.Spawn:
+                        spawn_room = pos
+                        create_room = self.__create_spawn_room
+                    elif code == _Code.Wild:
+                        enemy_factory = rm.get_element_prioritized(enemy_factories, enemy_factory_priorities,
+                                                                   msg="RandomDG_elemPrioritized")
+                        chance = rm.get(ExpeditionGenerator.__MIN_ENEMY_FACTORY_CHANCE,
+                                        ExpeditionGenerator.__MAX_ENEMY_FACTORY_CHANCE,
+                                        msg="RandomDG_WRPuzzleDistribution")
+                        create_room = partial(ExpeditionGenerator.__create_wild_room, enemy_factory, chance,
+                                              rm.get_seed(msg="RandomDG_WRSeed"))
+                    elif code in special_contents:
+                        create_room = partial(ExpeditionGenerator.__create_special_room, code,
+                                              special_contents[code])
+                    else:
+                        continue
+                    rooms.add(pos, hallways, create_room)
+
+        if spawn_room:
+            self.__prepared = rooms, spawn_room
+            return True
         else:
-            return None, False
+            return False
 
     def __load_next(self):
         #MapManager.instance().load_next()
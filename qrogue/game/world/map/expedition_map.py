@@ -1,4 +1,4 @@
-from typing import List, Callable
+from typing import List, Callable, Optional
 
 from qrogue.game.logic.actors import Controllable
 from qrogue.game.world.map import Map, MapType, Room
@@ -6,10 +6,24 @@ from qrogue.game.world.navigation import Coordinate
 
 
 class ExpeditionMap(Map):
-    def __init__(self, seed: int, rooms: List[List[Room]], controllable: Controllable, spawn_room: Coordinate,
-                 check_achievement: Callable[[str], bool], trigger_event: Callable[[str], None]):
+    def __init__(self, seed: int, rooms: List[List[Optional[Room]]], controllable: Controllable,
+                 spawn_room: Coordinate, check_achievement: Callable[[str], bool],
+                 trigger_event: Callable[[str], None],
+                 load_room: Optional[Callable[[Coordinate], Optional[Room]]] = None):
+        """
+
+        :param rooms: the Rooms of the expedition, positions of Rooms that are created lazily are None
+        :param load_room: creates the Room at the given position (or returns it if it already exists) the first time it
+        is needed, None if all Rooms are already part of rooms
+        """
+        self.__load_room = load_room
         super().__init__(f"Expedition {seed}", f"exp{seed}", seed, rooms, controllable, spawn_room, check_achievement,
                          trigger_event)
 
+    def _load_room(self, pos: Coordinate) -> Optional[Room]:
+        if self.__load_room is None:
+            return None
+        return self.__load_room(pos)
+
     def get_type(self) -> MapType:
         return MapType.Expedition
@@ -6,7 +6,7 @@ import qrogue.game.world.tiles as tiles
 from qrogue.game.logic import Message
 from qrogue.game.logic.actors import Controllable, Robot
 from qrogue.game.world.navigation import Coordinate, Direction
-from qrogue.util import Logger, MapConfig
+from qrogue.util import CheatConfig, Logger, MapConfig
 
 from qrogue.game.world.map.rooms import Room, Area, Placeholder, SpawnRoom, MetaRoom, AreaType
 
@@ -58,7 +58,7 @@ class Map(ABC):
         self.__dimensions = Coordinate(len(rooms[0]), len(rooms))
 
         self.__controllable_pos = Map.__calculate_pos(spawn_room, Coordinate(Area.MID_X, Area.MID_Y))
-        self.__cur_area = self.__rooms[spawn_room.y][spawn_room.x]
+        self.__cur_area = self.__room_at(spawn_room.x, spawn_room.y)
         self.__cur_area.enter(Direction.Center)
         self.__cur_area.make_visible()
 
@@ -151,7 +151,7 @@ class Map(ABC):
 
         room_x = int(x / width)
         room_y = int(y / height)
-        room = self.__rooms[room_y][room_x]
+        room = self.__room_at(room_x, room_y)
         if room is None:
             Logger.instance().error(f"Error! Invalid position: {x}|{y}", from_pycui=False)
             return None, tiles.Invalid()
@@ -167,17 +167,40 @@ class Map(ABC):
         else:
             return room, room.at(x_mod, y_mod)
 
-    def __room_at(self, x: int, y: int) -> Optional[Room]:
+    def _load_room(self, pos: Coordinate) -> Optional[Room]:
+        """
+        Called whenever a Room is needed that doesn't exist yet. Maps that create their Rooms lazily override this to
+        create the Room at the given position.
+
+        :param pos: Coordinate of the Room on the Map
+        :return: the Room at the given position or None if there is none
+        """
+        return None
+
+    def __room_at(self, x: int, y: int, load: bool = True) -> Optional[Room]:
         """
         Returns the Room at the given position or None if either x or y are out of bounds.
         :param x: x-Coordinate of the room we want to get
         :param y: y-Coordinate of the room we want to get
+        :param load: whether a Room that doesn't exist yet should be created if the Map creates its Rooms lazily
         :return: the Room at the given position or None if the position is invalid
         """
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.__rooms[y][x]
+            room = self.__rooms[y][x]
+            if room is None and load:
+                room = self._load_room(Coordinate(x, y))
+                self.__rooms[y][x] = room
+            return room
         return None
 
+    def load_all_rooms(self):
+        """
+        Creates all Rooms that don't exist yet, e.g. to reveal the whole Map or to check that all of them can be created.
+        """
+        for y in range(self.height):
+            for x in range(self.width):
+                self.__room_at(x, y)
+
     def move(self, direction: Direction) -> bool:
         """
         Tries to move the robot into the given Direction.
@@ -234,6 +257,8 @@ class Map(ABC):
     def row_strings(self) -> List[str]:
         rows = []
         offset = 0
+        # Rooms that were not created yet cannot be in sight, so they are only created if the whole map is revealed
+        load_rooms = CheatConfig.revealed_map()
         # iterate through every row of Rooms
         for y in range(self.height):
             last_row = y == self.height - 1  # there are no more Hallways after the last row of Rooms
@@ -242,7 +267,7 @@ class Map(ABC):
 
             for x in range(self.width):
                 last_col = x == self.width - 1  # there are no more Hallways after the last Room in a row
-                room = self.__room_at(x, y)
+                room = self.__room_at(x, y, load=load_rooms)
                 if room is None:
                     areas.append(Placeholder.pseudo_room())
                     if not last_col:
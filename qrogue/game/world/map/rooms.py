@@ -207,6 +207,7 @@ class Hallway(Area):
         self.__hide = door.is_event_locked
         self.__room1 = None
         self.__room2 = None
+        self.__load_rooms: Optional[Callable[[], None]] = None
         if self.is_horizontal():
             missing_half = int((Area.UNIT_WIDTH - 3) / 2)
             row = [Void()] * missing_half + [Wall(), door, Wall()] + [Void()] * missing_half
@@ -220,6 +221,21 @@ class Hallway(Area):
     def door(self) -> Door:
         return self.__door
 
+    def set_room_loader(self, load_rooms: Callable[[], None]):
+        """
+        For Maps that create their Rooms lazily: load_rooms is called once before the Hallway needs its Rooms for the
+        first time (e.g. to put them in sight) and has to create the ones that don't exist yet.
+
+        :param load_rooms: creates the Rooms connected by this Hallway
+        """
+        self.__load_rooms = load_rooms
+
+    def __ensure_rooms(self):
+        if self.__load_rooms is not None and (self.__room1 is None or self.__room2 is None):
+            load_rooms = self.__load_rooms
+            self.__load_rooms = None
+            load_rooms()
+
     def set_room(self, room: "Room", direction: Direction):
         """
 
@@ -248,6 +264,7 @@ class Hallway(Area):
 
     def make_visible(self):
         super(Hallway, self).make_visible()
+        self.__ensure_rooms()
         if self.__room1:
             self.__room1.in_sight()
         else:
@@ -260,6 +277,7 @@ class Hallway(Area):
     def get_row_str(self, row: int) -> str:
         if self.__hide:
             if self.__door.check_event():
+                self.__ensure_rooms()
                 if self.__room1.is_visible or self.__room2.is_visible:
                     self.make_visible()
                 # elif self.__room1.in_sight or self.__room2.in_sight:
@@ -272,10 +290,12 @@ class Hallway(Area):
             self.make_visible()
 
     def enter(self, direction: Direction):
+        self.__ensure_rooms()
         self.__room1.make_visible()
         self.__room2.make_visible()
 
     def room(self, first: bool):
+        self.__ensure_rooms()
         if first:
             return self.__room1
         else:
@@ -661,9 +681,14 @@ class WildRoom(BaseWildRoom):
     __NUM_OF_ENEMY_GROUPS = 4
 
     def __init__(self, factory: target_factory.EnemyFactory, chance: float = 0.6, north_hallway: Hallway = None,
-                 east_hallway: Hallway = None, south_hallway: Hallway = None, west_hallway: Hallway = None):
+                 east_hallway: Hallway = None, south_hallway: Hallway = None, west_hallway: Hallway = None,
+                 seed: Optional[int] = None):
+        """
+
+        :param seed: seed for placing the enemies and for their randomness, None to draw one from the RandomManager
+        """
         self.__dictionary = {1: [], 2: [], 3: [], 4: [], 5: [], 6: [], 7: [], 8: [], 9: []}
-        rm = RandomManager.create_new()
+        rm = RandomManager.create_new(seed)
 
         available_positions = []
         for y in range(Room.INNER_HEIGHT):
@@ -679,7 +704,8 @@ class WildRoom(BaseWildRoom):
         tile_list = Room.get_empty_room_tile_list()
         for i in range(num_of_enemies):
             eid = rm.get_int(min_=0, max_=WildRoom.__NUM_OF_ENEMY_GROUPS + 1, msg="WildRoom_eid")
-            enemy = EnemyTile(factory, self.__get_tiles_by_id, self.__update_entangled_tiles, eid)
+            enemy = EnemyTile(factory, self.__get_tiles_by_id, self.__update_entangled_tiles, eid,
+                              seed=rm.get_seed(msg="WildRoom_enemySeed"))
             if eid > 0:
                 self.__dictionary[eid].append(enemy)
             pos = rm.get_element(available_positions, remove=True, msg="WildRoom_epos")
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Callable, List
+from typing import Callable, List, Optional
 
 from qrogue.game.logic.actors import Controllable, Robot, Boss as BossActor
 from qrogue.game.target_factory import EnemyFactory
@@ -19,14 +19,18 @@ class _EnemyState(Enum):
 
 class Enemy(WalkTriggerTile):
     def __init__(self, factory: EnemyFactory, get_entangled_tiles: Callable[[int], List["Enemy"]],
-                 update_entangled_groups: Callable[["Enemy"], None], e_id: int = 0):
+                 update_entangled_groups: Callable[["Enemy"], None], e_id: int = 0, seed: Optional[int] = None):
+        """
+
+        :param seed: seed for the Enemy's randomness, None to draw one from the RandomManager
+        """
         super().__init__(TileCode.Enemy)
         self.__factory = factory
         self.__state = _EnemyState.UNDECIDED
         self.__get_entangled_tiles = get_entangled_tiles
         self.__update_entangled_groups = update_entangled_groups
         self.__id = e_id
-        self.__rm = RandomManager.create_new()
+        self.__rm = RandomManager.create_new(seed)
         self.__enemy = None
 
     @property
@@ -6,7 +6,7 @@ from py_cui import ColorRule
 from py_cui.widgets import BlockLabel
 
 from qrogue.game.logic import StateVector
-from qrogue.game.logic.actors import Robot, CircuitMatrix
+from qrogue.game.logic.actors import Robot, SimulationResult
 from qrogue.game.logic.collectibles import Instruction
 from qrogue.game.world.map import Map
 from qrogue.game.world.navigation import Direction
@@ -340,6 +340,21 @@ class CircuitWidget(Widget):
             # hence this xor condition
             return (self.gate is None) != (robot.gate_at(pos) is None)
 
+        def preview_gate(self) -> Tuple[bool, Optional[Instruction]]:
+            """
+
+            :return: whether the placement is complete enough to be previewed and the gate as it would be placed (a copy
+            with all qubits specified or None if the gate at pos is going to be removed)
+            """
+            if self.gate is None:
+                return True, None
+            gate = self.gate.copy()
+            for qubit in self.gate.qargs_iter():
+                gate.use_qubit(qubit)
+            if gate.use_qubit(self.qubit):
+                return False, None  # more qubits are needed before we know how the gate will be placed
+            return True, gate
+
         def place(self) -> bool:
             """
 
@@ -357,6 +372,7 @@ class CircuitWidget(Widget):
         super().__init__(widget)
         self.__robot = None
         self.__place_holder_data = None
+        self.__preview_callback: Optional[Callable[[Optional[Instruction], int], None]] = None
 
         widget.add_key_command(controls.get_keys(Keys.SelectionUp), self.__move_up)
         widget.add_key_command(controls.get_keys(Keys.SelectionRight), self.__move_right)
@@ -397,6 +413,7 @@ class CircuitWidget(Widget):
 
         self.__place_holder_data.pos = pos
         self.render()
+        self.__request_preview()
         return True
 
     def __move_up(self):
@@ -406,6 +423,7 @@ class CircuitWidget(Widget):
                 if self.__place_holder_data.is_valid_qubit(qubit):
                     self.__place_holder_data.qubit = qubit
                     self.render()
+                    self.__request_preview()
                     return
                 qubit += 1
 
@@ -421,6 +439,7 @@ class CircuitWidget(Widget):
                 if self.__place_holder_data.is_valid_qubit(qubit):
                     self.__place_holder_data.qubit = qubit
                     self.render()
+                    self.__request_preview()
                     return
                 qubit -= 1
 
@@ -435,6 +454,20 @@ class CircuitWidget(Widget):
             #gate, pos, qubit = self.__place_holder_data
             # todo
 
+    def set_preview_callback(self, callback: Optional[Callable[[Optional[Instruction], int], None]]):
+        """
+
+        :param callback: called with the gate (None for removal) and position whenever the current placement changes
+        in a way that can be previewed
+        """
+        self.__preview_callback = callback
+
+    def __request_preview(self):
+        if self.__preview_callback is not None and self.__place_holder_data is not None:
+            can_preview, gate = self.__place_holder_data.preview_gate()
+            if can_preview:
+                self.__preview_callback(gate, self.__place_holder_data.pos)
+
     def start_gate_placement(self, gate: Optional[Instruction], pos: int = -1, qubit: int = 0):
         self.__place_holder_data = self.PlaceHolderData(gate, pos, qubit)
         if pos < 0 or self.__robot.circuit_space <= pos:
@@ -448,6 +481,7 @@ class CircuitWidget(Widget):
                     if self.__place_holder_data.is_valid_pos(i, self.__robot):
                         self.__place_holder_data.pos = i
                         break
+        self.__request_preview()
 
     def place_gate(self) -> Tuple[bool, Optional[Instruction]]:
         """
@@ -465,6 +499,7 @@ class CircuitWidget(Widget):
             else:
                 if self.__place_holder_data.place():
                     self.render()
+                    self.__request_preview()
                     return False, self.__place_holder_data.gate
                 if self.__robot.use_instruction(self.__place_holder_data.gate, self.__place_holder_data.pos):
                     gate = self.__place_holder_data.gate
@@ -615,22 +650,33 @@ class TargetStateVectorWidget(StateVectorWidget):
 class CircuitMatrixWidget(Widget):
     def __init__(self, widget: WidgetWrapper):
         super().__init__(widget)
-        self.__matrix_str_rep = None
+        self.__result: Optional[SimulationResult] = None
+        self.__matrix_str_rep: Optional[str] = None
         ColorRules.apply_heading_rules(widget)
         ColorRules.apply_qubit_config_rules(widget)
 
-    def set_data(self, matrix: CircuitMatrix) -> None:
-        self.__matrix_str_rep = f"~Circuit Matrix~\n"
-        if matrix.num_of_qubits > 3:
-            self.__matrix_str_rep += "\n" * int(0.5 * matrix.size - 1)
-            self.__matrix_str_rep += "Matrix is too big to be displayed!\n"
-            # self.__matrix_str_rep += "But you can have a look at it by opening:\n"
-            # self.__matrix_str_rep += " \"TODO\""        # todo create html file of current matrix?
+    def set_data(self, result: SimulationResult) -> None:
+        # the matrix is only computed and stringified when we actually render it since that is the most expensive part
+        # of a simulation and it might be replaced by a newer result before the next render anyway
+        self.__result = result
+        self.__matrix_str_rep = None
+
+    def __to_string(self, result: SimulationResult) -> str:
+        text = f"~Circuit Matrix~\n"
+        if result.num_of_qubits > 3:
+            # don't materialize the matrix at all since we cannot show it anyway
+            text += "\n" * int(0.5 * 2 ** result.num_of_qubits - 1)
+            text += "Matrix is too big to be displayed!\n"
+            # text += "But you can have a look at it by opening:\n"
+            # text += " \"TODO\""        # todo create html file of current matrix?
         else:
-            self.__matrix_str_rep += matrix.to_string()
+            text += result.circuit_matrix.to_string()
+        return text
 
     def render(self) -> None:
-        if self.__matrix_str_rep is not None:
+        if self.__result is not None:
+            if self.__matrix_str_rep is None:
+                self.__matrix_str_rep = self.__to_string(self.__result)
             self.widget.set_title(self.__matrix_str_rep)
 
     def render_reset(self) -> None:
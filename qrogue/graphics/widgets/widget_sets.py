@@ -6,9 +6,9 @@ import py_cui
 from py_cui.widget_set import WidgetSet
 
 from qrogue.game.logic import StateVector
-from qrogue.game.logic.actors import Boss, Enemy, Riddle, Robot
+from qrogue.game.logic.actors import Boss, Enemy, Riddle, Robot, SimulationResult
 from qrogue.game.logic.actors.puzzles import Target, Challenge
-from qrogue.game.logic.collectibles import ShopItem
+from qrogue.game.logic.collectibles import Instruction, ShopItem
 from qrogue.game.world.map import Map
 from qrogue.game.world.navigation import Direction
 from qrogue.graphics.popups import Popup
@@ -95,6 +95,13 @@ class MyWidgetSet(WidgetSet, Renderable, ABC):
     def render(self) -> None:
         self.__base_render(self.get_widget_list())
 
+    def update_frame(self) -> None:
+        """
+        Called once per frame after the frame's input was handled and before the widgets are drawn. Work that only
+        needs the newest state (instead of reacting to every single input) belongs here.
+        """
+        pass
+
     @abstractmethod
     def get_widget_list(self) -> List[Widget]:
         pass
@@ -594,6 +601,8 @@ class ReachTargetWidgetSet(MyWidgetSet, ABC):
         self.__num_of_qubits = -1   # needs to be an illegal value because we definitely want to reposition all
         # dependent widgets for the first usage of this WidgetSet
         self._details_content = None
+        # newest preview (gate, position) that was not simulated yet; older requests are simply overwritten
+        self.__preview_request: Optional[Tuple[Optional[Instruction], int]] = None
 
         posy = 0
         posx = 0
@@ -639,6 +648,7 @@ class ReachTargetWidgetSet(MyWidgetSet, ABC):
                                        column_span=UIConfig.WINDOW_WIDTH, center=True)
         ColorRules.apply_circuit_rules(circuit)
         self.__circuit = CircuitWidget(circuit, controls)
+        self.__circuit.set_preview_callback(self.__request_preview)
         posy += circuit_height
 
         choices = self.add_block_label('Choices', posy, 0, row_span=UIConfig.WINDOW_HEIGHT - posy,
@@ -785,6 +795,7 @@ class ReachTargetWidgetSet(MyWidgetSet, ABC):
         self._hud.set_data((robot, None, None))  # don't overwrite the current map name
         self.__circuit.set_data(robot)
 
+        self.__preview_request = None
         self.__input_stv.set_data(StateVector.create_zero_state_vector(robot.num_of_qubits))
         self.__mul_widget.set_data(self._sign_offset + "x")
         self.__result_widget.set_data(self._sign_offset + "=")
@@ -810,11 +821,31 @@ class ReachTargetWidgetSet(MyWidgetSet, ABC):
         self._choices.render_reset()
         self._details.render_reset()
 
-    def __update_calculation(self, target_reached: bool):
-        diff_stv = self._target.state_vector.get_diff(self._robot.state_vector)
+    def update_frame(self) -> None:
+        # previews are only simulated once per frame, so placement changes that arrive faster than frames are drawn
+        # only cost a single simulation for the newest one
+        if self.__preview_request is not None:
+            gate, position = self.__preview_request
+            self.__preview_request = None
+            self.__update_calculation(False, self._robot.preview(gate, position))
+            self.render()
+
+    def __request_preview(self, gate: Optional[Instruction], position: int):
+        self.__preview_request = (gate, position)
+
+    def __update_calculation(self, target_reached: bool, result: Optional[SimulationResult] = None):
+        """
+
+        :param target_reached: whether the robot's current StateVector reached the target or not
+        :param result: a preview to show instead of the robot's current state
+        """
+        if result is None:
+            result = self._robot.simulation_result
+        state_vector = result.state_vector
+        diff_stv = self._target.state_vector.get_diff(state_vector)
 
-        self.__circuit_matrix.set_data(self._robot.circuit_matrix)
-        self.__stv_robot.set_data((self._robot.state_vector, diff_stv), target_reached=target_reached)
+        self.__circuit_matrix.set_data(result)
+        self.__stv_robot.set_data((state_vector, diff_stv), target_reached=target_reached)
 
         if diff_stv.is_zero:
             self.__eq_widget.set_data(self._sign_offset + "===")
@@ -867,6 +898,7 @@ class ReachTargetWidgetSet(MyWidgetSet, ABC):
         if self._target is None:
             Logger.instance().error("Error! Target is not set!", from_pycui=False)
             return False
+        self.__preview_request = None   # the committed result replaces any pending preview
         self._robot.update_statevector()
         success, reward = self._target.is_reached(self._robot.state_vector)
         self.__update_calculation(success)
@@ -899,6 +931,7 @@ class ReachTargetWidgetSet(MyWidgetSet, ABC):
             self._details_content = self._DETAILS_INFO_THEN_CHOICES
             return True
         else:
+            self.__preview_request = None
             self._robot.reset_circuit()
             self.__update_calculation(False)
             self.render()
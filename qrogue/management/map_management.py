@@ -1,10 +1,13 @@
-from typing import Callable, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
 
+from qrogue.game.logic.actors import Robot
+from qrogue.game.logic.actors.controllables import TestBot
 from qrogue.game.world.dungeon_generator import ExpeditionGenerator, QrogueLevelGenerator, QrogueWorldGenerator
 from qrogue.game.world.map import Map, WorldMap, MapType
 from qrogue.game.world.navigation import Coordinate
 from qrogue.graphics.popups import Popup
-from qrogue.util import CommonQuestions, Logger, MapConfig, achievements, RandomManager, Config
+from qrogue.util import CommonQuestions, Logger, MapConfig, achievements, MyRandom, RandomManager, Config
 
 from qrogue.management.save_data import SaveData
 from qrogue.util.achievements import Ach, Unlocks
@@ -40,6 +43,59 @@ def get_next(cur_map: str) -> Optional[str]:
     return None
 
 
+def _content_seed(map_seed: int) -> int:
+    """
+
+    :param map_seed: seed of an expedition's layout
+    :return: seed of the expedition's content, derived from map_seed so restarting an expedition recreates it entirely
+    """
+    return MyRandom(map_seed).get_seed(msg="MapMngr_contentSeedForExpedition")
+
+
+class _Loadout:
+    """
+    Immutable snapshot of everything about a Robot an expedition's generation depends on, so the generation doesn't
+    have to read the Robot itself while the player keeps playing in the main thread.
+    """
+
+    def __init__(self, robot: Robot):
+        self.__num_of_qubits = robot.num_of_qubits
+        self.__circuit_space = robot.circuit_space
+        # the order matters since generation picks gates by their index
+        self.__gate_types = tuple(type(gate) for gate in robot.get_available_instructions())
+
+    def create_robot(self) -> Robot:
+        """
+
+        :return: a new Robot with this loadout that nobody else has access to
+        """
+        gates = [gate_type() for gate_type in self.__gate_types]
+        return TestBot(lambda: None, self.__num_of_qubits, gates, circuit_space=self.__circuit_space,
+                       backpack_space=len(gates))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, _Loadout) and self.__num_of_qubits == other.__num_of_qubits and \
+            self.__circuit_space == other.__circuit_space and self.__gate_types == other.__gate_types
+
+
+class _PreparedExpedition:
+    """
+    An expedition that is generated in the background before the player enters it, together with everything needed to
+    check whether it still fits the Robot.
+    """
+
+    def __init__(self, map_seed: int, robot: Robot, loadout: _Loadout, generator: ExpeditionGenerator,
+                 future: Future):
+        self.map_seed = map_seed
+        self.robot = robot
+        self.loadout = loadout
+        self.generator = generator
+        self.future = future
+
+    def fits(self, map_seed: int, robot: Robot) -> bool:
+        return map_seed == self.map_seed and robot is self.robot and _Loadout(robot) == self.loadout
+
+
 class MapManager:
     __instance = None
 
@@ -59,6 +115,9 @@ class MapManager:
             self.__show_world = show_world
             self.__start_level = start_level
             self.__world_memory = {}    # str -> WorldMap
+            # a single worker suffices since at most one expedition is prepared at a time
+            self.__expedition_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ExpeditionGenerator")
+            self.__prepared_expedition: Optional[_PreparedExpedition] = None
 
             generator = QrogueWorldGenerator(seed, SaveData.instance().player,
                                              SaveData.instance().achievement_manager.check_achievement,
@@ -114,6 +173,70 @@ class MapManager:
                                             from_pycui=False)
         return self.__world_memory[MapConfig.hub_world()]
 
+    def __create_expedition_generator(self, map_seed: int) -> ExpeditionGenerator:
+        check_achievement = SaveData.instance().achievement_manager.check_achievement
+        return ExpeditionGenerator(map_seed, check_achievement, self.__trigger_event, self.load_map,
+                                   content_seed=_content_seed(map_seed))
+
+    def __prepare_expedition(self):
+        """
+        Speculatively generates the next expedition in the background, so entering it doesn't have to wait for its
+        generation. The seed it would get is only peeked at, so the seeds of everything loaded afterwards don't depend
+        on whether an expedition was prepared or not. If the player loads something else first or the Robot's loadout
+        changes in the meantime, the prepared expedition is discarded and a new one is prepared. The background
+        generation only reads a snapshot of the Robot's loadout and only shares the simulation caches, the
+        PuzzleCorpus, the ReachableStateIndices and the Logger with the main thread, which are all guarded by locks.
+        """
+        robot = SaveData.instance().get_robot(0)
+        # generation gives gates to Robots without any, which must not happen outside the main thread
+        if robot is None or len(robot.get_available_instructions()) <= 0:
+            return
+
+        map_seed = self.__rm.peek_seed(msg="MapMngr_seedForExpedition")
+        prepared = self.__prepared_expedition
+        if prepared is not None:
+            if prepared.fits(map_seed, robot):
+                return
+            prepared.future.cancel()
+
+        generator = self.__create_expedition_generator(map_seed)
+        loadout = _Loadout(robot)
+        future = self.__expedition_worker.submit(generator.prepare, loadout.create_robot())
+        self.__prepared_expedition = _PreparedExpedition(map_seed, robot, loadout, generator, future)
+
+    def shutdown(self):
+        """
+        Stops preparing expeditions in the background. Has to be called when the game stops so a pending generation
+        doesn't keep the application alive.
+        """
+        if self.__prepared_expedition is not None:
+            self.__prepared_expedition.future.cancel()
+            self.__prepared_expedition = None
+        self.__expedition_worker.shutdown(wait=False, cancel_futures=True)
+
+    def __take_expedition(self, robot: Robot) -> Tuple[int, Optional[Map], bool]:
+        """
+        Hands over the prepared expedition or generates a new one if none is prepared or it doesn't fit the seed or
+        Robot anymore.
+
+        :param robot: the Robot that enters the expedition
+        :return: the expedition's seed, the expedition and whether it was generated successfully
+        """
+        map_seed = self.__rm.get_seed(msg="MapMngr_seedForExpedition")
+        prepared = self.__prepared_expedition
+        self.__prepared_expedition = None
+        if prepared is not None:
+            if prepared.fits(map_seed, robot):
+                # blocks only if the player was faster than the background generation
+                prepared.future.result()
+                # the Robot is only bound to the expedition here in the main thread
+                expedition, success = prepared.generator.build(robot)
+                return map_seed, expedition, success
+            # a running generation cannot be cancelled, but its result is simply never used
+            prepared.future.cancel()
+        expedition, success = self.__create_expedition_generator(map_seed).generate(robot)
+        return map_seed, expedition, success
+
     def __load_map(self, map_name: str, room: Optional[Coordinate], map_seed: int = None):
         if map_name == MapConfig.spaceship():
             next_map = get_next(map_name)
@@ -124,6 +247,7 @@ class MapManager:
             self.__cur_map = self.__world_memory[map_name]
             self.__in_level = False
             self.__show_world(self.__cur_map)
+            self.__prepare_expedition()
         elif map_name[0].lower().startswith(MapConfig.world_map_prefix()):
             player = SaveData.instance().player
             check_achievement = SaveData.instance().achievement_manager.check_achievement
@@ -135,6 +259,7 @@ class MapManager:
                     self.__cur_map = world
                     self.__in_level = False
                     self.__show_world(self.__cur_map)
+                    self.__prepare_expedition()
                 else:
                     Logger.instance().error(f"Could not load world \"{map_name}\"!", from_pycui=False)
             except FileNotFoundError:
@@ -158,14 +283,14 @@ class MapManager:
             except FileNotFoundError:
                 Logger.instance().error(f"Failed to open the specified level-file: {map_name}", from_pycui=False)
         elif map_name.lower().startswith(MapConfig.expedition_map_prefix()):
-            if map_seed is None:
-                map_seed = self.__rm.get_seed(msg="MapMngr_seedForExpedition")
-
+            # the difficulty doesn't influence generation (yet), so the prepared expedition fits every difficulty
             difficulty = int(map_name[len(MapConfig.expedition_map_prefix()):])
             robot = SaveData.instance().get_robot(0)
-            check_achievement = SaveData.instance().achievement_manager.check_achievement
-            generator = ExpeditionGenerator(map_seed, check_achievement, self.__trigger_event, self.load_map)
-            expedition, success = generator.generate(robot)
+            if map_seed is None:
+                map_seed, expedition, success = self.__take_expedition(robot)
+            else:
+                # e.g. when restarting an expedition, which has to be generated from scratch
+                expedition, success = self.__create_expedition_generator(map_seed).generate(robot)
             if success:
                 self.__cur_map = expedition
                 self.__in_level = True
@@ -190,6 +315,7 @@ class MapManager:
             # if we are currently in a level we return to the current world
             self.__in_level = False
             self.__show_world(self.__get_world(self.__cur_map.internal_name))
+            self.__prepare_expedition()
         elif self.__cur_map is self.__hub_world or \
                 not Ach.check_unlocks(Unlocks.FreeNavigation, SaveData.instance().story_progress):
             # we return to the default world if we are currently in the hub-world or haven't unlocked it yet
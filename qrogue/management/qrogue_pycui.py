@@ -158,7 +158,10 @@ class QrogueCUI(PyCUI):
 
     def start(self):
         self.__render([self.__cur_widget_set])
-        super(QrogueCUI, self).start()
+        try:
+            super(QrogueCUI, self).start()
+        finally:
+            MapManager.instance().shutdown()
 
     def __choose_simulation(self):
         title = f"Enter the path to the {FileTypes.KeyLog.value}-file to simulate:"
@@ -327,6 +330,9 @@ class QrogueCUI(PyCUI):
 
                 # Handle keypresses
                 self._handle_key_presses(key_pressed)
+                # keys that are already waiting would make the frame's work outdated before it is even drawn
+                if self.__cur_widget_set is not None and not self.__is_input_pending(stdscr):
+                    self.__cur_widget_set.update_frame()
 
                 try:
                     # Draw status/title bar, and all widgets. Selected widget will be bolded.
@@ -408,6 +414,15 @@ class QrogueCUI(PyCUI):
                 widget.widget.add_key_command(self.__controls.get_keys(Keys.Pause), Pausing.pause)
                 widget.widget.add_key_command(self.__controls.get_keys(Keys.PopupReopen), Popup.reopen)
 
+    def __is_input_pending(self, stdscr) -> bool:
+        stdscr.timeout(0)
+        key = stdscr.getch()
+        stdscr.timeout(self._refresh_timeout if self._refresh_timeout > 0 else -1)
+        if key == -1:
+            return False
+        curses.ungetch(key)
+        return True
+
     def print_screen(self) -> None:
         text = ""
         for my_widget in self.__cur_widget_set.get_widget_list():
@@ -483,7 +498,7 @@ class QrogueCUI(PyCUI):
         robot = LukeBot(self.__game_over, size=2)
         for collectible in [collectibles.XGate(), collectibles.XGate(), collectibles.HGate(), collectibles.CXGate()]:
             robot.give_collectible(collectible)
-        enemy = Enemy(eid=0, target=StateVector([0] * (2**robot.num_of_qubits)), reward=Energy())
+        enemy = Enemy(eid=0, target=StateVector.from_sparse([], [], robot.num_of_qubits), reward=Energy())
         self.__state_machine.change_state(State.Training, (robot, enemy))
 
     def switch_to_training(self, data=None):
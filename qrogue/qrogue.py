@@ -1,14 +1,19 @@
 
+import os
 import random
 import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
 from typing import Tuple, List, Optional
 
 from qrogue.game.logic.actors import Player
-from qrogue.game.world.dungeon_generator import QrogueLevelGenerator, QrogueWorldGenerator
+from qrogue.game.logic.collectibles import instruction
+from qrogue.game.logic.simulation import PuzzleCorpus
+from qrogue.game.world.dungeon_generator import QrogueLevelGenerator, QrogueWorldGenerator, validate_targets
 from qrogue.game.world.map import CallbackPack
 from qrogue.game.world.navigation import Coordinate
 from qrogue.management import SaveData, QrogueCUI
-from qrogue.util import PyCuiConfig, Config, Logger, RandomManager, PathConfig, GameplayConfig
+from qrogue.util import PyCuiConfig, Config, Logger, RandomManager, PathConfig, GameplayConfig, FileTypes
 from qrogue.util.key_logger import OverWorldKeyLogger
 
 
@@ -73,6 +78,7 @@ def start_qrogue() -> None:
     # __CONTROLS_ARGUMENT = ["--controls", "-c"]          # int argument
     __SIMULATION_FILE_ARGUMENT = ["--simulation-path", "-sp"]   # path argument
     __VALIDATE_MAP_ARGUMENT = ["--validate-map", "-vm"]     # path argument
+    __BUILD_CORPUS_ARGUMENT = ["--build-corpus", "-bc"]     # optional path argument
 
     from_console, _ = __parse_argument(__CONSOLE_ARGUMENT)
     debugging, _ = __parse_argument(__DEBUG_ARGUMENT)
@@ -81,9 +87,15 @@ def start_qrogue() -> None:
     _, user_data_folder = __parse_argument(__USER_DATA_PATH_ARGUMENT, has_value=True)
     _, simulation_path = __parse_argument(__SIMULATION_FILE_ARGUMENT, has_value=True)
     _, map_path = __parse_argument(__VALIDATE_MAP_ARGUMENT, has_value=True)
+    build_corpus, _ = __parse_argument(__BUILD_CORPUS_ARGUMENT)
+    _, corpus_path = __parse_argument(__BUILD_CORPUS_ARGUMENT, has_value=True)
+    if corpus_path is not None and corpus_path.startswith("-"):
+        corpus_path = None  # the path is optional, so the next argument may already be the next flag
 
     if map_path:
         validate_map(map_path)
+    elif build_corpus:
+        build_puzzle_corpus(corpus_path)
     else:
         if simulation_path:
             simulate_game(simulation_path, from_console, debugging, data_folder, user_data_folder)
@@ -196,7 +208,35 @@ def simulate_game(simulation_path: str, from_console: bool = False, debugging: b
     exit(return_code)
 
 
+def build_puzzle_corpus(path: Optional[str] = None) -> None:
+    """
+    Precomputes the targets of all loadouts consisting of the gates Robots can find in expeditions.
+
+    :param path: the folder to store the corpus in, by default the corpus folder of the game data
+    :return: None
+    """
+    if path is None:
+        path = PathConfig.corpus_path()
+    # the gates GateFactory.default() hands out
+    gate_types = [instruction.HGate, instruction.XGate, instruction.YGate, instruction.ZGate, instruction.CXGate,
+                  instruction.SwapGate]
+    start_time = time.perf_counter()
+    PuzzleCorpus.build(path, gate_types)
+    print(f"Built the puzzle corpus in \"{path}\" in {time.perf_counter() - start_time:.1f}s.")
+
+
 def validate_map(path: str, is_level: bool = True, in_base_path: bool = True) -> bool:
+    """
+    Checks the given map for syntax errors. For levels it additionally reports whether all targets can be reached with
+    the gates and circuit space the Robot starts with and whether the gate limits of Challenges can be met. Since gates
+    can also be collected during a level unsolvable targets are only reported and don't count as errors. If path is a
+    folder every level inside it is validated.
+
+    :param path: path of the map or a folder of levels to validate
+    :param is_level: whether the map is a level or a world
+    :param in_base_path: whether the path is relative to the dungeon folder of the game data (ignored for folders)
+    :return: True if no syntax errors were found, False otherwise
+    """
     seed = 7
     try:
         __init_singletons(seed)
@@ -218,21 +258,51 @@ def validate_map(path: str, is_level: bool = True, in_base_path: bool = True) ->
     def show_message(title: str, text: str):
         pass
 
-    if is_level:
-        generator = QrogueLevelGenerator(seed, check_achievement, trigger_event, load_map, show_message)
-    else:
-        player = Player()
-        generator = QrogueWorldGenerator(seed, player, check_achievement, trigger_event, load_map, show_message)
+    def validate(map_path: str, in_dungeon_folder: bool, executor: Optional[Executor] = None) -> bool:
+        if is_level:
+            generator = QrogueLevelGenerator(seed, check_achievement, trigger_event, load_map, show_message)
+        else:
+            player = Player()
+            generator = QrogueWorldGenerator(seed, player, check_achievement, trigger_event, load_map, show_message)
 
-    try:
-        error_occurred = False
-        generator.generate(path, in_base_path)
-    except FileNotFoundError as fnf:
-        error_occurred = True
-        print(f"Could not find specified file! Error: {fnf}")
-    except SyntaxError as se:
-        error_occurred = True
-        print("Found syntax error!")
-        print(se)
-
-    return not error_occurred
+        try:
+            error_occurred = False
+            generator.generate(map_path, in_dungeon_folder)
+        except FileNotFoundError as fnf:
+            error_occurred = True
+            print(f"Could not find specified file! Error: {fnf}")
+        except SyntaxError as se:
+            error_occurred = True
+            print("Found syntax error!")
+            print(se)
+
+        if not error_occurred and is_level and generator.robot is not None:
+            __report_targets(map_path, generator, executor)
+        return not error_occurred
+
+    if is_level and os.path.isdir(path):
+        file_names = [os.path.join(path, file_name) for file_name in sorted(os.listdir(path))
+                      if file_name.endswith(FileTypes.Dungeon.value)]
+        # share the process pool between all levels instead of starting a new one for every level
+        with ProcessPoolExecutor() as executor:
+            results = [validate(file_name, False, executor) for file_name in file_names]
+        return all(results)
+    return validate(path, in_base_path)
+
+
+def __report_targets(map_path: str, generator: QrogueLevelGenerator, executor: Optional[Executor]):
+    robot = generator.robot
+    targets = generator.puzzle_targets
+    start_time = time.perf_counter()
+    reports = validate_targets(targets, robot.get_available_instructions(), robot.num_of_qubits,
+                               robot.circuit_space, executor)
+    duration = time.perf_counter() - start_time
+
+    print(f"Checked {len(reports)} targets of \"{map_path}\" in {duration:.2f}s:")
+    for report in reports:
+        prefix = "  " if report.is_valid else "! "
+        print(f"{prefix}{report}")
+    invalid_reports = [report for report in reports if not report.is_valid]
+    if len(invalid_reports) > 0:
+        print(f"Found {len(invalid_reports)} targets that are unsolvable with the Robot's starting gates. Make sure "
+              f"the level provides the needed gates!")
@@ -0,0 +1,69 @@
+import time
+from typing import List
+
+import numpy as np
+
+from qrogue.game.logic.collectibles import Instruction, CXGate, HGate, SwapGate, XGate
+from qrogue.game.logic.simulation import get_backend, simulate_unitary
+from qrogue.util import MyRandom, QuantumSimulationConfig
+
+# the gates and sizes our levels and generated dungeons actually use
+GATE_SETS = {
+    "classical": [XGate, CXGate, SwapGate],
+    "full": [XGate, HGate, CXGate, SwapGate],
+}
+QUBIT_COUNTS = range(1, 6)
+CIRCUIT_SPACE = 5
+
+
+def random_circuit(rm: MyRandom, gate_types: List, num_of_qubits: int) -> List[Instruction]:
+    if num_of_qubits < 2:
+        gate_types = [gate for gate in gate_types if gate in [XGate, HGate]]
+    circuit = []
+    for _ in range(rm.get_int(1, CIRCUIT_SPACE + 1)):
+        gate = rm.get_element(gate_types)()
+        qubits = list(range(num_of_qubits))
+        while gate.use_qubit(rm.get_element(qubits, remove=True)):
+            pass
+        circuit.append(gate)
+    return circuit
+
+
+def benchmark(backend_name: str, runs: int = 200, seed: int = 7) -> bool:
+    QuantumSimulationConfig.BACKEND = backend_name
+    try:
+        backend = get_backend()
+    except ImportError as e:
+        print(f"{backend_name}: skipped ({e})")
+        return True
+
+    correct = True
+    for set_name, gate_types in GATE_SETS.items():
+        for num_of_qubits in QUBIT_COUNTS:
+            rm = MyRandom(seed)
+            circuits = [random_circuit(rm, gate_types, num_of_qubits) for _ in range(runs)]
+            start_time = time.perf_counter()
+            statevectors = [backend.statevector(circuit, num_of_qubits) for circuit in circuits]
+            stv_time = (time.perf_counter() - start_time) / runs
+            start_time = time.perf_counter()
+            unitaries = [backend.unitary(circuit, num_of_qubits) for circuit in circuits]
+            unitary_time = (time.perf_counter() - start_time) / runs
+
+            for circuit, stv, unitary in zip(circuits, statevectors, unitaries):
+                reference = simulate_unitary(circuit, num_of_qubits)
+                if not np.allclose(unitary, reference) or not np.allclose(stv, reference[:, 0]):
+                    correct = False
+            print(f"{backend_name} [{set_name}, {num_of_qubits} qubits]: statevector = {stv_time * 1000:.4f} ms, "
+                  f"unitary = {unitary_time * 1000:.4f} ms")
+    return correct
+
+
+backends = [QuantumSimulationConfig.NUMPY_BACKEND, QuantumSimulationConfig.QISKIT_BACKEND,
+            QuantumSimulationConfig.DDSIM_BACKEND]
+default_backend = QuantumSimulationConfig.BACKEND
+results = [benchmark(backend) for backend in backends]
+QuantumSimulationConfig.BACKEND = default_backend
+if all(results):
+    print("All backends computed the same results.")
+else:
+    print("Some backends computed different results!")
@@ -1,112 +1,162 @@
+"""
+Benchmark for the random generation of layouts and dungeons (expeditions) over a range of seeds.
+
+The seeds are split into chunks that are generated in parallel by a process pool. Every worker initializes its own
+singletons and every seed is generated with a fresh RandomManager and Robot, so the result of a seed doesn't depend on
+which worker generated it or which seeds it generated before. The summary (and optionally the result of every seed) is
+written as JSON, e.g.
+
+    python generation_tests.py layout --start 0 --end 500000 --output layouts.json
+    python generation_tests.py dungeon --end 5000 --width 15 --height 15
+"""
+import argparse
+import heapq
+import json
+import os
+import sys
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 import test_util
+from qrogue.game.logic.actors.controllables import TestBot
+from qrogue.game.logic.collectibles import CXGate, HGate, XGate
 from qrogue.game.world.dungeon_generator import DungeonGenerator
 from qrogue.game.world.dungeon_generator.random_generator import RandomLayoutGenerator, ExpeditionGenerator
-from qrogue.management.save_data import SaveData
-
-
-def layout_test():
-    min_duration = (1, -1)
-    duration_sum = 0
-    max_duration = (0, -1)
-    start_seed = 50000
-    end_seed = 55000
-    failing_seeds = []
-    wrong_specials_seeds = []
-    # seeds that "look weird": [603]
-    # [47765, 58456, 65084, 74241, 85971]
-    seeds = list(range(start_seed, end_seed))       #[629, 774, 991, 3280, 5326, 6062, 7289, 8588, 8604, ]
-    num_of_seeds = len(seeds)
-    i = 0
-    for seed in seeds:
-        if i % 5000 == 0:
-            print(f"Run {i + 1}): seed = {seed}")
-        mapgen = RandomLayoutGenerator(seed, DungeonGenerator.WIDTH, DungeonGenerator.HEIGHT)
-        now_time = time.time()
-        if not mapgen.generate(debug=False):
-            failing_seeds.append(mapgen)
-        duration = time.time() - now_time
-        duration_sum += duration
-        if duration < min_duration[0]:
-            min_duration = (duration, seed)
-        elif duration > max_duration[0]:
-            max_duration = (duration, seed)
-        if not mapgen.check_special_rooms():
-            wrong_specials_seeds.append(seed)
-        i += 1
-        #print(mapgen)
-    print(f"Average time needed for generating a map: {duration_sum / num_of_seeds} seconds")
-    print(f"Fastest generation time = {min_duration[0]} for seed = {min_duration[1]}")
-    print(f"Longest generation time = {max_duration[0]} for seed = {max_duration[1]}")
-    print()
-    print("Failing Seeds:")
-    seeds = []
-    for mg in failing_seeds:
-        seeds.append(mg.seed)
-    print(seeds)
-    print("Wrong SpecialRooms in Seeds: ")
-    print(wrong_specials_seeds)
-    print()
-
-    for mg in failing_seeds:
-        mapgen = RandomLayoutGenerator(mg.seed, DungeonGenerator.WIDTH, DungeonGenerator.HEIGHT)
-        mapgen.generate(debug=True)
-
-
-def dungeon_test():
-    def check_achievement(ach: str) -> bool:
-        print(f"Checking achievement: {ach}")
-        return True
-
-    def trigger_event(event: str):
-        print(f"Triggering event: {event}")
-
-    def load_map(map_name: str):
-        print(f"Loading map: {map_name}")
-
-    SaveData()
-
-    min_duration = (1, -1)
-    duration_sum = 0
-    max_duration = (0, -1)
-    start_seed = 0
-    end_seed = 5000
-    failing_seeds = []
-    seeds = list(range(start_seed, end_seed))
-    num_of_seeds = len(seeds)
-    i = -1
+from qrogue.util import RandomManager
+
+# seed, duration in seconds, whether generation succeeded, whether the SpecialRooms are valid, error message
+SeedResult = Tuple[int, float, bool, bool, Optional[str]]
+
+
+def _init_worker():
+    # the singletons are per process, so every worker needs its own
+    test_util.init_singletons()
+
+
+def _generate_layout(seed: int, width: int, height: int) -> Tuple[bool, bool]:
+    mapgen = RandomLayoutGenerator(seed, width, height)
+    success = mapgen.generate(debug=False)
+    return success, mapgen.check_special_rooms()
+
+
+def _generate_dungeon(seed: int, width: int, height: int) -> Tuple[bool, bool]:
+    # a fresh RandomManager and Robot per seed make the result independent of the seeds generated before
+    RandomManager.force_seed(seed)
+    robot = TestBot(lambda: None, 2, [HGate(), XGate(), CXGate()])
+    generator = ExpeditionGenerator(seed, lambda achievement: True, lambda event: None, lambda map_name: None,
+                                    width, height)
+    expedition, success = generator.generate(robot)
+    if success:
+        # Rooms and Targets are only created when the player needs them, so we force all of them to be created to also
+        # cover WildRooms (with their enemies), Riddles and Bosses
+        expedition.load_all_rooms()
+    return success, generator.layout.check_special_rooms()
+
+
+def _run_chunk(mode: str, seeds: range, width: int, height: int) -> List[SeedResult]:
+    generate = _generate_layout if mode == "layout" else _generate_dungeon
+    results = []
     for seed in seeds:
-        if seed == 16:
-            debug = True
-        i += 1
-        if i % 1000 == 0:
-            print(f"Run {i + 1}): seed = {seed}")
-        generator = ExpeditionGenerator(seed, check_achievement, trigger_event, load_map)
-        start_time = time.time()
-        map, success = generator.generate(SaveData.instance().get_robot(0))
-        if not success:
-            failing_seeds.append((generator, seed))
-            print(f"Failed for seed = {seed}")
-        duration = time.time() - start_time
-        duration_sum += duration
-        if duration < min_duration[0]:
-            min_duration = (duration, seed)
-        elif duration > max_duration[0]:
-            max_duration = (duration, seed)
-    print(f"Average time needed for generating a map: {duration_sum / num_of_seeds} seconds")
-    print(f"Fastest generation time = {min_duration[0]} for seed = {min_duration[1]}")
-    print(f"Longest generation time = {max_duration[0]} for seed = {max_duration[1]}")
-    print()
-    print("Failing Seeds:")
-    seeds = []
-    for mg, seed in failing_seeds:
-        print(mg)
-        seeds.append(seed)
-    print(seeds)
-    print()
-
-
-if test_util.init_singletons(include_config=True):
-    #layout_test()
-    dungeon_test()
+        start_time = time.perf_counter()
+        try:
+            success, special_rooms_valid = generate(seed, width, height)
+            error = None
+        except Exception as e:
+            success, special_rooms_valid, error = False, False, f"{type(e).__name__}: {e}"
+        results.append((seed, time.perf_counter() - start_time, success, special_rooms_valid, error))
+    return results
+
+
+def sweep(mode: str, start_seed: int, end_seed: int, width: int, height: int, workers: Optional[int] = None,
+          chunk_size: int = 1000, num_of_slowest: int = 20, per_seed: bool = False) -> Dict:
+    """
+
+    :param mode: "layout" to only generate RandomLayouts, "dungeon" to generate whole expeditions
+    :param start_seed: first seed to generate (inclusive)
+    :param end_seed: last seed to generate (exclusive)
+    :param width: width of the generated grids
+    :param height: height of the generated grids
+    :param workers: number of worker processes, None to use one per CPU
+    :param chunk_size: number of seeds a worker generates at once
+    :param num_of_slowest: how many of the slowest seeds to report
+    :param per_seed: whether the result of every seed should be part of the report
+    :return: the report
+    """
+    chunks = [range(seed, min(seed + chunk_size, end_seed)) for seed in range(start_seed, end_seed, chunk_size)]
+    results: List[SeedResult] = []
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(_run_chunk, mode, chunk, width, height) for chunk in chunks]
+        for i, future in enumerate(as_completed(futures)):
+            results += future.result()
+            if (i + 1) % max(1, len(chunks) // 20) == 0:
+                print(f"{i + 1}/{len(chunks)} chunks done", file=sys.stderr)
+    wall_time = time.perf_counter() - start_time
+    results.sort()
+
+    durations = np.array([duration for _, duration, _, _, _ in results])
+    p50, p95, p99 = np.percentile(durations, [50, 95, 99]) if len(durations) > 0 else (0.0, 0.0, 0.0)
+    slowest = heapq.nlargest(num_of_slowest, results, key=lambda result: result[1])
+    report = {
+        "mode": mode,
+        "seeds": [start_seed, end_seed],
+        "width": width,
+        "height": height,
+        "workers": workers or os.cpu_count(),
+        "wall_time": wall_time,
+        "durations": {
+            "total": float(durations.sum()),
+            "mean": float(durations.mean()) if len(durations) > 0 else 0.0,
+            "min": float(durations.min()) if len(durations) > 0 else 0.0,
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "max": float(durations.max()) if len(durations) > 0 else 0.0,
+        },
+        "slowest": [{"seed": seed, "duration": duration} for seed, duration, _, _, _ in slowest],
+        "failing_seeds": [seed for seed, _, success, _, _ in results if not success],
+        "wrong_special_rooms_seeds": [seed for seed, _, success, valid, _ in results if success and not valid],
+        "errors": {str(seed): error for seed, _, _, _, error in results if error is not None},
+    }
+    if per_seed:
+        report["per_seed"] = [{"seed": seed, "duration": duration, "success": success, "special_rooms_valid": valid}
+                              for seed, duration, success, valid, _ in results]
+    return report
+
+
+def main(args: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Generates layouts or dungeons for a range of seeds in parallel and "
+                                                 "reports their generation times and failures as JSON.")
+    parser.add_argument("mode", choices=["layout", "dungeon"])
+    parser.add_argument("--start", type=int, default=0, help="first seed (inclusive)")
+    parser.add_argument("--end", type=int, default=5000, help="last seed (exclusive)")
+    parser.add_argument("--width", type=int, default=DungeonGenerator.WIDTH)
+    parser.add_argument("--height", type=int, default=DungeonGenerator.HEIGHT)
+    parser.add_argument("--workers", type=int, default=None, help="number of processes, defaults to one per CPU")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="seeds per task")
+    parser.add_argument("--slowest", type=int, default=20, help="number of slowest seeds to report")
+    parser.add_argument("--per-seed", action="store_true", help="also report the result of every seed")
+    parser.add_argument("--output", default=None, help="file to write the JSON report to instead of stdout")
+    parsed = parser.parse_args(args)
+
+    report = sweep(parsed.mode, parsed.start, parsed.end, parsed.width, parsed.height, parsed.workers,
+                   parsed.chunk_size, parsed.slowest, parsed.per_seed)
+    if parsed.output is None:
+        print(json.dumps(report, indent=2))
+    else:
+        with open(parsed.output, "w") as file:
+            json.dump(report, file, indent=2)
+        durations = report["durations"]
+        print(f"{parsed.end - parsed.start} seeds in {report['wall_time']:.1f} s: p50 = {durations['p50'] * 1000:.3f} "
+              f"ms, p95 = {durations['p95'] * 1000:.3f} ms, p99 = {durations['p99'] * 1000:.3f} ms, "
+              f"{len(report['failing_seeds'])} failing, {len(report['wrong_special_rooms_seeds'])} with wrong "
+              f"SpecialRooms")
+    # a non-zero exit code lets regression sweeps fail e.g. in CI
+    return 1 if report["failing_seeds"] or report["wrong_special_rooms_seeds"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,60 @@
+import time
+
+from qrogue.game.logic.actors.controllables import TestBot
+from qrogue.game.logic.collectibles import CXGate, HGate, SwapGate, XGate
+from qrogue.game.logic.simulation import SimulationCache
+from qrogue.util import MyRandom
+
+FRAME_BUDGET = 1 / 60   # a preview has to be done within one frame at 60 fps
+MAX_MATRIX_QUBITS = 3   # CircuitMatrixWidget only displays (and therefore computes) matrices up to this size
+
+
+def fill_circuit(robot: TestBot, rm: MyRandom):
+    for position in range(robot.circuit_space):
+        gate = robot.get_instruction(position)
+        qubits = list(range(robot.num_of_qubits))
+        while gate.use_qubit(rm.get_element(qubits, remove=True)):
+            pass
+        robot.use_instruction(gate, position)
+    robot.update_statevector(use_energy=False)
+
+
+def preview_test(num_of_qubits: int, circuit_space: int = 5, runs: int = 2000, seed: int = 7):
+    rm = MyRandom(seed)
+    gate_types = [HGate, XGate] if num_of_qubits < 2 else [CXGate, HGate, SwapGate, XGate]
+    gates = [rm.get_element(gate_types)() for _ in range(2 * circuit_space)]
+    robot = TestBot(lambda: None, num_of_qubits, gates, circuit_space=circuit_space, backpack_space=len(gates))
+    fill_circuit(robot, rm)
+    spare_gates = [robot.get_instruction(i) for i in range(circuit_space, len(gates))]
+
+    durations = []
+    for _ in range(runs):
+        # like a player moving a gate around: pick a gate and a position, but never hit the cache
+        SimulationCache.instance().clear()
+        gate = rm.get_element(spare_gates).copy()
+        qubits = list(range(num_of_qubits))
+        while gate.use_qubit(rm.get_element(qubits, remove=True)):
+            pass
+        position = rm.get_int(0, circuit_space)
+
+        # previews are lazy, so we also read what the widgets display to actually time the simulation
+        start_time = time.perf_counter()
+        result = robot.preview(gate, position)
+        _ = result.state_vector
+        if num_of_qubits <= MAX_MATRIX_QUBITS:
+            _ = result.circuit_matrix
+        durations.append(time.perf_counter() - start_time)
+
+    durations.sort()
+    average = sum(durations) / len(durations)
+    worst = durations[-1]
+    print(f"{num_of_qubits} qubits: average = {average * 1000:.4f} ms, p99 = "
+          f"{durations[int(0.99 * len(durations))] * 1000:.4f} ms, worst = {worst * 1000:.4f} ms")
+    return worst < FRAME_BUDGET
+
+
+results = [preview_test(num_of_qubits) for num_of_qubits in range(1, 6)]
+if all(results):
+    print(f"All previews finished within one frame ({FRAME_BUDGET * 1000:.2f} ms).")
+else:
+    print(f"Some previews took longer than one frame ({FRAME_BUDGET * 1000:.2f} ms)!")
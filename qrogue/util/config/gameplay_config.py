@@ -375,6 +375,20 @@ class QuantumSimulationConfig:
     MAX_SPACE_PER_NUMBER = 1 + 1 + 1 + DECIMALS  # sign + "0" + "." + DECIMALS
     MAX_PERCENTAGE_SPACE = 3
 
+    NUMPY_BACKEND = "numpy"
+    QISKIT_BACKEND = "qiskit"   # only used as reference since it is way slower for our small circuits
+    DDSIM_BACKEND = "ddsim"     # decision diagram based simulation, needs the optional mqt.ddsim (or jkq.ddsim) package
+    BACKEND = NUMPY_BACKEND
+    CACHE_SIZE = 512    # how many simulation results are kept in the shared SimulationCache
+    TRANSPILE_CACHE_SIZE = 256  # how many transpiled circuits the QiskitBackend keeps per simulator
+    REACHABLE_INDEX_CACHE_SIZE = 16     # how many loadouts' ReachableStateIndex are kept
+    SOLVER_TIME_BUDGET = 1.0    # seconds the CircuitSolver searches before returning a partial result
+    CORPUS_MAX_QUBITS = 3       # the PuzzleCorpus contains loadouts with 1 up to this many qubits...
+    CORPUS_MAX_GATES = 6        # ...and up to this many Instructions
+    SPARSE_MIN_QUBITS = 6       # below this dense statevectors are small enough to always be faster
+    SPARSE_MAX_DENSITY = 0.25   # share of non-zero amplitudes at which sparse simulation switches to dense
+    SPARSE_EPSILON = 1e-12      # amplitudes closer to 0 are dropped from sparse statevectors
+
 
 class ShopConfig:
     @staticmethod
@@ -24,6 +24,7 @@ class PathConfig:
     __SCREEN_PRINTS_FOLDER = "screenprints"
     __SAVE_DATA_FOLDER = "saves"
     __DUNGEON_FOLDER = "dungeons"
+    __CORPUS_FOLDER = "corpus"
     __TEMPLATE_ROOMS = "rooms"
     __TEMPLATE_HALLWAYS = "hallways"
     __TEMPLATE_STV_POOLS = "stv_pools"
@@ -140,6 +141,10 @@ class PathConfig:
     def base_path(file_name: str = "") -> str:
         return os.path.join(PathConfig.__Base_Path, file_name)
 
+    @staticmethod
+    def corpus_path(file_name: str = "") -> str:
+        return PathConfig.base_path(os.path.join(PathConfig.__CORPUS_FOLDER, file_name))
+
     @staticmethod
     def user_data_path(file_name: str = "") -> str:
         return os.path.join(PathConfig.__User_Data_Path, file_name)
@@ -1,3 +1,4 @@
+import threading
 from datetime import datetime
 from typing import Callable, Optional, List
 
@@ -27,6 +28,8 @@ class Logger(PyCUILogger):
             self.__error_popup: Optional[Callable[[str, str], None]] = None
             self.__save_file = PathConfig.new_log_file(seed)
             self.__buffer: List[str] = [Config.get_log_head(seed)]
+            # e.g. expeditions are generated in a background thread and might log while the main thread does
+            self.__lock = threading.RLock()
             Logger.__instance = self
 
     @property
@@ -39,9 +42,10 @@ class Logger(PyCUILogger):
         self.__error_popup = error_popup_function
 
     def __write(self, text) -> None:
-        self.__buffer.append(text)
-        if self.__buffer_size >= Logger.__BUFFER_SIZE:
-            self.flush()
+        with self.__lock:
+            self.__buffer.append(text)
+            if self.__buffer_size >= Logger.__BUFFER_SIZE:
+                self.flush()
 
     def info(self, message, from_pycui: bool = True, **kwargs) -> None:
         time_str = datetime.now().strftime("%H-%M-%S")
@@ -58,7 +62,8 @@ class Logger(PyCUILogger):
         self.__error_popup("ERROR", str(message))
 
     def error(self, message, show: bool = True, from_pycui: bool = True, **kwargs) -> None:
-        if show:
+        # popups can only be shown by the main thread, other threads' errors are only logged
+        if show and threading.current_thread() is threading.main_thread():
             self.__error_popup("ERROR", str(message))
         highlighting = "\n----------------------------------\n"
         self.info(f"{highlighting}ERROR |{message}{highlighting}", from_pycui=from_pycui)
@@ -72,19 +77,23 @@ class Logger(PyCUILogger):
     def println(self, message: str = "", clear: bool = False) -> None:
         message = f"{message}\n"
         print(message)
-        if clear:
-            self.__text = message
-        else:
-            self.__text += message
-        self.__message_popup("Logger", self.__text, PyCuiColors.WHITE_ON_CYAN)
+        with self.__lock:
+            if clear:
+                self.__text = message
+            else:
+                self.__text += message
+            text = self.__text
+        self.__message_popup("Logger", text, PyCuiColors.WHITE_ON_CYAN)
 
     def clear(self) -> None:
-        self.__text = ""
+        with self.__lock:
+            self.__text = ""
 
     def flush(self) -> None:
-        if self.__buffer_size > 0:
-            text = ""
-            for log in self.__buffer:
-                text += log + "\n"
-            PathConfig.write(self.__save_file, text, may_exist=True, append=True)
-            self.__buffer = []
+        with self.__lock:
+            if self.__buffer_size > 0:
+                text = ""
+                for log in self.__buffer:
+                    text += log + "\n"
+                PathConfig.write(self.__save_file, text, may_exist=True, append=True)
+                self.__buffer = []
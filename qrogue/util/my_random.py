@@ -1,5 +1,7 @@
 import random
-from typing import List
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List
 
 from qrogue.util.config import Config
 from qrogue.util.logger import Logger
@@ -36,6 +38,16 @@ class MyRandom:
     def get_seed(self, msg: str = str(COUNTER)) -> int:
         return self.get_int(min_=0, max_=Config.MAX_SEED, msg=msg)
 
+    def peek_seed(self, msg: str = str(COUNTER)) -> int:
+        """
+
+        :return: the seed the next call of get_seed() will return, without advancing the randomness
+        """
+        state = self.__random.getstate()
+        seed = self.get_seed(msg=msg)
+        self.__random.setstate(state)
+        return seed
+
     def get_element(self, iterable, remove: bool = False, msg: str = str(COUNTER)):
         if len(iterable) == 0:
             return None
@@ -81,13 +93,33 @@ class MyRandom:
 
 class RandomManager(MyRandom):
     __instance = None
+    __redirection = threading.local()
 
     @staticmethod
     def create_new(seed: int = None) -> MyRandom:
         if seed is None:
-            seed = RandomManager.instance().get_seed(msg=f"RM.create_new{MyRandom.COUNTER}")
+            source = getattr(RandomManager.__redirection, "source", None)
+            if source is None:
+                source = RandomManager.instance()
+            seed = source.get_seed(msg=f"RM.create_new{MyRandom.COUNTER}")
         return MyRandom(seed)
 
+    @staticmethod
+    @contextmanager
+    def redirect(source: MyRandom) -> Iterator[MyRandom]:
+        """
+        Lets create_new() draw its seeds from the given source instead of the RandomManager within the current thread,
+        e.g. so generating content in a background thread doesn't change the RandomManager's sequence.
+
+        :param source: the randomness to draw seeds from
+        """
+        previous = getattr(RandomManager.__redirection, "source", None)
+        RandomManager.__redirection.source = source
+        try:
+            yield source
+        finally:
+            RandomManager.__redirection.source = previous
+
     @staticmethod
     def instance() -> MyRandom:
         if RandomManager.__instance is None:
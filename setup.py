@@ -19,6 +19,7 @@ setup(
 		'qrogue.game.logic.actors',
 		'qrogue.game.logic.actors.controllables',
 		'qrogue.game.logic.actors.puzzles',
+		'qrogue.game.logic.simulation',
 		'qrogue.game.world',
 		'qrogue.game.world.navigation',
 		'qrogue.game.world.tiles',